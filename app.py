@@ -12,6 +12,7 @@ from src.ui.localization import get_translations
 from src.ui.layout import render_sidebar, render_main_content
 from src.ui.components import show_onboarding_dialog
 from src.pipeline import run_pipeline
+from src.repositories import get_result_journal
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -51,6 +52,11 @@ def main():
     # --- Router ---
     # Admin page removed per user request.
     
+    # --- Recover results journaled by an interrupted pipeline run (once per session) ---
+    if 'journal_recovered' not in st.session_state:
+        get_result_journal().recover()
+        st.session_state.journal_recovered = True
+
     # --- Data Loading (Lazy load unless needed) ---
     all_cards = load_cards()
     df_cards = pd.DataFrame([c.model_dump() for c in all_cards])
@@ -4,7 +4,7 @@ Uses Pydantic Settings for type-safe environment variable loading.
 """
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -20,19 +20,98 @@ class Settings(BaseSettings):
     
     # RSS Feed Configuration
     rss_feed_url: str = "https://feeds.feedburner.com/GlobalPressRoom"
+    # Multiple feeds as JSON, e.g. RSS_FEEDS='[{"url": "...", "source": "PwC"}]'
+    rss_feeds: List[Dict[str, str]] = []
+    feed_fetch_workers: int = 4
+    feed_timeout: int = 10
+    
+    # HTTP Client (shared pooled session for feeds and documents)
+    http_timeout: int = 15
+    http_pool_connections: int = 10  # Number of distinct host pools kept alive
+    http_pool_maxsize: int = 8  # Max concurrent connections per host
+    http_max_retries: int = 3
+    http_backoff_factor: float = 0.5
+    http_requests_per_minute: int = 0  # Per-host request budget (0 = unlimited)
+    http_user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    
+    # Document Cache (raw downloads + extracted text, for cheap reprocessing)
+    document_cache_enabled: bool = True
+    document_cache_max_mb: int = 512
+    document_cache_revalidate: bool = False  # Conditional GET instead of trusting the cache
+    
+    # PDF Parsing
+    pdf_spool_max_mb: int = 8  # Larger downloads spill to a temp file and are mmapped
+    pdf_parallel_min_pages: int = 40  # Page count at which extraction moves to a process pool
+    pdf_workers: int = 0  # 0 = os.cpu_count()
     
     # Pipeline Configuration
     max_signals_per_report: int = 20
     min_sentence_length: int = 20
     max_sentence_length: int = 500
+    candidate_ranking: bool = True  # Rank candidates locally before the LLM cutoff
+    candidate_pool_factor: int = 3  # Collect this many times max_signals_per_report before ranking
+    near_duplicate_detection: bool = True  # Skip candidates near-identical to already structured ones
+    near_duplicate_max_distance: int = 6  # SimHash Hamming distance (max 7)
+    signal_keywords: List[str] = []  # Overrides signal_extraction.KEYWORDS when set
+    incremental_extraction: bool = True  # Parse lazily and stop once enough candidates are found
+    max_pages_per_report: int = 0  # Page/section budget per document (0 = unlimited)
+    max_chars_per_report: int = 0  # Character budget per document (0 = unlimited)
+
+    # Pipeline Stages (fetch -> parse -> extract -> LLM, joined by bounded queues)
+    pipeline_fetch_workers: int = 4  # Download threads
+    pipeline_parse_workers: int = 2  # Parser processes (0 = parse in a thread)
+    pipeline_extract_workers: int = 1  # Ranking / near-duplicate selection threads
+    pipeline_llm_workers: int = 2  # Reports structured concurrently
+    pipeline_queue_size: int = 4  # Reports waiting between two stages before upstream blocks
+    journal_compact_every: int = 200  # Journal records between compactions into the JSON stores
+    journal_fsync: bool = True  # Force each journal append to disk
+    # A report with any failed candidate (API error or unusable output) is marked failed and retried
+    # on later runs up to this many attempts; runs without a configured LLM leave reports pending
+    max_report_attempts: int = 3
+    
+    # Signal Scoring
+    signal_discard_threshold: int = 50  # Cards below this importance_score are discarded
+    # Opt-in: screening with another model changes which signals survive, and the
+    # offline batch reprocess (reprocess_data --batch) never screens
+    cascade_enabled: bool = False  # Screen candidates with a cheap score-only pass first
+    cascade_scoring_model: str = "gpt-4o-mini"  # Empty = openai_model
+    cascade_score_threshold: int = 40  # Pre-screen score needed for full structuring
+    cascade_batch_size: int = 25  # Candidates scored per screening request
+    
+    # Korean Localization
+    deferred_korean: bool = False  # Structure in English only; translate cards on demand
+    translation_batch_max_items: int = 10  # Cards per translation request
+    translation_batch_max_chars: int = 8000  # Source characters per translation request
+    translation_memory_enabled: bool = True  # Persist translated segments across runs
+    translation_memory_max_mb: int = 64
     
     # LLM Parameters
     llm_timeout: int = 30
     llm_max_retries: int = 3
+    llm_max_concurrency: int = 8  # Upper bound of the adaptive in-flight request window
+    llm_min_concurrency: int = 1  # Window never shrinks below this on 429s
+    llm_requests_per_minute: int = 500  # Provider RPM limit (0 = unlimited)
+    llm_tokens_per_minute: int = 200000  # Provider TPM limit (0 = unlimited)
+    llm_streaming: bool = True  # Stream single-candidate calls and stop once a low score is known
+    llm_batching: bool = True  # Structure several candidates per request
+    llm_batch_max_items: int = 8
+    llm_batch_token_budget: int = 12000  # Estimated prompt + completion tokens per request
+    llm_output_tokens_per_signal: int = 450  # Expected completion tokens per bilingual result
+    llm_batch_backend: str = "openai"  # Offline Batch API backend for bulk reprocessing
+    llm_batch_poll_seconds: int = 60
+    llm_batch_timeout_hours: int = 24
+    
+    # LLM Response Cache (replays identical requests, e.g. when reprocessing)
+    llm_cache_enabled: bool = True
+    llm_cache_ttl_hours: int = 720  # 0 = never expire
+    llm_cache_max_mb: int = 256
     
     # Logging
     log_level: str = "INFO"
     
+    # Metrics (latency histograms, token counts, cache hit rates; exported after each run)
+    metrics_enabled: bool = True
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -54,6 +133,68 @@ class Settings(BaseSettings):
     def discarded_file(self) -> Path:
         """Path to discarded_signals.json file."""
         return self.data_dir / "discarded_signals.json"
+    
+    @property
+    def report_index_file(self) -> Path:
+        """Path to report_index.json file (URL -> report ID dedup index)."""
+        return self.data_dir / "report_index.json"
+    
+    @property
+    def fingerprint_index_file(self) -> Path:
+        """Path to signal_fingerprints.json (SimHash near-duplicate index)."""
+        return self.data_dir / "signal_fingerprints.json"
+    
+    @property
+    def journal_file(self) -> Path:
+        """Path to pipeline_journal.jsonl (write-ahead journal of pipeline results)."""
+        return self.data_dir / "pipeline_journal.jsonl"
+    
+    @property
+    def work_units_file(self) -> Path:
+        """SQLite database of candidate-level work units (resumable structuring)."""
+        return self.data_dir / "work_units.sqlite3"
+    
+    @property
+    def document_cache_dir(self) -> Path:
+        """Directory for the compressed document/text cache."""
+        return self.data_dir / "cache" / "documents"
+    
+    @property
+    def llm_cache_file(self) -> Path:
+        """SQLite database for cached LLM responses."""
+        return self.data_dir / "cache" / "llm_responses.sqlite3"
+    
+    @property
+    def translation_memory_file(self) -> Path:
+        """SQLite database for the persistent translation memory."""
+        return self.data_dir / "cache" / "translation_memory.sqlite3"
+    
+    @property
+    def metrics_json_file(self) -> Path:
+        """JSON snapshot of the metrics registry, written after each run."""
+        return self.data_dir / "metrics" / "metrics.json"
+    
+    @property
+    def metrics_prom_file(self) -> Path:
+        """Prometheus text-format export of the metrics registry."""
+        return self.data_dir / "metrics" / "metrics.prom"
+    
+    @property
+    def batch_jobs_dir(self) -> Path:
+        """Directory for offline batch job files, manifests and results."""
+        return self.data_dir / "batch_jobs"
+    
+    @property
+    def feed_sources(self) -> List[Tuple[str, str]]:
+        """Configured (url, source) feed pairs, falling back to rss_feed_url."""
+        if self.rss_feeds:
+            return [(f["url"], f.get("source", "PwC")) for f in self.rss_feeds]
+        return [(self.rss_feed_url, "PwC")]
+    
+    @property
+    def feed_state_file(self) -> Path:
+        """Path to feed_state.json file (conditional-GET validators per feed)."""
+        return self.data_dir / "feed_state.json"
 
 
 # Global settings instance
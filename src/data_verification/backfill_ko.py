@@ -0,0 +1,57 @@
+"""
+Backfill job for deferred Korean translations.
+Fills missing *_ko fields of stored opportunity cards in batches and saves
+after every chunk, so an interrupted run keeps its progress.
+"""
+import argparse
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+from src.repositories import get_card_repository
+from src.services.translation_service import get_translation_service, needs_card_translation
+
+
+def backfill_korean(chunk_size: int = 100, limit: int = 0) -> int:
+    """
+    Translate all cards that still lack Korean fields.
+    
+    Args:
+        chunk_size: Cards translated (concurrently, in batched requests) per save
+        limit: Stop after this many cards (0 = all)
+    
+    Returns:
+        Number of cards updated
+    """
+    card_repo = get_card_repository()
+    translation_service = get_translation_service()
+    
+    pending = [c for c in card_repo.find_all_cards() if needs_card_translation(c)]
+    if limit:
+        pending = pending[:limit]
+    logger.info(f"{len(pending)} cards need Korean fields.")
+    
+    updated = 0
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        changed = translation_service.translate_cards(chunk)
+        if changed:
+            card_repo.update_cards(changed)
+            updated += len(changed)
+        logger.info(f"[{min(start + chunk_size, len(pending))}/{len(pending)}] {updated} cards updated")
+    
+    logger.info(f"Backfill complete: {updated} cards updated.")
+    return updated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill missing Korean fields of opportunity cards.")
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=0, help="Translate at most this many cards")
+    args = parser.parse_args()
+    backfill_korean(args.chunk_size, args.limit)
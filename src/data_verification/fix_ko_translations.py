@@ -1,4 +1,4 @@
-import os, json, re, csv
+import os, sys, json, re, csv
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
@@ -7,7 +7,16 @@ from dotenv import load_dotenv
 from openai import OpenAI
 
 # Load .env from project root
-load_dotenv(Path(__file__).resolve().parents[2] / ".env")
+ROOT = Path(__file__).resolve().parents[2]
+load_dotenv(ROOT / ".env")
+
+# 번역 메모리(SQLite)는 파이프라인/TranslationService와 공유
+sys.path.append(str(ROOT))
+from src.config import get_settings
+from src.services.translation_memory import get_translation_memory
+
+# Same model as TranslationService, so both key the translation memory identically
+MODEL = get_settings().openai_model
 
 INPUT_PATH = "data/cards.json"
 OUTPUT_PATH = "data/cards_ko_fixed.json"
@@ -66,15 +75,22 @@ def translate_to_korean(client: OpenAI, text: str) -> str:
         "Rules: output Korean only; keep proper nouns, acronyms (e.g., ESG, AI, PwC) as-is; "
         "keep quotation marks; do not add explanations."
     )
+    memory = get_translation_memory()
+    remembered = memory.get(text, "ko", MODEL)
+    if remembered:
+        return remembered
+
     resp = client.chat.completions.create(
-        model="gpt-4o-mini",
+        model=MODEL,
         messages=[
             {"role": "system", "content": system},
             {"role": "user", "content": text},
         ],
         temperature=0.2,
     )
-    return resp.choices[0].message.content.strip()
+    translated = resp.choices[0].message.content.strip()
+    memory.put(text, translated, "ko", MODEL)
+    return translated
 
 def main():
     api_key = os.getenv("OPENAI_API_KEY")
@@ -150,6 +166,8 @@ def main():
     print(f"OK: saved {OUTPUT_PATH}")
     print(f"OK: log  {LOG_PATH}")
     print(f"Changed rows: {len([c for c in changes if c.get('old_value') != c.get('new_value')])}")
+    stats = get_translation_memory().stats()
+    print(f"Translation memory: {stats['hits']} hits, {stats['misses']} misses")
 
 if __name__ == "__main__":
     main()
@@ -4,8 +4,13 @@ Uses the refactored service layer and repository pattern.
 """
 import os
 import sys
+import json
 import time
+import argparse
 import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Optional
 
 # Setup logging
 logging.basicConfig(
@@ -14,14 +19,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-from src.repositories import get_report_repository, get_card_repository
+from src.config import get_settings
+from src.repositories import get_report_repository, get_card_repository, get_fingerprint_index, get_work_units
+from src.repositories.fingerprint_index import FingerprintIndex
 from src.parsing import parse_html_content, parse_pdf_content
 from src.signal_extraction import extract_candidate_sentences
-from src.llm_service import generate_signal_struct
+from src.llm_service import generate_signal_structs, plan_signal_requests, parse_signal_results, is_current
+from src.ids import make_signal_id
 from src.services.translation_service import get_translation_service
+from src.services.document_cache import get_document_cache
+from src.services.response_cache import get_response_cache
+from src.services.metrics import export_run_metrics
+from src.services.batch_backend import (
+    BatchBackend, get_batch_backend, make_batch_request, write_job_file,
+    read_result_file, wait_for_batch,
+)
 from src.models import OpportunityCard, DiscardedSignal
 
 
+def _parse_report(report) -> Optional[str]:
+    """Fetch (or load from cache) and extract the full text of a report."""
+    if report.url.lower().endswith('.pdf'):
+        return parse_pdf_content(report.url)
+    return parse_html_content(report.url)
+
+
+def _content_hash(url: str) -> Optional[str]:
+    """Content hash of the last fetched version of a document (None without the document cache)."""
+    if not get_settings().document_cache_enabled:
+        return None
+    entry = get_document_cache().get_url_entry(url)
+    return entry["content_hash"] if entry else None
+
+
 def reprocess_all():
     """Reprocess all reports to regenerate opportunity cards."""
     logger.info("Starting Reprocessing of ALL Reports...")
@@ -30,11 +60,12 @@ def reprocess_all():
     report_repo = get_report_repository()
     card_repo = get_card_repository()
     translation_service = get_translation_service()
+    fingerprints = get_fingerprint_index()
     
-    # 1. Clear existing Cards and Discarded Signals
-    logger.info("Clearing old cards/discarded data...")
-    card_repo.save_cards([])
-    card_repo.save_discarded([])
+    # 1. Reset derived indexes; existing Cards and Discarded Signals stay
+    # readable until the new ones are swapped in at the end
+    fingerprints.clear()  # Fingerprints point at the cards being replaced
+    get_work_units().clear()  # So do finished work units
     
     # 2. Load Reports
     reports = report_repo.find_all()
@@ -43,19 +74,15 @@ def reprocess_all():
     new_cards = []
     new_discarded = []
     
+    # Translate Report Metadata if missing (batched across reports)
+    translation_service.translate_reports([r for r in reports if not r.title_ko])
+    
     for i, report in enumerate(reports):
         logger.info(f"[{i+1}/{len(reports)}] Processing: {report.title[:50]}...")
         
-        # Translate Report Metadata if missing
-        if not report.title_ko:
-            translation_service.translate_report(report)
-        
         try:
             # Parse Content
-            if report.url.lower().endswith('.pdf'):
-                text = parse_pdf_content(report.url)
-            else:
-                text = parse_html_content(report.url)
+            text = _parse_report(report)
             
             if not text:
                 logger.warning(f"Failed to extract text from {report.url}")
@@ -63,18 +90,25 @@ def reprocess_all():
             
             # Extract
             candidates = extract_candidate_sentences(text)
+            candidates, duplicates = fingerprints.select_novel(candidates)
+            if duplicates:
+                logger.info(f"  -> Skipped {len(duplicates)} near-duplicate candidates")
             
             # Structuring
             opp_count = 0
             discard_count = 0
-            for candidate in candidates:  # Process all candidates
-                result = generate_signal_struct(candidate, report.title, report.report_id)
-                
+            content_hash = _content_hash(report.url)
+            results = generate_signal_structs(candidates, report.title, report.report_id)  # Process all candidates
+            for candidate, result in zip(candidates, results):
+                if result is not None:
+                    result.content_hash = content_hash
                 if isinstance(result, OpportunityCard):
                     new_cards.append(result)
+                    fingerprints.add(candidate, result.card_id, report.report_id, "card")
                     opp_count += 1
                 elif hasattr(result, 'reason'):
                     new_discarded.append(result)
+                    fingerprints.add(candidate, result.signal_id, report.report_id, "discard")
                     discard_count += 1
             
             logger.info(f"  -> Extracted: {opp_count} Opportunities, {discard_count} Discarded")
@@ -82,7 +116,7 @@ def reprocess_all():
         except Exception as e:
             logger.error(f"  -> Error: {e}", exc_info=True)
     
-    # 3. Save
+    # 3. Save (each store is swapped in atomically)
     card_repo.save_cards(new_cards)
     logger.info(f"Saved {len(new_cards)} new Opportunity Cards.")
     
@@ -94,9 +128,300 @@ def reprocess_all():
     card_repo.save_discarded(new_discarded)
     logger.info(f"Saved {len(new_discarded)} Discarded Signals.")
     
+    fingerprints.save()
+    
+    # Persist LRU access times so the next eviction pass sees this run
+    get_document_cache().flush()
+    
+    stats = get_response_cache().stats()
+    logger.info(f"LLM response cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({stats['hit_rate']:.0%} hit rate)")
+    export_run_metrics()
+    
     logger.info("\nReprocessing Complete.")
 
 
+def reprocess_incremental() -> Dict[str, int]:
+    """
+    Re-run only what is out of date: reports whose document changed since their
+    results were produced, and candidates whose prompt version or model changed.
+    Current results are kept as they are, and the new card/discard sets replace
+    the old ones only once everything is computed, so readers never see a
+    partially rebuilt store.
+    
+    Returns:
+        Counts of skipped/reparsed reports and reused/regenerated candidates
+    """
+    settings = get_settings()
+    report_repo = get_report_repository()
+    card_repo = get_card_repository()
+    translation_service = get_translation_service()
+    fingerprints = get_fingerprint_index()
+    
+    reports = report_repo.find_all()
+    old_results = [*card_repo.find_all_cards(), *card_repo.find_all_discarded()]
+    by_report = defaultdict(list)
+    by_id = {}
+    for result in old_results:
+        by_report[result.report_id].append(result)
+        by_id[result.card_id if isinstance(result, OpportunityCard) else result.signal_id] = result
+    logger.info(f"Checking {len(reports)} reports against {len(old_results)} stored results...")
+    
+    fingerprints.clear()  # Rebuilt from the results that survive
+    translation_service.translate_reports([r for r in reports if not r.title_ko])
+    
+    new_cards, new_discarded = [], []
+    counts = {"reports_skipped": 0, "reports_reparsed": 0, "reused": 0, "regenerated": 0}
+    
+    def keep(candidate: str, result) -> None:
+        if isinstance(result, OpportunityCard):
+            new_cards.append(result)
+            fingerprints.add(candidate, result.card_id, result.report_id, "card")
+        else:
+            new_discarded.append(result)
+            fingerprints.add(candidate, result.signal_id, result.report_id, "discard")
+    
+    for i, report in enumerate(reports):
+        existing = by_report.get(report.report_id, [])
+        
+        # Unchanged document and nothing out of date: keep the report's results without parsing
+        cached_hash = None if settings.document_cache_revalidate else _content_hash(report.url)
+        if existing and cached_hash and all(r.content_hash == cached_hash and is_current(r) for r in existing):
+            for result in existing:
+                keep(result.evidence_sentence if isinstance(result, OpportunityCard) else result.raw_text, result)
+            counts["reports_skipped"] += 1
+            continue
+        
+        logger.info(f"[{i+1}/{len(reports)}] Reprocessing: {report.title[:50]}...")
+        counts["reports_reparsed"] += 1
+        try:
+            text = _parse_report(report)
+        except Exception as e:
+            logger.error(f"  -> Error: {e}", exc_info=True)
+            text = None
+        if not text:
+            logger.warning(f"Failed to extract text from {report.url}; keeping its previous results")
+            for result in existing:
+                keep(result.evidence_sentence if isinstance(result, OpportunityCard) else result.raw_text, result)
+            continue
+        
+        content_hash = _content_hash(report.url)
+        candidates, duplicates = fingerprints.select_novel(extract_candidate_sentences(text))
+        if duplicates:
+            logger.info(f"  -> Skipped {len(duplicates)} near-duplicate candidates")
+        
+        # Sentences that survived the content change keep their current results
+        previous = {
+            c: by_id.get(make_signal_id("card", report.report_id, c))
+            or by_id.get(make_signal_id("disc", report.report_id, c))
+            for c in candidates
+        }
+        results = {c: r for c, r in previous.items() if r is not None and is_current(r)}
+        missing = [c for c in candidates if c not in results]
+        if missing:
+            results.update(zip(missing, generate_signal_structs(missing, report.title, report.report_id)))
+        counts["reused"] += len(candidates) - len(missing)
+        counts["regenerated"] += len(missing)
+        
+        for candidate in candidates:
+            # An LLM failure keeps the previous (outdated) result rather than losing it
+            result = results[candidate] or previous[candidate]
+            if result is None:
+                continue
+            result.content_hash = content_hash
+            keep(candidate, result)
+        logger.info(f"  -> Reused {len(candidates) - len(missing)}, regenerated {len(missing)} candidates")
+    
+    # Swap in the new sets (each store is replaced atomically)
+    card_repo.save_cards(new_cards)
+    card_repo.save_discarded(new_discarded)
+    report_repo.save_all(reports)
+    fingerprints.save()
+    get_document_cache().flush()
+    export_run_metrics()
+    
+    logger.info(f"Incremental reprocess complete: {counts['reports_skipped']} reports unchanged, "
+                f"{counts['reports_reparsed']} reparsed, {counts['reused']} candidates reused, "
+                f"{counts['regenerated']} regenerated ({len(new_cards)} cards, {len(new_discarded)} discards).")
+    return counts
+
+
+def submit_reprocess_batch(backend: Optional[BatchBackend] = None) -> Path:
+    """
+    Build every structuring and translation request for a full reprocess,
+    write them to a JSONL job file and submit it as one offline batch.
+    Existing cards are left untouched until the results are collected.
+    
+    Args:
+        backend: Batch backend (defaults to settings.llm_batch_backend)
+    
+    Returns:
+        The job directory holding the job file and its manifest
+    """
+    settings = get_settings()
+    backend = backend or get_batch_backend()
+    translation_service = get_translation_service()
+    reports = get_report_repository().find_all()
+    
+    job_dir = settings.batch_jobs_dir / time.strftime("reprocess-%Y%m%d-%H%M%S")
+    job_dir.mkdir(parents=True, exist_ok=True)
+    # Near-duplicates are skipped across the whole job, as in the synchronous run
+    pending = FingerprintIndex(job_dir / "pending_fingerprints.json", settings.near_duplicate_max_distance)
+    
+    requests, manifest = [], {}
+    for i, report in enumerate(reports):
+        logger.info(f"[{i+1}/{len(reports)}] Preparing: {report.title[:50]}...")
+        
+        if not report.title_ko:
+            custom_id = f"tr-{report.report_id}"
+            requests.append(make_batch_request(
+                custom_id, translation_service.build_messages(report), response_format={"type": "json_object"}
+            ))
+            manifest[custom_id] = {"kind": "translation", "report_id": report.report_id}
+        
+        try:
+            text = _parse_report(report)
+        except Exception as e:
+            logger.error(f"  -> Error: {e}", exc_info=True)
+            continue
+        if not text:
+            logger.warning(f"Failed to extract text from {report.url}")
+            continue
+        
+        candidates, duplicates = pending.select_novel(extract_candidate_sentences(text))
+        if duplicates:
+            logger.info(f"  -> Skipped {len(duplicates)} near-duplicate candidates")
+        for candidate in candidates:
+            pending.add(candidate, "", report.report_id, "pending")
+        
+        for n, (batch, messages) in enumerate(plan_signal_requests(candidates, report.title)):
+            custom_id = f"sig-{report.report_id}-{n}"
+            requests.append(make_batch_request(custom_id, messages, response_format={"type": "json_object"}))
+            manifest[custom_id] = {
+                "kind": "signal",
+                "report_id": report.report_id,
+                "context": report.title,
+                "candidates": [candidates[j] for j in batch],
+            }
+    
+    job_file = write_job_file(requests, job_dir / "requests.jsonl")
+    batch_id = backend.submit(job_file)
+    (job_dir / "manifest.json").write_text(
+        json.dumps({"batch_id": batch_id, "requests": manifest}, ensure_ascii=False), encoding="utf-8"
+    )
+    get_document_cache().flush()
+    logger.info(f"Submitted {len(requests)} requests as batch {batch_id} (job: {job_dir})")
+    return job_dir
+
+
+def collect_reprocess_batch(job_dir: Path, backend: Optional[BatchBackend] = None) -> bool:
+    """
+    Wait for a submitted reprocess batch and ingest its results, replacing
+    all cards and discarded signals. Requests the batch did not answer are
+    retried synchronously.
+    
+    Args:
+        job_dir: Directory returned by submit_reprocess_batch
+        backend: Batch backend the job was submitted to
+    
+    Returns:
+        True if the results were ingested
+    """
+    settings = get_settings()
+    backend = backend or get_batch_backend()
+    manifest = json.loads((job_dir / "manifest.json").read_text(encoding="utf-8"))
+    batch_id = manifest["batch_id"]
+    
+    status = wait_for_batch(
+        backend, batch_id,
+        poll_seconds=settings.llm_batch_poll_seconds,
+        timeout_seconds=settings.llm_batch_timeout_hours * 3600,
+    )
+    result_file = backend.download_results(batch_id, job_dir / "results.jsonl") if status == "completed" else None
+    if result_file is None:
+        logger.error(f"Batch {batch_id} finished as {status} without results; nothing ingested.")
+        return False
+    contents = read_result_file(result_file)
+    
+    report_repo = get_report_repository()
+    card_repo = get_card_repository()
+    translation_service = get_translation_service()
+    fingerprints = get_fingerprint_index()
+    reports = {r.report_id: r for r in report_repo.find_all()}
+    fingerprints.clear()
+    get_work_units().clear()
+    
+    new_cards, new_discarded, retried = [], [], 0
+    for custom_id, request in manifest["requests"].items():
+        report = reports.get(request["report_id"])
+        if report is None:
+            continue
+        content = contents.get(custom_id)
+        
+        if request["kind"] == "translation":
+            if content is None:
+                translation_service.translate_report(report)
+                continue
+            try:
+                translation_service.apply_translation(report, content)
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse translation JSON for report {report.report_id}: {e}")
+            continue
+        
+        candidates = request["candidates"]
+        results = (parse_signal_results(content, candidates, report.report_id)
+                   if content is not None else [None] * len(candidates))
+        missing = [j for j, result in enumerate(results) if result is None]
+        if missing:
+            retried += len(missing)
+            fallback = generate_signal_structs([candidates[j] for j in missing], request["context"], report.report_id)
+            for j, result in zip(missing, fallback):
+                results[j] = result
+        
+        content_hash = _content_hash(report.url)
+        for candidate, result in zip(candidates, results):
+            if result is not None:
+                result.content_hash = content_hash
+            if isinstance(result, OpportunityCard):
+                new_cards.append(result)
+                fingerprints.add(candidate, result.card_id, report.report_id, "card")
+            elif isinstance(result, DiscardedSignal):
+                new_discarded.append(result)
+                fingerprints.add(candidate, result.signal_id, report.report_id, "discard")
+    
+    card_repo.save_cards(new_cards)
+    card_repo.save_discarded(new_discarded)
+    report_repo.save_all(list(reports.values()))
+    fingerprints.save()
+    export_run_metrics()
+    logger.info(f"Ingested batch {batch_id}: {len(new_cards)} Opportunity Cards, "
+                f"{len(new_discarded)} Discarded Signals ({retried} candidates retried synchronously).")
+    return True
+
+
+def reprocess_all_batch(backend: Optional[BatchBackend] = None) -> bool:
+    """Full reprocess through the offline Batch API: submit, wait, ingest."""
+    backend = backend or get_batch_backend()
+    return collect_reprocess_batch(submit_reprocess_batch(backend), backend)
+
+
 if __name__ == "__main__":
-    reprocess_all()
+    parser = argparse.ArgumentParser(description="Regenerate all opportunity cards from existing reports.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Re-run only reports/candidates whose prompt version, model or content changed")
+    parser.add_argument("--batch", action="store_true", help="Run through the offline Batch API")
+    parser.add_argument("--submit-only", action="store_true", help="With --batch: submit and exit")
+    parser.add_argument("--collect", metavar="JOB_DIR", help="Ingest the results of a submitted batch job")
+    args = parser.parse_args()
+    
+    if args.incremental:
+        reprocess_incremental()
+    elif args.collect:
+        collect_reprocess_batch(Path(args.collect))
+    elif args.batch and args.submit_only:
+        submit_reprocess_batch()
+    elif args.batch:
+        reprocess_all_batch()
+    else:
+        reprocess_all()
 
@@ -0,0 +1,57 @@
+"""
+Deterministic, content-addressed identifiers.
+Python's built-in hash() is salted per process, so IDs are derived from
+SHA-256 digests of normalized URLs and texts instead.
+"""
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that identify a campaign, not a document
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref"}
+
+DIGEST_LENGTH = 16
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different links map to the same document.
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    parameters and trailing slashes, and sorts the query string.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so re-extracted sentences hash identically."""
+    return " ".join(text.split())
+
+
+def digest(*parts: str) -> str:
+    """Short stable hex digest of one or more string parts."""
+    h = hashlib.sha256("\x1f".join(parts).encode("utf-8"))
+    return h.hexdigest()[:DIGEST_LENGTH]
+
+
+def make_report_id(url: str) -> str:
+    """Report ID derived from the normalized report URL."""
+    return f"rep_{digest(normalize_url(url))}"
+
+
+def make_signal_id(prefix: str, report_id: str, text: str) -> str:
+    """Card/discard ID derived from the source report and candidate text."""
+    return f"{prefix}_{digest(report_id, normalize_text(text))}"
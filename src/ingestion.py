@@ -1,3 +1,4 @@
+import logging
 import feedparser
 from datetime import datetime
 from typing import List, Tuple
@@ -8,6 +9,8 @@ from .config import get_settings
 # Get RSS URL from config
 RSS_URL = get_settings().rss_feed_url 
 
+logger = logging.getLogger(__name__)
+
 def parse_date(date_str: str) -> datetime:
     try:
         # Common RSS date formats, feedparser usually handles this but returning struct_time
@@ -16,35 +19,78 @@ def parse_date(date_str: str) -> datetime:
     except:
         return datetime.now()
 
-import requests
 import io
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional
+from .models import FeedState
+from .repositories import get_feed_state_repository, get_report_repository
+from .ids import make_report_id, normalize_url
+from .services.http_client import get_http_client
+from .services.metrics import get_metrics, timed
 
-def fetch_rss_feed(url: str = RSS_URL) -> List[Report]:
+@timed("fetch_rss_feed")
+def fetch_rss_feed(
+    url: str = RSS_URL, source: str = "PwC", timeout: int = 10
+) -> Tuple[List[Report], Optional[FeedState]]:
     """
-    Fetches new reports from RSS feed using requests (for User-Agent) + feedparser.
+    Fetches new reports from RSS feed using the shared HTTP client + feedparser.
+    Sends If-None-Match / If-Modified-Since from the stored feed state, and skips
+    parsing entirely on a 304 or when the body hash is unchanged.
     Checks against existing URL in storage to prevent duplicates.
+    
+    The updated feed state is returned rather than saved: the caller commits it
+    with commit_feed_states() once the reports are in reports.json, so a crash
+    in between re-fetches the feed instead of skipping its entries for good.
+    Returns (new_reports, feed state to commit or None on error).
     """
+    state_repo = get_feed_state_repository()
+    state = state_repo.find_by_url(url) or FeedState(url=url)
+    
     try:
-        headers = {
-             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
+        headers = {}
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        response = get_http_client().get(url, headers=headers, timeout=timeout)
+        
+        if response.status_code == 304:
+            logger.debug(f"Feed not modified (304): {url}")
+            state.checked_at = datetime.now()
+            return [], state
+        
         response.raise_for_status()
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        
+        # Servers that ignore validators still let us skip unchanged bodies
+        unchanged = content_hash == state.content_hash
+        state.etag = response.headers.get("ETag") or state.etag
+        state.last_modified = response.headers.get("Last-Modified") or state.last_modified
+        state.content_hash = content_hash
+        state.checked_at = datetime.now()
+        
+        if unchanged:
+            logger.debug(f"Feed body unchanged: {url}")
+            return [], state
+        
         feed = feedparser.parse(io.BytesIO(response.content))
     except Exception as e:
-        print(f"Error fetching RSS: {e}")
-        return []
+        print(f"Error fetching RSS {url}: {e}")
+        get_metrics().inc("errors_total", operation="fetch_rss_feed", error=e.__class__.__name__)
+        return [], None
 
     print(f"DEBUG: Feed Status: {getattr(feed, 'status', 'Unknown')}, Entries: {len(feed.entries)}")
     
-    existing_reports = load_reports()
-    existing_urls = {r.url for r in existing_reports}
+    report_index = get_report_repository().index
+    seen_urls = set()
     
     new_reports = []
     
     for entry in feed.entries:
         link = entry.get("link", "")
-        if link in existing_urls:
+        normalized = normalize_url(link)
+        if normalized in seen_urls or report_index.has_url(link):
             continue
             
         # Convert published_parsed to datetime
@@ -53,30 +99,82 @@ def fetch_rss_feed(url: str = RSS_URL) -> List[Report]:
              published_at = datetime(*entry.published_parsed[:6])
         
         report = Report(
-            report_id=f"rep_{int(published_at.timestamp())}_{hash(link)}", # Simple ID generation
+            report_id=make_report_id(link),
             title=entry.get("title", "No Title"),
-            source="PwC",
+            source=source,
             url=link,
             published_at=published_at,
             summary=entry.get("summary", ""),
             ingestion_status=IngestionStatus.PENDING
         )
         new_reports.append(report)
-        existing_urls.add(link) # Avoid duplicates within the same fetch
-        
-    return new_reports
+        seen_urls.add(normalized) # Avoid duplicates within the same fetch
+    
+    return new_reports, state
+
+def fetch_all_feeds(feeds: Optional[List[Tuple[str, str]]] = None) -> Tuple[List[Report], List[FeedState]]:
+    """
+    Fetches all configured feeds concurrently on a bounded thread pool.
+    Each feed gets its own timeout; feeds that fail or time out contribute nothing.
+    Returns one batch of new reports, deduplicated by URL in feed order, and the
+    feed states to pass to commit_feed_states() after the reports are saved.
+    """
+    settings = get_settings()
+    feeds = feeds if feeds is not None else settings.feed_sources
+    if not feeds:
+        return [], []
+    
+    timeout = settings.feed_timeout
+    workers = max(1, min(settings.feed_fetch_workers, len(feeds)))
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [executor.submit(fetch_rss_feed, url, source, timeout) for url, source in feeds]
+    
+    # Connect + read timeouts bound each request; the wait bounds stragglers
+    waves = -(-len(feeds) // workers)
+    wait(futures, timeout=timeout * 2 * waves)
+    executor.shutdown(wait=False, cancel_futures=True)
+    
+    merged = []
+    states = []
+    seen_ids = set()
+    for (url, source), future in zip(feeds, futures):
+        if not future.done():
+            print(f"Timed out fetching RSS {url} ({source})")
+            continue
+        try:
+            reports, state = future.result()
+        except Exception as e:
+            print(f"Error fetching RSS {url}: {e}")
+            continue
+        if state is not None:
+            states.append(state)
+        for report in reports:
+            if report.report_id in seen_ids:
+                continue
+            seen_ids.add(report.report_id)
+            merged.append(report)
+    
+    return merged, states
+
+def commit_feed_states(states: List[FeedState]) -> None:
+    """
+    Persists feed validators returned by fetch_all_feeds.
+    Call only after the fetched reports have been saved.
+    """
+    get_feed_state_repository().save_many(states)
 
 def ingest_new_reports() -> Tuple[int, int]:
     """
     Orchestrator to fetch and save new pending reports.
     Returns (num_newly_found, num_total_pending)
     """
-    new_reports = fetch_rss_feed()
+    new_reports, feed_states = fetch_all_feeds()
     all_reports = load_reports()
     
     if new_reports:
         all_reports.extend(new_reports)
         save_reports(all_reports)
+    commit_feed_states(feed_states)
         
     pending_count = sum(1 for r in all_reports if r.ingestion_status == IngestionStatus.PENDING)
     return len(new_reports), pending_count
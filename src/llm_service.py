@@ -2,19 +2,238 @@
 Signal generation service using LLM.
 Converts candidate sentences into structured OpportunityCard objects.
 """
+import asyncio
 import json
 import logging
-from datetime import datetime
-from typing import Union, Optional
+import re
+from typing import Any, Callable, Dict, List, Tuple, Union, Optional
 
 from .models import OpportunityCard, DiscardedSignal
+from .ids import make_signal_id
 from .services.llm_client import LLMClient
 from .services.prompt_templates import PromptTemplates
+from .config import get_settings
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
+# Rough characters-per-token ratio for English prompts (no tokenizer dependency)
+CHARS_PER_TOKEN = 4
+
+
+# A complete importance_score value at the start of a streamed JSON object
+SCORE_PREFIX = re.compile(r'"importance_score"\s*:\s*(\d+)\s*[,}\n]')
+
+# Reason prefix of discards decided by the cheap screening pass
+SCREENING_REASON = "Low Screening Score"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate used for request packing."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def build_signal_messages(candidate_text: str, context_summary: str) -> List[Dict[str, str]]:
+    """
+    Builds the chat messages for structuring a single candidate sentence.
+    
+    Args:
+        candidate_text: The candidate sentence to analyze
+        context_summary: Contextual information (report title or summary)
+    
+    Returns:
+        List of message dictionaries
+    """
+    prompt = PromptTemplates.format_signal_extraction(
+        sentence=candidate_text,
+        context=context_summary,
+        english_only=get_settings().deferred_korean
+    )
+    return [
+        {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def build_signal_batch_messages(candidates: List[str], context_summary: str) -> List[Dict[str, str]]:
+    """
+    Builds the chat messages for structuring several candidates in one request.
+    
+    Args:
+        candidates: Candidate sentences from the same report
+        context_summary: Contextual information (report title or summary)
+    
+    Returns:
+        List of message dictionaries
+    """
+    prompt = PromptTemplates.format_signal_extraction_batch(
+        sentences=candidates,
+        context=context_summary,
+        english_only=get_settings().deferred_korean
+    )
+    return [
+        {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def build_scoring_messages(candidates: List[str], context_summary: str) -> List[Dict[str, str]]:
+    """
+    Builds the chat messages for the cheap score-only screening pass.
+    
+    Args:
+        candidates: Candidate sentences from the same report
+        context_summary: Contextual information (report title or summary)
+    
+    Returns:
+        List of message dictionaries
+    """
+    prompt = PromptTemplates.format_signal_scoring(
+        sentences=candidates,
+        context=context_summary
+    )
+    return [
+        {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _as_score(value: Any) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _scoring_model() -> str:
+    settings = get_settings()
+    return settings.cascade_scoring_model or settings.openai_model
+
+
+def _discard(
+    candidate_text: str,
+    report_id: str,
+    score: int,
+    reason: str,
+    model: Optional[str] = None
+) -> DiscardedSignal:
+    return DiscardedSignal(
+        signal_id=make_signal_id("disc", report_id, candidate_text),
+        report_id=report_id,
+        reason=reason,
+        raw_text=candidate_text,
+        importance_score=score,
+        prompt_version=PromptTemplates.VERSION,
+        llm_model=model or get_settings().openai_model
+    )
+
+
+def is_current(result: Union[OpportunityCard, DiscardedSignal]) -> bool:
+    """
+    Check whether a stored card/discard was produced by the current prompt
+    version and model (screening discards are checked against the scoring model).
+    
+    Args:
+        result: A stored OpportunityCard or DiscardedSignal
+    
+    Returns:
+        True if re-running it would use the same prompt and model
+    """
+    screened = isinstance(result, DiscardedSignal) and result.reason.startswith(SCREENING_REASON)
+    model = _scoring_model() if screened else get_settings().openai_model
+    return result.prompt_version == PromptTemplates.VERSION and result.llm_model == model
+
+
+def build_signal_result(
+    data: Dict[str, Any],
+    candidate_text: str,
+    report_id: str
+) -> Union[OpportunityCard, DiscardedSignal]:
+    """
+    Converts one parsed LLM result into an OpportunityCard or DiscardedSignal.
+    
+    Args:
+        data: Parsed JSON object for a single candidate
+        candidate_text: The candidate sentence that was analyzed
+        report_id: ID of the source report
+    
+    Returns:
+        OpportunityCard if importance_score >= signal_discard_threshold, otherwise DiscardedSignal
+    
+    Raises:
+        ValueError: If importance_score is not a number or a field fails validation
+    """
+    score = _as_score(data.get("importance_score", 0))
+    if score is None:
+        raise ValueError(f"importance_score is not a number: {data.get('importance_score')!r}")
+    
+    # Check if score is below threshold
+    if score < get_settings().signal_discard_threshold:
+        return _discard(candidate_text, report_id, score, f"Low Score: {score}")
+    
+    # Create OpportunityCard
+    return OpportunityCard(
+        card_id=make_signal_id("card", report_id, candidate_text),
+        pain_holder=data.get("pain_holder", "Unknown"),
+        pain_holder_ko=data.get("pain_holder_ko"),
+        pain_context=data.get("pain_context", "Unknown"),
+        pain_context_ko=data.get("pain_context_ko"),
+        pain_mechanism=data.get("pain_mechanism", "Unknown"),
+        pain_mechanism_ko=data.get("pain_mechanism_ko"),
+        attack_vector=data.get("attack_vector", "Unknown"),
+        attack_vector_ko=data.get("attack_vector_ko"),
+        evidence_sentence=candidate_text,
+        evidence_sentence_ko=data.get("evidence_sentence_ko"),
+        industry_tags=data.get("industry_tags") or [],
+        technology_tags=data.get("technology_tags") or [],
+        importance_score=score,
+        confidence_score=data.get("confidence_score", 0.0),
+        report_id=report_id,
+        # Phase 2: Value Fields
+        market_size=data.get("market_size"),
+        value_type=data.get("value_type"),
+        expected_impact=data.get("expected_impact"),
+        timeline=data.get("timeline"),
+        prompt_version=PromptTemplates.VERSION,
+        llm_model=get_settings().openai_model
+    )
+
+
+def _build_item_result(
+    data: Dict[str, Any],
+    candidate_text: str,
+    report_id: str
+) -> Union[OpportunityCard, DiscardedSignal, None]:
+    """Converts one item of a batched response, or returns None if it is malformed."""
+    try:
+        return build_signal_result(data, candidate_text, report_id)
+    except (ValueError, TypeError) as e:  # pydantic ValidationError is a ValueError
+        logger.warning(f"Malformed LLM result for candidate in {report_id}: {e}")
+        return None
+
+
+def _signal_cache_check(candidate_text: str, report_id: str) -> Callable[[str], bool]:
+    """Cache predicate for single-candidate responses: only convertible results are stored."""
+    def check(content: str) -> bool:
+        try:
+            data = json.loads(content)
+            return isinstance(data, dict) and build_signal_result(data, candidate_text, report_id) is not None
+        except (ValueError, TypeError):
+            return False
+    return check
+
+
+def _batch_cache_check(size: int) -> Callable[[str], bool]:
+    """Cache predicate for batched responses: at least one usable item is required."""
+    def check(content: str) -> bool:
+        try:
+            return bool(_parse_batch_response(content, size))
+        except (ValueError, TypeError, AttributeError):
+            return False
+    return check
+
+
 def generate_signal_struct(
     candidate_text: str, 
     context_summary: str, 
@@ -29,8 +248,8 @@ def generate_signal_struct(
         report_id: ID of the source report
     
     Returns:
-        OpportunityCard: If valid opportunity with score >= 50
-        DiscardedSignal: If importance_score < 50
+        OpportunityCard: If valid opportunity with score >= signal_discard_threshold
+        DiscardedSignal: If importance_score is below the threshold
         None: If LLM fails or is not available
     """
     # Get LLM client
@@ -41,21 +260,11 @@ def generate_signal_struct(
         return None
 
     try:
-        # Format prompt
-        prompt = PromptTemplates.format_signal_extraction(
-            sentence=candidate_text,
-            context=context_summary
-        )
-        
         # Call LLM
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
-            {"role": "user", "content": prompt}
-        ]
-        
         response = llm_client.chat_completion(
-            messages=messages,
-            response_format={"type": "json_object"}
+            messages=build_signal_messages(candidate_text, context_summary),
+            response_format={"type": "json_object"},
+            cache_if=_signal_cache_check(candidate_text, report_id)
         )
         
         if not response or not response.choices:
@@ -66,43 +275,237 @@ def generate_signal_struct(
         logger.debug(f"LLM Response Content: {content}")
         
         # Parse JSON response
-        data = json.loads(content)
-        score = data.get("importance_score", 0)
+        return build_signal_result(json.loads(content), candidate_text, report_id)
         
-        # Check if score is below threshold
-        if score < 50:
-            return DiscardedSignal(
-                signal_id=f"disc_{int(datetime.now().timestamp())}_{hash(candidate_text[:10])}",
-                report_id=report_id,
-                reason=f"Low Score: {score}",
-                raw_text=candidate_text,
-                importance_score=score
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse LLM JSON response: {e}")
+        return None
+    except Exception as e:
+        logger.error(f"Error calling LLM: {e}", exc_info=True)
+        return None
+
+
+def pack_candidates(
+    candidates: List[str],
+    context_summary: str,
+    token_budget: int,
+    max_items: int,
+    output_tokens_per_item: int
+) -> List[List[int]]:
+    """
+    Greedily packs candidates into batches that fit a per-request token budget.
+    
+    The budget covers the shared prompt, each numbered sentence and the
+    output expected for each result, so responses are not truncated.
+    
+    Args:
+        candidates: Candidate sentences
+        context_summary: Contextual information included once per batch
+        token_budget: Maximum estimated prompt + completion tokens per request
+        max_items: Maximum candidates per request
+        output_tokens_per_item: Expected completion tokens per result
+    
+    Returns:
+        List of batches, each a list of indices into candidates
+    """
+    base_tokens = estimate_tokens(
+        PromptTemplates.format_signal_extraction_batch([], context_summary, get_settings().deferred_korean)
+    )
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = base_tokens
+    
+    for i, candidate in enumerate(candidates):
+        item_tokens = estimate_tokens(candidate) + 8 + output_tokens_per_item
+        if current and (len(current) >= max_items or current_tokens + item_tokens > token_budget):
+            batches.append(current)
+            current, current_tokens = [], base_tokens
+        current.append(i)
+        current_tokens += item_tokens
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch_response(content: str, size: int) -> Dict[int, Dict[str, Any]]:
+    """Maps result index -> result object from a batched JSON response."""
+    data = json.loads(content)
+    results = data.get("results", []) if isinstance(data, dict) else data
+    parsed = {}
+    for position, item in enumerate(results if isinstance(results, list) else []):
+        if not isinstance(item, dict):
+            continue
+        index = item.get("index", position)
+        if isinstance(index, int) and 0 <= index < size and index not in parsed:
+            parsed[index] = item
+    return parsed
+
+
+def plan_signal_requests(
+    candidates: List[str],
+    context_summary: str
+) -> List[Tuple[List[int], List[Dict[str, str]]]]:
+    """
+    Packs candidates into requests using the configured batching settings.
+    
+    Args:
+        candidates: Candidate sentences from the same report
+        context_summary: Contextual information (report title or summary)
+    
+    Returns:
+        List of (candidate indices, chat messages), one per request
+    """
+    settings = get_settings()
+    batches = pack_candidates(
+        candidates,
+        context_summary,
+        token_budget=settings.llm_batch_token_budget,
+        max_items=settings.llm_batch_max_items if settings.llm_batching else 1,
+        output_tokens_per_item=settings.llm_output_tokens_per_signal,
+    )
+    requests = []
+    for batch in batches:
+        batch_candidates = [candidates[i] for i in batch]
+        if len(batch) == 1:
+            messages = build_signal_messages(batch_candidates[0], context_summary)
+        else:
+            messages = build_signal_batch_messages(batch_candidates, context_summary)
+        requests.append((batch, messages))
+    return requests
+
+
+def parse_signal_results(
+    content: str,
+    candidates: List[str],
+    report_id: str
+) -> List[Union[OpportunityCard, DiscardedSignal, None]]:
+    """
+    Converts the response to a planned request back into per-candidate results.
+    
+    Args:
+        content: JSON message content (single object, or batched "results")
+        candidates: The candidates the request covered, in order
+        report_id: ID of the source report
+    
+    Returns:
+        One result per candidate (None where the response has no usable result)
+    """
+    try:
+        if len(candidates) == 1:
+            parsed = {0: json.loads(content)}
+        else:
+            parsed = _parse_batch_response(content, len(candidates))
+    except (json.JSONDecodeError, TypeError, AttributeError) as e:
+        logger.error(f"Failed to parse LLM JSON response: {e}")
+        return [None] * len(candidates)
+    return [
+        _build_item_result(parsed[i], candidate, report_id) if isinstance(parsed.get(i), dict) else None
+        for i, candidate in enumerate(candidates)
+    ]
+
+
+async def _ascore_chunk(candidates: List[str], context_summary: str) -> List[Optional[int]]:
+    """Scores one chunk of candidates in a single screening request."""
+    settings = get_settings()
+    llm_client = LLMClient.get_instance()
+    try:
+        response = await llm_client.achat_completion(
+            messages=build_scoring_messages(candidates, context_summary),
+            model=_scoring_model(),
+            response_format={"type": "json_object"},
+            max_tokens=24 * len(candidates) + 64,
+            cache_if=_batch_cache_check(len(candidates))
+        )
+        if not response or not response.choices:
+            return [None] * len(candidates)
+        parsed = _parse_batch_response(response.choices[0].message.content, len(candidates))
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse screening JSON response: {e}")
+        return [None] * len(candidates)
+    except Exception as e:
+        logger.error(f"Error calling LLM for screening: {e}", exc_info=True)
+        return [None] * len(candidates)
+    return [_as_score(parsed[i].get("importance_score")) if i in parsed else None for i in range(len(candidates))]
+
+
+async def ascore_candidates(candidates: List[str], context_summary: str) -> List[Optional[int]]:
+    """
+    Cheap first pass of the model cascade: scores candidates without
+    structuring or translating them.
+    
+    Args:
+        candidates: Candidate sentences from the same report
+        context_summary: Contextual information (report title or summary)
+    
+    Returns:
+        One importance score per candidate (None where screening failed)
+    """
+    size = max(1, get_settings().cascade_batch_size)
+    chunks = [candidates[i:i + size] for i in range(0, len(candidates), size)]
+    chunk_scores = await asyncio.gather(*(_ascore_chunk(chunk, context_summary) for chunk in chunks))
+    return [score for scores in chunk_scores for score in scores]
+
+
+def _below_threshold(partial: str, threshold: int) -> bool:
+    """True once a streamed response has revealed a score below threshold."""
+    match = SCORE_PREFIX.search(partial)
+    return match is not None and int(match.group(1)) < threshold
+
+
+async def agenerate_signal_struct(
+    candidate_text: str,
+    context_summary: str,
+    report_id: str
+) -> Union[OpportunityCard, DiscardedSignal, None]:
+    """
+    Async variant of generate_signal_struct.
+    With llm_streaming enabled the response is streamed and cancelled as soon
+    as its leading importance_score is below the discard threshold.
+    
+    Args:
+        candidate_text: The candidate sentence to analyze
+        context_summary: Contextual information (report title or summary)
+        report_id: ID of the source report
+    
+    Returns:
+        OpportunityCard, DiscardedSignal, or None if the LLM fails
+    """
+    llm_client = LLMClient.get_instance()
+    
+    if not llm_client.is_available:
+        logger.warning("LLM client not available. Returning None.")
+        return None
+    
+    settings = get_settings()
+    messages = build_signal_messages(candidate_text, context_summary)
+    
+    try:
+        if settings.llm_streaming:
+            content, aborted = await llm_client.astream_chat_completion(
+                messages=messages,
+                response_format={"type": "json_object"},
+                should_stop=lambda partial: _below_threshold(partial, settings.signal_discard_threshold),
+                cache_if=_signal_cache_check(candidate_text, report_id)
+            )
+            if aborted:
+                score = int(SCORE_PREFIX.search(content).group(1))
+                return _discard(candidate_text, report_id, score, f"Low Score: {score}")
+        else:
+            response = await llm_client.achat_completion(
+                messages=messages,
+                response_format={"type": "json_object"},
+                cache_if=_signal_cache_check(candidate_text, report_id)
             )
+            content = response.choices[0].message.content if response and response.choices else None
         
-        # Create OpportunityCard
-        return OpportunityCard(
-            card_id=f"card_{int(datetime.now().timestamp())}_{hash(candidate_text[:10])}",
-            pain_holder=data.get("pain_holder", "Unknown"),
-            pain_holder_ko=data.get("pain_holder_ko"),
-            pain_context=data.get("pain_context", "Unknown"),
-            pain_context_ko=data.get("pain_context_ko"),
-            pain_mechanism=data.get("pain_mechanism", "Unknown"),
-            pain_mechanism_ko=data.get("pain_mechanism_ko"),
-            attack_vector=data.get("attack_vector", "Unknown"),
-            attack_vector_ko=data.get("attack_vector_ko"),
-            evidence_sentence=candidate_text,
-            evidence_sentence_ko=data.get("evidence_sentence_ko"),
-            industry_tags=data.get("industry_tags", []),
-            technology_tags=data.get("technology_tags", []),
-            importance_score=score,
-            confidence_score=data.get("confidence_score", 0.0),
-            report_id=report_id,
-            # Phase 2: Value Fields
-            market_size=data.get("market_size"),
-            value_type=data.get("value_type"),
-            expected_impact=data.get("expected_impact"),
-            timeline=data.get("timeline")
-        )
+        if not content:
+            logger.warning("No response from LLM")
+            return None
+        
+        logger.debug(f"LLM Response Content: {content}")
+        
+        return build_signal_result(json.loads(content), candidate_text, report_id)
         
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse LLM JSON response: {e}")
@@ -112,6 +515,141 @@ def generate_signal_struct(
         return None
 
 
+async def _astructure_batch(
+    candidates: List[str],
+    context_summary: str,
+    report_id: str
+) -> List[Union[OpportunityCard, DiscardedSignal, None]]:
+    """Structures one packed batch, retrying missing items singly and concurrently."""
+    if len(candidates) == 1:
+        return [await agenerate_signal_struct(candidates[0], context_summary, report_id)]
+    
+    llm_client = LLMClient.get_instance()
+    parsed: Dict[int, Dict[str, Any]] = {}
+    try:
+        response = await llm_client.achat_completion(
+            messages=build_signal_batch_messages(candidates, context_summary),
+            response_format={"type": "json_object"},
+            cache_if=_batch_cache_check(len(candidates))
+        )
+        if response and response.choices:
+            parsed = _parse_batch_response(response.choices[0].message.content, len(candidates))
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse batched LLM JSON response: {e}")
+    except Exception as e:
+        logger.error(f"Error calling LLM for batch: {e}", exc_info=True)
+    
+    results: List[Union[OpportunityCard, DiscardedSignal, None]] = [None] * len(candidates)
+    missing = []
+    for position, candidate in enumerate(candidates):
+        # Malformed items count as missing and go through the single-candidate retry
+        if position in parsed:
+            results[position] = _build_item_result(parsed[position], candidate, report_id)
+        if results[position] is None:
+            missing.append(position)
+    
+    if missing:
+        logger.debug(f"Batch results missing for {len(missing)} candidates; retrying singly")
+        retried = await asyncio.gather(*(
+            agenerate_signal_struct(candidates[p], context_summary, report_id) for p in missing
+        ))
+        for position, result in zip(missing, retried):
+            results[position] = result
+    
+    return results
+
+
+async def agenerate_signal_structs(
+    candidates: List[str],
+    context_summary: str,
+    report_id: str
+) -> List[Union[OpportunityCard, DiscardedSignal, None]]:
+    """
+    Structures many candidates from one report with as few LLM requests as possible.
+    
+    With the cascade enabled, a cheap score-only pass runs first and
+    candidates below cascade_score_threshold are discarded without the full
+    prompt (candidates the screener fails on are structured anyway).
+    The rest are packed into token-budgeted batches; each batch is one
+    request returning a JSON array, and all batches run concurrently (bounded
+    by the client's rate limiter). Results are mapped back by index, and any
+    candidate missing from a batch response (or a whole failed batch) falls
+    back to a single-candidate call.
+    
+    Args:
+        candidates: Candidate sentences from the same report
+        context_summary: Contextual information (report title or summary)
+        report_id: ID of the source report
+    
+    Returns:
+        One result per candidate, in input order (None where the LLM failed)
+    """
+    settings = get_settings()
+    llm_client = LLMClient.get_instance()
+    
+    if not llm_client.is_available:
+        logger.warning("LLM client not available. Returning None.")
+        return [None] * len(candidates)
+    
+    results: List[Union[OpportunityCard, DiscardedSignal, None]] = [None] * len(candidates)
+    selected = list(range(len(candidates)))
+    
+    if settings.cascade_enabled and candidates:
+        scores = await ascore_candidates(candidates, context_summary)
+        selected = []
+        for index, score in enumerate(scores):
+            if score is not None and score < settings.cascade_score_threshold:
+                results[index] = _discard(
+                    candidates[index], report_id, score, f"{SCREENING_REASON}: {score}", model=_scoring_model()
+                )
+            else:
+                selected.append(index)
+        logger.debug(f"Screening kept {len(selected)}/{len(candidates)} candidates")
+    
+    batches = pack_candidates(
+        [candidates[i] for i in selected],
+        context_summary,
+        token_budget=settings.llm_batch_token_budget,
+        max_items=settings.llm_batch_max_items if settings.llm_batching else 1,
+        output_tokens_per_item=settings.llm_output_tokens_per_signal,
+    )
+    batches = [[selected[i] for i in batch] for batch in batches]
+    batch_results = await asyncio.gather(*(
+        _astructure_batch([candidates[i] for i in batch], context_summary, report_id)
+        for batch in batches
+    ))
+    
+    for batch, batch_result in zip(batches, batch_results):
+        for index, result in zip(batch, batch_result):
+            results[index] = result
+    return results
+
+
+def generate_signal_structs(
+    candidates: List[str],
+    context_summary: str,
+    report_id: str
+) -> List[Union[OpportunityCard, DiscardedSignal, None]]:
+    """
+    Synchronous entry point for agenerate_signal_structs.
+    Runs on the LLM client's shared event loop, so a report's batches are
+    in flight together and finish in roughly one LLM round-trip.
+    
+    Args:
+        candidates: Candidate sentences from the same report
+        context_summary: Contextual information (report title or summary)
+        report_id: ID of the source report
+    
+    Returns:
+        One result per candidate, in input order (None where the LLM failed)
+    """
+    llm_client = LLMClient.get_instance()
+    if not llm_client.is_available:
+        logger.warning("LLM client not available. Returning None.")
+        return [None] * len(candidates)
+    return llm_client.run(agenerate_signal_structs(candidates, context_summary, report_id))
+
+
 # Backward compatibility: expose translate_report from translation service
 def translate_report(report) -> None:
     """
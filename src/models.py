@@ -45,6 +45,11 @@ class OpportunityCard(BaseModel):
     value_type: Optional[str] = None   # e.g., "Cost Reduction", "Revenue Growth"
     expected_impact: Optional[str] = None  # e.g., "20-30% cost savings"
     timeline: Optional[str] = None  # e.g., "12-18 months to market"
+    
+    # Provenance: what produced this card (drives incremental reprocessing)
+    prompt_version: Optional[str] = None
+    llm_model: Optional[str] = None
+    content_hash: Optional[str] = None  # SHA-256 of the source document
 
 
 class DiscardedSignal(BaseModel):
@@ -54,3 +59,17 @@ class DiscardedSignal(BaseModel):
     raw_text: str
     importance_score: int = 0
     created_at: datetime = Field(default_factory=datetime.now)
+    
+    # Provenance (see OpportunityCard)
+    prompt_version: Optional[str] = None
+    llm_model: Optional[str] = None
+    content_hash: Optional[str] = None
+
+
+class FeedState(BaseModel):
+    """HTTP cache validators remembered for a polled feed URL."""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    checked_at: datetime = Field(default_factory=datetime.now)
@@ -1,47 +1,397 @@
-import requests
 import io
+import os
+import mmap
+import shutil
+import hashlib
+import tempfile
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
 from bs4 import BeautifulSoup
 from pypdf import PdfReader
 
-def parse_html_content(url: str) -> str:
+from .config import get_settings
+from .services.http_client import get_http_client
+from .services.document_cache import get_document_cache
+from .services.metrics import get_metrics, timed
+
+# Extractor versions key the text cache; bump when extraction logic changes
+HTML_EXTRACTOR = "html-v1"
+PDF_EXTRACTOR = "pdf-v1"
+# Incremental extraction cleans PDF text page by page, which differs from whole-document cleaning
+PDF_PAGES_EXTRACTOR = "pdf-pages-v1"
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+SECTION_CHARS = 4000  # Roughly one PDF page of text
+
+def _new_spool() -> tempfile.SpooledTemporaryFile:
+    """Temp file that stays in memory for small documents and rolls to disk for large ones."""
+    max_size = get_settings().pdf_spool_max_mb * 1024 * 1024
+    return tempfile.SpooledTemporaryFile(max_size=max_size, mode="w+b")
+
+def _download(url: str, headers: dict, spool: BinaryIO):
     """
-    Fetches HTML and extracts main content text using BeautifulSoup.
+    Streams a response body into the spool, hashing as it goes.
+    Returns (response, content_hash); content_hash is None on a 304.
     """
+    response = get_http_client().get(url, headers=headers, stream=True)
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=10)
+        if response.status_code == 304:
+            return response, None
         response.raise_for_status()
+        hasher = hashlib.sha256()
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            hasher.update(chunk)
+            spool.write(chunk)
+        spool.seek(0)
+        return response, hasher.hexdigest()
+    finally:
+        response.close()
+
+@contextmanager
+def open_document(url: str) -> Iterator[Tuple[BinaryIO, str]]:
+    """
+    Opens a document as a seekable binary stream, without loading it into memory.
+    Serves from the document cache when possible; with revalidation enabled,
+    cached validators are sent as a conditional GET.
+    Yields (stream, content_hash).
+    """
+    settings = get_settings()
+    cache = get_document_cache() if settings.document_cache_enabled else None
+    entry = cache.get_url_entry(url) if cache else None
+    cached = entry is not None and cache.has_raw(entry["content_hash"])
+    
+    with _new_spool() as spool:
+        if not cached or settings.document_cache_revalidate:
+            headers = {}
+            if cached:
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+            
+            response, content_hash = _download(url, headers, spool)
+            if content_hash is not None:
+                if cache:
+                    cache.put_raw_stream(
+                        url,
+                        spool,
+                        content_hash,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                    )
+                    spool.seek(0)
+                yield spool, content_hash
+                return
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Cache hit (or 304): decompress into the spool
+        raw = cache.open_raw(entry["content_hash"])
+        if raw is None:
+            raise IOError(f"Cached document vanished for {url}")
+        with raw:
+            shutil.copyfileobj(raw, spool, DOWNLOAD_CHUNK_SIZE)
+        spool.seek(0)
+        yield spool, entry["content_hash"]
+
+def _parse_with_cache(url: str, extractor: str, extract: Callable[[BinaryIO], str]) -> str:
+    """
+    Returns extracted text for a URL, reusing cached text for the same
+    document content and extractor version before downloading anything.
+    """
+    settings = get_settings()
+    cache = get_document_cache() if settings.document_cache_enabled else None
+    
+    if cache and not settings.document_cache_revalidate:
+        text = cache.lookup_text(url, extractor)
+        if text is not None:
+            return text
+    
+    with open_document(url) as (stream, content_hash):
+        if cache:
+            text = cache.get_text(content_hash, extractor)
+            if text is not None:
+                return text
+        text = extract(stream)
+    
+    if cache:
+        cache.put_text(content_hash, extractor, text)
+    return text
+
+def extract_html_text(stream: BinaryIO) -> str:
+    """
+    Extracts main content text from an HTML stream using BeautifulSoup.
+    """
+    soup = BeautifulSoup(stream.read(), 'html.parser')
+    
+    # Remove script, style, and navigation/footer elements
+    for element in soup(["script", "style", "nav", "footer", "header", "aside", "form", "noscript", "iframe"]):
+        element.extract()
         
-        # Remove script, style, and navigation/footer elements
-        for element in soup(["script", "style", "nav", "footer", "header", "aside", "form", "noscript", "iframe"]):
-            element.extract()
-            
-        # Get text
-        text = soup.get_text(separator=' ')
-        return clean_text(text)
+    # Get text
+    text = soup.get_text(separator=' ')
+    return clean_text(text)
+
+def _extract_pdf_page_range(path: str, start: int, stop: int) -> List[str]:
+    """
+    Process-pool worker: extracts the text of pages [start, stop) from a PDF file.
+    """
+    reader = PdfReader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def _iter_pdf_pages_parallel(stream: BinaryIO, reader: PdfReader, page_count: int, workers: int) -> Iterator[str]:
+    """
+    Yields raw page texts in order while later page ranges are extracted in a
+    process pool. Workers need a real path, so the document is copied to a
+    named temp file. Ranges are small so that a consumer stopping early
+    (incremental extraction) cancels most of the remaining work; if the pool
+    fails, the rest of the document is extracted sequentially.
+    """
+    stream.seek(0)
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        shutil.copyfileobj(stream, tmp, DOWNLOAD_CHUNK_SIZE)
+        path = tmp.name
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        step = max(1, -(-page_count // (workers * 4)))
+        futures = [
+            pool.submit(_extract_pdf_page_range, path, start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        done = 0
+        for future in futures:  # Preserve page order
+            try:
+                pages = future.result()
+            except Exception as e:
+                print(f"Parallel PDF extraction failed, continuing sequentially: {e}")
+                break
+            for text in pages:
+                yield text
+                done += 1
+        for i in range(done, page_count):
+            yield reader.pages[i].extract_text() or ""
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        os.unlink(path)
+
+def _iter_raw_pdf_pages(stream: BinaryIO, reader: PdfReader) -> Iterator[str]:
+    """Raw page texts in order; long documents are split across a process pool by page range."""
+    settings = get_settings()
+    page_count = len(reader.pages)
+    workers = min(settings.pdf_workers or os.cpu_count() or 1, page_count)
+    if workers > 1 and page_count >= settings.pdf_parallel_min_pages:
+        return _iter_pdf_pages_parallel(stream, reader, page_count, workers)
+    return (page.extract_text() or "" for page in reader.pages)
+
+@contextmanager
+def _pdf_source(stream: BinaryIO) -> Iterator[BinaryIO]:
+    """
+    Yields a PdfReader-compatible source for a spooled stream.
+    Documents already spooled to disk are memory-mapped instead of read in.
+    """
+    stream.seek(0, io.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    
+    if size <= get_settings().pdf_spool_max_mb * 1024 * 1024:
+        yield stream
+        return
+    
+    mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        mapped.close()
+
+def extract_pdf_text(stream: BinaryIO) -> str:
+    """
+    Extracts text from a PDF stream using PyPDF.
+    Documents spooled to disk are memory-mapped; long documents are split
+    across a process pool by page range.
+    """
+    with _pdf_source(stream) as source:
+        reader = PdfReader(source)
+        return clean_text(" ".join(_iter_raw_pdf_pages(stream, reader)))
+
+def iter_pdf_pages(stream: BinaryIO) -> Iterator[str]:
+    """
+    Lazily yields cleaned text one PDF page at a time.
+    Long documents are extracted ahead in a process pool, as in extract_pdf_text.
+    """
+    with _pdf_source(stream) as source:
+        reader = PdfReader(source)
+        pages = _iter_raw_pdf_pages(stream, reader)
+        try:
+            for text in pages:
+                yield clean_text(text)
+        finally:
+            pages.close()  # Cancels page ranges the consumer no longer needs
+
+def iter_text_sections(text: str, size: int = SECTION_CHARS) -> Iterator[str]:
+    """
+    Splits already-extracted text into roughly size-character sections on word boundaries.
+    """
+    start = 0
+    while start < len(text):
+        end = start + size
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            if space > start:
+                end = space
+        section = text[start:end].strip()
+        if section:
+            yield section
+        start = end
+
+def iter_html_sections(stream: BinaryIO) -> Iterator[str]:
+    """
+    Lazily yields cleaned HTML text in sections.
+    """
+    yield from iter_text_sections(extract_html_text(stream))
+
+class DocumentChunks:
+    """
+    Incremental view of a document's text as pages (PDF) or sections (HTML).
+    
+    Reads a document already fetched to a local file (see fetch_document), or
+    its cached text, only as far as the consumer iterates, within an optional
+    page/section and character budget. Touches neither the network nor the
+    document cache, so it can run in a worker process; `text` holds the full
+    extracted text once the whole file was read, for the caller to cache.
+    `parse_seconds` is the time spent producing chunks from the file and
+    `error` the class name of a parse failure, for the caller to record.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        cached_text: Optional[str] = None,
+        is_pdf: bool = False,
+        max_pages: int = 0,
+        max_chars: int = 0
+    ):
+        self.path = path
+        self.cached_text = cached_text
+        self.is_pdf = is_pdf
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.chunks_read = 0
+        self.chars_read = 0
+        self.exhausted_budget = False
+        self.text: Optional[str] = None
+        self.parse_seconds = 0.0
+        self.error: Optional[str] = None
+    
+    def _within_budget(self, chunk: str) -> bool:
+        if self.max_pages and self.chunks_read >= self.max_pages:
+            return False
+        if self.max_chars and self.chars_read + len(chunk) > self.max_chars and self.chunks_read:
+            return False
+        return True
+    
+    def _emit(self, chunks: Iterator[str]) -> Iterator[str]:
+        """Yield chunks until the budget runs out; returns True if all were read."""
+        for chunk in chunks:
+            if not self._within_budget(chunk):
+                self.exhausted_budget = True
+                return False
+            self.chunks_read += 1
+            self.chars_read += len(chunk)
+            yield chunk
+        return True
+    
+    def __iter__(self) -> Iterator[str]:
+        if self.cached_text is not None:
+            yield from self._emit(iter_text_sections(self.cached_text))
+            return
+        
+        try:
+            read = []
+            with open(self.path, "rb") as stream:
+                source = iter_pdf_pages(stream) if self.is_pdf else iter_html_sections(stream)
+                complete = yield from self._emit(self._record(source, read))
+            if complete:
+                self.text = clean_text(" ".join(read))
+        except Exception as e:
+            print(f"Error parsing {self.path}: {e}")
+            self.error = e.__class__.__name__
+    
+    def _record(self, chunks: Iterator[str], read: List[str]) -> Iterator[str]:
+        """Collect the chunks read and the time spent parsing them."""
+        chunks = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            finally:
+                self.parse_seconds += time.perf_counter() - start
+            read.append(chunk)
+            yield chunk
+
+def text_extractor(is_pdf: bool, incremental: bool) -> str:
+    """Text cache key for the extraction path that produced a document's text."""
+    if is_pdf:
+        return PDF_PAGES_EXTRACTOR if incremental else PDF_EXTRACTOR
+    return HTML_EXTRACTOR
+
+@timed("fetch_document")
+def fetch_document(url: str, dest_dir: str, incremental: bool = False) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    Downloads a document (or takes it from the document cache) for parsing elsewhere.
+    Cached extracted text is returned instead of the raw document when available.
+
+    Args:
+        url: Document URL
+        dest_dir: Directory for the local copy of the raw document
+        incremental: Whether the text will be extracted page by page (selects the text cache key)
+
+    Returns:
+        Tuple of (content_hash, path to the raw document or None, cached text or None)
+    """
+    settings = get_settings()
+    cache = get_document_cache() if settings.document_cache_enabled else None
+    is_pdf = url.lower().endswith('.pdf')
+    extractor = text_extractor(is_pdf, incremental)
+
+    if cache and not settings.document_cache_revalidate:
+        entry = cache.get_url_entry(url)
+        text = cache.get_text(entry["content_hash"], extractor) if entry else None
+        if text is not None:
+            return entry["content_hash"], None, text
+
+    with open_document(url) as (stream, content_hash):
+        text = cache.get_text(content_hash, extractor) if cache else None
+        if text is not None:
+            return content_hash, None, text
+        fd, path = tempfile.mkstemp(suffix=".pdf" if is_pdf else ".html", dir=dest_dir)
+        with os.fdopen(fd, "wb") as out:
+            shutil.copyfileobj(stream, out, DOWNLOAD_CHUNK_SIZE)
+    return content_hash, path, None
+
+@timed("parse_html_content")
+def parse_html_content(url: str) -> str:
+    """
+    Fetches HTML and extracts main content text using BeautifulSoup.
+    """
+    try:
+        return _parse_with_cache(url, HTML_EXTRACTOR, extract_html_text)
     except Exception as e:
         print(f"Error parsing HTML {url}: {e}")
+        get_metrics().inc("errors_total", operation="parse_html_content", error=e.__class__.__name__)
         return ""
 
+@timed("parse_pdf_content")
 def parse_pdf_content(url: str) -> str:
     """
     Downloads PDF and extracts text using PyPDF.
     """
     try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
-        with io.BytesIO(response.content) as f:
-            reader = PdfReader(f)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + " "
-            return clean_text(text)
+        return _parse_with_cache(url, PDF_EXTRACTOR, extract_pdf_text)
     except Exception as e:
         print(f"Error parsing PDF {url}: {e}")
+        get_metrics().inc("errors_total", operation="parse_pdf_content", error=e.__class__.__name__)
         return ""
 
 def clean_text(text: str) -> str:
@@ -51,4 +401,4 @@ def clean_text(text: str) -> str:
     lines = (line.strip() for line in text.splitlines())
     chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
     text = ' '.join(chunk for chunk in chunks if chunk)
-    return text
\ No newline at end of file
+    return text
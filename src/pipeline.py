@@ -1,32 +1,416 @@
 """
 Pipeline orchestration for processing reports and generating opportunity cards.
 Coordinates RSS fetching, parsing, signal extraction, and LLM processing.
+
+Pending reports stream through four stages joined by bounded queues, so a
+slow stage makes the ones before it wait instead of piling up documents:
+fetch (threads) -> parse (process pool) -> extract (threads) -> LLM (threads).
+Progress messages and finished reports flow back to the calling thread,
+which is the only one that touches log_callback and the result journal.
 """
-import time
+import os
+import queue
 import logging
-from typing import List, Tuple, Callable, Optional
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Callable, Optional, Any
 
 from .models import Report, OpportunityCard, IngestionStatus
-from .storage import load_reports, save_reports, save_cards, load_cards, load_discarded_signals, save_discarded_signals
-from .ingestion import fetch_rss_feed
-from .parsing import parse_html_content, parse_pdf_content
-from .signal_extraction import extract_candidate_sentences
-from .llm_service import generate_signal_struct
+from .storage import load_reports, save_reports
+from .repositories import get_report_repository, get_fingerprint_index, get_result_journal, get_work_units
+from .ingestion import fetch_all_feeds, commit_feed_states
+from .parsing import (
+    DocumentChunks, fetch_document, extract_html_text, extract_pdf_text, text_extractor,
+)
+from .signal_extraction import extract_candidate_sentences, extract_candidates_incremental, rank_candidates
+from .llm_service import generate_signal_structs, is_current
+from .services.llm_client import LLMClient
 from .services.translation_service import get_translation_service
+from .services.document_cache import get_document_cache
+from .services.metrics import get_metrics, export_run_metrics
 from .config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Queue sentinel telling a stage worker to exit
+_STOP = object()
+
+# Items waiting between two stages, sampled whenever the driver receives an event
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64)
+
+
+def _label(report: Report) -> str:
+    return report.title[:40]
+
+
+def _parse_candidates(
+    path: Optional[str],
+    cached_text: Optional[str],
+    is_pdf: bool,
+    pool_size: int,
+    max_pages: int,
+    max_chars: int,
+    incremental: bool
+) -> Tuple[bool, List[str], int, Optional[str], Dict[str, Dict[str, Any]]]:
+    """
+    Process-pool worker: parses a fetched document and extracts candidate sentences.
+    Metrics recorded here would stay in the worker process, so durations and
+    errors are returned for the parent to record (see _StagedRun._record_worker_stats).
+
+    Returns:
+        Tuple of (has_text, candidates, chunks_read, full text to cache or None,
+        {"durations": operation -> seconds, "errors": operation -> error class})
+    """
+    parse_op = "parse_pdf_content" if is_pdf else "parse_html_content"
+    stats: Dict[str, Dict[str, Any]] = {"durations": {}, "errors": {}}
+    start = time.perf_counter()
+
+    if incremental:
+        # Stop parsing as soon as enough candidates are found
+        chunks = DocumentChunks(path, cached_text, is_pdf, max_pages=max_pages, max_chars=max_chars)
+        candidates = extract_candidates_incremental(chunks, limit=pool_size)
+        # Parsing and extraction interleave; the chunks track the parsing share
+        if cached_text is None:
+            stats["durations"][parse_op] = chunks.parse_seconds
+        if chunks.error:
+            stats["errors"][parse_op] = chunks.error
+        if chunks.chars_read:
+            stats["durations"]["extract_candidate_sentences"] = time.perf_counter() - start - chunks.parse_seconds
+        return chunks.chars_read > 0, candidates, chunks.chunks_read, chunks.text, stats
+
+    text, new_text = cached_text, None
+    if text is None:
+        try:
+            with open(path, "rb") as stream:
+                text = extract_pdf_text(stream) if is_pdf else extract_html_text(stream)
+            new_text = text
+        except Exception as e:
+            print(f"Error parsing {path}: {e}")
+            stats["errors"][parse_op] = e.__class__.__name__
+            text = ""
+        stats["durations"][parse_op] = time.perf_counter() - start
+    candidates = []
+    if text:
+        start = time.perf_counter()
+        # Undecorated: the duration is returned instead of recorded in this process
+        candidates = extract_candidate_sentences.__wrapped__(text)
+        stats["durations"]["extract_candidate_sentences"] = time.perf_counter() - start
+    return bool(text), candidates, 0, new_text, stats
+
+
+class _StagedRun:
+    """
+    One pass of the staged pipeline over a list of pending reports.
+    Stage workers hand (position, report, payload) items downstream and report
+    progress and outcomes through `events`, which run() drains into the journal.
+    """
+
+    def __init__(self, reports: List[Report], fingerprints, journal, work_units, llm_available: Optional[bool] = None):
+        self.settings = get_settings()
+        self.reports = reports
+        self.fingerprints = fingerprints
+        self.journal = journal
+        self.work_units = work_units
+        self.llm_available = LLMClient.get_instance().is_available if llm_available is None else llm_available
+        self.cache = get_document_cache() if self.settings.document_cache_enabled else None
+        self.metrics = get_metrics()
+        self.events: queue.Queue = queue.Queue()
+        self._select_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stages: List[Tuple[str, queue.Queue, int]] = []
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tmp_dir: Optional[str] = None
+
+        self.max_signals = self.settings.max_signals_per_report
+        # Oversample when ranking so the cutoff has something to choose from
+        self.pool_size = (
+            self.max_signals * self.settings.candidate_pool_factor
+            if self.settings.candidate_ranking else self.max_signals
+        )
+
+    # --- Plumbing ---
+
+    def _log(self, message: str) -> None:
+        self.events.put(("log", message))
+
+    def _fail(self, position: int, report: Report, message: str) -> None:
+        self.events.put(("failed", position, report, message))
+
+    def _new_queue(self) -> queue.Queue:
+        return queue.Queue(maxsize=max(1, self.settings.pipeline_queue_size))
+
+    def _start_stage(
+        self,
+        name: str,
+        workers: int,
+        inbox: queue.Queue,
+        handle: Callable[[int, Report, Any], None]
+    ) -> None:
+        """Start `workers` threads that feed items from inbox to handle until stopped."""
+        workers = max(1, workers)
+
+        def work():
+            while True:
+                item = inbox.get()
+                if item is _STOP:
+                    return
+                position, report, payload = item
+                try:
+                    with self.metrics.timer("pipeline_stage", stage=name):
+                        handle(position, report, payload)
+                except Exception as e:
+                    logger.error(f"Failed to process {report.report_id} ({name}): {e}", exc_info=True)
+                    self._fail(position, report, f"Failed to process {report.report_id}: {e}")
+
+        for i in range(workers):
+            thread = threading.Thread(target=work, name=f"pipeline-{name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._stages.append((name, inbox, workers))
+
+    def _stop_stages(self, finished: bool) -> None:
+        """Send every stage worker a stop sentinel (without blocking if the run was aborted)."""
+        for _, inbox, workers in self._stages:
+            for _ in range(workers):
+                if finished:
+                    inbox.put(_STOP)
+                    continue
+                try:
+                    inbox.put_nowait(_STOP)
+                except queue.Full:
+                    pass  # Workers stuck upstream are daemon threads and die with the process
+
+    def _sample_queue_depths(self) -> None:
+        """Record how many items wait in front of each stage."""
+        for name, inbox, _ in self._stages:
+            self.metrics.observe("pipeline_queue_depth", inbox.qsize(), buckets=QUEUE_DEPTH_BUCKETS, stage=name)
+
+    def _start_pool(self) -> None:
+        """
+        Start the parser processes up front: forking before the stage threads
+        exist keeps locks held by those threads out of the children.
+        """
+        workers = self.settings.pipeline_parse_workers
+        if workers <= 0:
+            return
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        for future in [self._pool.submit(os.getpid) for _ in range(workers)]:
+            future.result()
+
+    # --- Stages ---
+
+    def _fetch(self, position: int, report: Report, _: Any) -> None:
+        self._log(f"Processing {report.title}...")
+        # Without a configured LLM reports are deferred, so the run must not use up their attempts
+        if self.llm_available:
+            self.work_units.start_attempt(report.report_id)
+        try:
+            fetched = fetch_document(report.url, self._tmp_dir, self.settings.incremental_extraction)
+        except Exception as e:
+            print(f"Error fetching {report.url}: {e}")
+            fetched = (None, None, None)
+        self.parse_queue.put((position, report, fetched))
+
+    def _parse(self, position: int, report: Report, fetched: Tuple) -> None:
+        content_hash, path, cached_text = fetched
+        if path is None and cached_text is None:
+            self._no_text(position, report)
+            return
+
+        is_pdf = report.url.lower().endswith('.pdf')
+        args = (path, cached_text, is_pdf, self.pool_size, self.settings.max_pages_per_report,
+                self.settings.max_chars_per_report, self.settings.incremental_extraction)
+        self._log(f"  -> {_label(report)}: Parsing content...")
+        try:
+            if self._pool:
+                has_text, candidates, chunks_read, text, stats = self._pool.submit(_parse_candidates, *args).result()
+            else:
+                has_text, candidates, chunks_read, text, stats = _parse_candidates(*args)
+        finally:
+            if path:
+                os.unlink(path)
+        self._record_worker_stats(stats)
+
+        if self.cache and text is not None:
+            self.cache.put_text(content_hash, text_extractor(is_pdf, self.settings.incremental_extraction), text)
+        if not has_text:
+            self._no_text(position, report)
+            return
+        if self.settings.incremental_extraction:
+            self._log(f"  -> {_label(report)}: Read {chunks_read} page(s)/section(s).")
+        self.extract_queue.put((position, report, (candidates, content_hash)))
+
+    def _record_worker_stats(self, stats: Dict[str, Dict[str, Any]]) -> None:
+        """Record the parse/extract durations and errors measured by _parse_candidates."""
+        for operation, seconds in stats["durations"].items():
+            self.metrics.observe("operation_duration_seconds", seconds, operation=operation)
+        for operation, error in stats["errors"].items():
+            self.metrics.inc("errors_total", operation=operation, error=error)
+
+    def _no_text(self, position: int, report: Report) -> None:
+        logger.warning(f"Failed to extract text from {report.url}")
+        self._fail(position, report, f"Failed to extract text from {report.url}")
+
+    def _extract(self, position: int, report: Report, payload: Tuple[List[str], str]) -> None:
+        candidates, content_hash = payload
+        self._log(f"  -> {_label(report)}: Extracted {len(candidates)} candidates.")
+        if self.settings.candidate_ranking:
+            candidates = rank_candidates(candidates)
+
+        # Units finished by an earlier attempt with the current prompt and model
+        # are reused; their fingerprints belong to this report, so they are not duplicates
+        done = {
+            c: result for c, result in self.work_units.completed(report.report_id, candidates).items()
+            if is_current(result)
+        }
+
+        # Skip boilerplate that was already structured (here or in earlier reports)
+        if self.fingerprints:
+            fresh = [c for c in candidates if c not in done]
+            with self._select_lock:
+                novel, duplicates = self.fingerprints.select_novel(fresh, limit=max(0, self.max_signals - len(done)))
+            if duplicates:
+                self._log(f"  -> {_label(report)}: Skipped {len(duplicates)} near-duplicate candidates.")
+            keep = set(novel) | set(done)
+            candidates = [c for c in candidates if c in keep]
+
+        self.llm_queue.put((position, report, (candidates[:self.max_signals], done, content_hash)))
+
+    def _structure(self, position: int, report: Report, payload: Tuple[List[str], dict, str]) -> None:
+        candidates, done, content_hash = payload
+        missing = [c for c in candidates if c not in done]
+        if done:
+            self._log(f"  -> {_label(report)}: Reused {len(candidates) - len(missing)} completed candidate(s).")
+
+        if missing and not self.llm_available:
+            # Nothing was sent to the model: leave the report as it was for a later run
+            self.events.put(("deferred", position, report))
+            return
+
+        results = dict(done)
+        if missing:
+            self.work_units.mark_pending(report.report_id, missing)
+            results.update(zip(missing, generate_signal_structs(missing, report.title, report.report_id)))
+        # Stamp the source document so reprocessing can tell when it changed
+        for result in results.values():
+            if result is not None:
+                result.content_hash = content_hash
+        if missing:
+            self.work_units.record(report.report_id, missing, [results[c] for c in missing])
+        self.events.put(("done", position, report, candidates, [results[c] for c in candidates]))
+
+    # --- Driver ---
+
+    def run(self, log_callback: Callable[[str], None]) -> Tuple[int, int]:
+        """
+        Stream all reports through the stages, journaling each report's results
+        as soon as it finishes and compacting the journal as it grows.
+
+        Returns:
+            Tuple of (cards created, reports processed)
+        """
+        settings = self.settings
+        self.parse_queue = self._new_queue()
+        self.extract_queue = self._new_queue()
+        self.llm_queue = self._new_queue()
+        fetch_queue = self._new_queue()
+
+        cards_count = processed_count = 0
+        finished = False
+        self._start_pool()
+        try:
+            with tempfile.TemporaryDirectory(prefix="pipeline-") as tmp_dir:
+                self._tmp_dir = tmp_dir
+                self._start_stage("fetch", settings.pipeline_fetch_workers, fetch_queue, self._fetch)
+                self._start_stage("parse", settings.pipeline_parse_workers, self.parse_queue, self._parse)
+                self._start_stage("extract", settings.pipeline_extract_workers, self.extract_queue, self._extract)
+                self._start_stage("llm", settings.pipeline_llm_workers, self.llm_queue, self._structure)
+
+                feeder = threading.Thread(
+                    target=lambda: [fetch_queue.put((i, r, None)) for i, r in enumerate(self.reports)],
+                    name="pipeline-feeder",
+                    daemon=True,
+                )
+                feeder.start()
+
+                remaining = len(self.reports)
+                while remaining:
+                    kind, *payload = self.events.get()
+                    self._sample_queue_depths()
+                    if kind == "log":
+                        log_callback(payload[0])
+                        continue
+
+                    remaining -= 1
+                    if kind == "deferred":
+                        _, report = payload
+                        log_callback(f"  -> LLM unavailable; {_label(report)} left for the next run.")
+                        self.metrics.inc("pipeline_reports_total", status="deferred")
+                    elif kind == "failed":
+                        _, report, message = payload
+                        log_callback(message)
+                        report.ingestion_status = IngestionStatus.FAILED
+                        self.metrics.inc("pipeline_reports_total", status="failed")
+                        self.journal.record_status(report.report_id, report.ingestion_status)
+                    else:
+                        _, report, candidates, results = payload
+                        kept = []
+                        failed = sum(1 for result in results if result is None)
+                        if failed:
+                            self.metrics.inc("pipeline_results_total", failed, kind="failed")
+                        for candidate, result in zip(candidates, results):
+                            if isinstance(result, OpportunityCard):
+                                kept.append(result)
+                                cards_count += 1
+                                self.metrics.inc("pipeline_results_total", kind="card")
+                                log_callback(f"  -> Generated Opportunity: {result.pain_holder[:30]}...")
+                                if self.fingerprints:
+                                    self.fingerprints.add(candidate, result.card_id, report.report_id, "card")
+                            elif hasattr(result, 'reason'):  # DiscardedSignal
+                                kept.append(result)
+                                self.metrics.inc("pipeline_results_total", kind="discard")
+                                log_callback(f"  -> Discarded (Score {result.importance_score})")
+                                if self.fingerprints:
+                                    self.fingerprints.add(candidate, result.signal_id, report.report_id, "discard")
+                        if failed:
+                            # Finished units are kept; a later run retries only these
+                            log_callback(f"  -> {failed} candidate(s) failed; {_label(report)} will be retried.")
+                            report.ingestion_status = IngestionStatus.FAILED
+                        else:
+                            report.ingestion_status = IngestionStatus.PROCESSED
+                            processed_count += 1
+                            logger.info(f"Successfully processed report: {report.report_id}")
+                        self.metrics.inc("pipeline_reports_total", status=report.ingestion_status.value)
+                        self.journal.record_results(report.report_id, kept, report.ingestion_status)
+
+                    if self.journal.pending >= settings.journal_compact_every:
+                        self.journal.compact()
+                        if self.fingerprints:
+                            self.fingerprints.save()
+                finished = True
+        finally:
+            self._stop_stages(finished)
+            if finished:
+                for thread in self._threads:
+                    thread.join()
+            if self._pool:
+                self._pool.shutdown(cancel_futures=True)
+
+        return cards_count, processed_count
+
 
 def run_pipeline(log_callback: Optional[Callable[[str], None]] = None) -> Tuple[int, int, int]:
     """
     Runs the full pipeline:
     1. Fetch RSS Stats
-    2. Process Pending Reports
+    2. Process Pending Reports (staged: fetch, parse, extract, LLM)
     3. Save Cards
     
     Args:
-        log_callback: Optional callback function for logging messages
+        log_callback: Optional callback function for logging messages; always
+            called on the calling thread
     
     Returns:
         Tuple of (reports_found, reports_processed, cards_created)
@@ -36,91 +420,66 @@ def run_pipeline(log_callback: Optional[Callable[[str], None]] = None) -> Tuple[
     
     settings = get_settings()
     translation_service = get_translation_service()
+    fingerprints = get_fingerprint_index() if settings.near_duplicate_detection else None
+    journal = get_result_journal()
+    work_units = get_work_units()
+    
+    # Results journaled by an interrupted run go into the stores before anything else
+    recovered = journal.recover()
+    if recovered:
+        log_callback(f"Recovered {recovered} journaled result(s) from an interrupted run.")
     
     # 1. Fetch new reports
-    log_callback("Fetching RSS Feed...")
-    new_reports = fetch_rss_feed()
-    log_callback(f"Found {len(new_reports)} items in feed.")
+    log_callback(f"Fetching {len(settings.feed_sources)} RSS Feed(s)...")
+    new_reports, feed_states = fetch_all_feeds()
+    log_callback(f"Found {len(new_reports)} items in feeds.")
     
+    # Merge new reports (dedup against the persisted ID/URL index)
+    report_index = get_report_repository().index
+    fresh_reports = [
+        r for r in new_reports
+        if not report_index.has_id(r.report_id) and not report_index.has_url(r.url)
+    ]
     all_reports = load_reports()
+    all_reports.extend(fresh_reports)
+    added_count = len(fresh_reports)
+    for r in fresh_reports:
+        logger.info(f"Added new report: {r.title[:50]}...")
     
-    # Merge new reports
-    existing_ids = {r.report_id for r in all_reports}
-    added_count = 0
-    for r in new_reports:
-        if r.report_id not in existing_ids:
-            all_reports.append(r)
-            added_count += 1
-            logger.info(f"Added new report: {r.title[:50]}...")
-    
-    save_reports(all_reports)  # Save immediately so we have the list
+    if fresh_reports:
+        save_reports(all_reports)  # Save immediately so we have the list
+    # Feed validators only advance once their entries are safely stored
+    commit_feed_states(feed_states)
     
     # 2. Process Pending Reports
-    pending_reports = [r for r in all_reports if r.ingestion_status == IngestionStatus.PENDING]
-    processed_count = 0
-    new_cards = []
-    discarded_signals = []
+    # Failed reports are retried while attempts remain; finished candidates are not re-sent
+    pending_reports = [
+        r for r in all_reports
+        if r.ingestion_status == IngestionStatus.PENDING
+        or (r.ingestion_status == IngestionStatus.FAILED
+            and work_units.attempts(r.report_id) < settings.max_report_attempts)
+    ]
+    cards_count = processed_count = 0
     
-    for report in pending_reports:
-        try:
-            log_callback(f"Processing {report.title}...")
-            
-            # Translate Metadata
-            translation_service.translate_report(report)
-            
-            # Parse content
-            log_callback("  -> Parsing content...")
-            if report.url.lower().endswith('.pdf'):
-                text = parse_pdf_content(report.url)
-            else:
-                text = parse_html_content(report.url)
-            
-            if not text:
-                logger.warning(f"Failed to extract text from {report.url}")
-                log_callback(f"Failed to extract text from {report.url}")
-                report.ingestion_status = IngestionStatus.FAILED
-                continue
-            
-            # Extract candidate sentences
-            candidates = extract_candidate_sentences(text)
-            log_callback(f"  -> Extracted {len(candidates)} candidates.")
-            
-            # Structuring with LLM (use configured max signals)
-            MAX_SIGNALS = settings.max_signals_per_report
-            for candidate in candidates[:MAX_SIGNALS]:
-                result = generate_signal_struct(candidate, report.title, report.report_id)
-                
-                if isinstance(result, OpportunityCard):
-                    new_cards.append(result)
-                    log_callback(f"  -> Generated Opportunity: {result.pain_holder[:30]}...")
-                elif hasattr(result, 'reason'):  # DiscardedSignal
-                    discarded_signals.append(result)
-                    log_callback(f"  -> Discarded (Score {result.importance_score})")
-            
-            report.ingestion_status = IngestionStatus.PROCESSED
-            processed_count += 1
-            logger.info(f"Successfully processed report: {report.report_id}")
-            
-            time.sleep(1)  # Polite rate limiting
-            
-        except Exception as e:
-            logger.error(f"Failed to process {report.report_id}: {e}", exc_info=True)
-            log_callback(f"Failed to process {report.report_id}: {e}")
-            report.ingestion_status = IngestionStatus.FAILED
+    if pending_reports:
+        # Translate Metadata for all pending reports in batched requests
+        log_callback(f"Translating {len(pending_reports)} report(s)...")
+        translation_service.translate_reports(pending_reports)
+        save_reports(all_reports)
+        
+        # Cards, discards and statuses are journaled per report as they finish
+        cards_count, processed_count = _StagedRun(pending_reports, fingerprints, journal, work_units).run(log_callback)
     
     # 3. Save results
+    # Card and signal IDs are content-addressed, so re-runs replace rather than duplicate
+    journal.compact()
     save_reports(all_reports)  # Update statuses
     
-    existing_cards = load_cards()
-    existing_cards.extend(new_cards)
-    save_cards(existing_cards)
-    
-    # Save Discarded Signals
-    if discarded_signals:
-        existing_discarded = load_discarded_signals()
-        existing_discarded.extend(discarded_signals)
-        save_discarded_signals(existing_discarded)
+    if fingerprints:
+        fingerprints.save()
+    get_document_cache().flush()
+    export_run_metrics()
     
-    logger.info(f"Pipeline completed: {added_count} new reports, {processed_count} processed, {len(new_cards)} cards created")
+    logger.info(f"Pipeline completed: {added_count} new reports, {processed_count} processed, {cards_count} cards created")
     
-    return added_count, processed_count, len(new_cards)
+    return added_count, processed_count, cards_count
@@ -4,6 +4,14 @@ Implements repository pattern for clean data access.
 """
 from .report_repository import ReportRepository, get_report_repository
 from .card_repository import CardRepository, get_card_repository
+from .feed_state_repository import FeedStateRepository, get_feed_state_repository
+from .fingerprint_index import FingerprintIndex, get_fingerprint_index
+from .result_journal import ResultJournal, get_result_journal
+from .work_units import WorkUnitStore, get_work_units
 
-__all__ = ["ReportRepository", "CardRepository", "get_report_repository", "get_card_repository"]
-
+__all__ = [
+    "ReportRepository", "CardRepository", "FeedStateRepository", "FingerprintIndex",
+    "ResultJournal", "WorkUnitStore",
+    "get_report_repository", "get_card_repository", "get_feed_state_repository",
+    "get_fingerprint_index", "get_result_journal", "get_work_units",
+]
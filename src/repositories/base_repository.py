@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import List, TypeVar, Generic, Type
 from pydantic import BaseModel
 
+from ..services.metrics import get_metrics
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T', bound=BaseModel)
@@ -66,14 +68,19 @@ class BaseRepository(Generic[T]):
     def _save_all(self, items: List[T]) -> None:
         """
         Save all items to the JSON file.
+        Writes a temp file and renames it over the original, so a crash
+        mid-write never leaves a truncated store behind.
         
         Args:
             items: List of model instances to save
         """
         try:
-            data = [item.model_dump(mode='json') for item in items]
-            content = json.dumps(data, indent=2, ensure_ascii=False)
-            self.file_path.write_text(content, encoding="utf-8")
+            with get_metrics().timer("repository_save", store=self.file_path.stem):
+                data = [item.model_dump(mode='json') for item in items]
+                content = json.dumps(data, indent=2, ensure_ascii=False)
+                tmp_path = self.file_path.with_suffix(".tmp")
+                tmp_path.write_text(content, encoding="utf-8")
+                tmp_path.replace(self.file_path)
             logger.debug(f"Saved {len(items)} items to {self.file_path.name}")
         except Exception as e:
             logger.error(f"Failed to save to {self.file_path}: {e}", exc_info=True)
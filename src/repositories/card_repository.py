@@ -45,12 +45,19 @@ class CardRepository:
         self._cards_repo._save_all(cards)
     
     def add_cards(self, new_cards: List[OpportunityCard]) -> None:
-        """Add new cards to existing storage."""
-        existing_cards = self.find_all_cards()
+        """Add new cards to existing storage, replacing cards with the same ID."""
+        new_ids = {c.card_id for c in new_cards}
+        existing_cards = [c for c in self.find_all_cards() if c.card_id not in new_ids]
         existing_cards.extend(new_cards)
         self.save_cards(existing_cards)
         logger.info(f"Added {len(new_cards)} new cards to storage")
     
+    def update_cards(self, cards: List[OpportunityCard]) -> None:
+        """Replace stored cards with updated copies (matched by ID), keeping order."""
+        updates = {c.card_id: c for c in cards}
+        self.save_cards([updates.get(c.card_id, c) for c in self.find_all_cards()])
+        logger.info(f"Updated {len(updates)} cards in storage")
+    
     # DiscardedSignal methods
     
     def find_all_discarded(self) -> List[DiscardedSignal]:
@@ -62,8 +69,9 @@ class CardRepository:
         self._discarded_repo._save_all(signals)
     
     def add_discarded(self, new_signals: List[DiscardedSignal]) -> None:
-        """Add new discarded signals to existing storage."""
-        existing_signals = self.find_all_discarded()
+        """Add new discarded signals to existing storage, replacing same-ID signals."""
+        new_ids = {s.signal_id for s in new_signals}
+        existing_signals = [s for s in self.find_all_discarded() if s.signal_id not in new_ids]
         existing_signals.extend(new_signals)
         self.save_discarded(existing_signals)
         logger.info(f"Added {len(new_signals)} new discarded signals to storage")
@@ -0,0 +1,65 @@
+"""
+Feed State Repository for data access.
+Persists HTTP validators (ETag, Last-Modified, body hash) per feed URL.
+"""
+import logging
+import threading
+from typing import List, Optional
+
+from ..models import FeedState
+from ..config import get_settings
+from .base_repository import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+
+class FeedStateRepository(BaseRepository[FeedState]):
+    """Repository for FeedState data access."""
+
+    def __init__(self):
+        """Initialize the repository with file path from config."""
+        settings = get_settings()
+        super().__init__(settings.feed_state_file, FeedState)
+        self._lock = threading.Lock()  # Feeds are fetched concurrently
+
+    def find_all(self) -> List[FeedState]:
+        """Load all feed states from storage."""
+        with self._lock:
+            return self._load_all()
+
+    def find_by_url(self, url: str) -> Optional[FeedState]:
+        """Find the stored state for a feed URL."""
+        for state in self.find_all():
+            if state.url == url:
+                return state
+        return None
+
+    def save(self, state: FeedState) -> None:
+        """Save a single feed state (update if exists, insert if new)."""
+        with self._lock:
+            states = [s for s in self._load_all() if s.url != state.url]
+            states.append(state)
+            self._save_all(states)
+        logger.debug(f"Saved feed state for {state.url}")
+
+    def save_many(self, states: List[FeedState]) -> None:
+        """Save several feed states in one write."""
+        if not states:
+            return
+        urls = {state.url for state in states}
+        with self._lock:
+            kept = [s for s in self._load_all() if s.url not in urls]
+            self._save_all(kept + list(states))
+        logger.debug(f"Saved {len(states)} feed states")
+
+
+# Global instance
+_feed_state_repository: Optional[FeedStateRepository] = None
+
+
+def get_feed_state_repository() -> FeedStateRepository:
+    """Get the global feed state repository instance."""
+    global _feed_state_repository
+    if _feed_state_repository is None:
+        _feed_state_repository = FeedStateRepository()
+    return _feed_state_repository
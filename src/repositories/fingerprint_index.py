@@ -0,0 +1,211 @@
+"""
+Persisted near-duplicate index for candidate sentences.
+Stores 64-bit SimHash fingerprints of sentences that were already structured
+by the LLM, so boilerplate repeated across reports can be skipped before
+paying for another call.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+# Fingerprints within distance < BANDS share at least one band exactly (pigeonhole)
+BANDS = 8
+BAND_BITS = FINGERPRINT_BITS // BANDS
+# Character shingles tolerate changed figures and inflections better than word n-grams
+SHINGLE_SIZE = 4
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def simhash(text: str) -> int:
+    """
+    Compute a 64-bit SimHash of a sentence from character 4-shingles.
+    Near-identical sentences produce fingerprints a few bits apart.
+    """
+    normalized = " ".join(_WORD_RE.findall(text.lower()))
+    if len(normalized) >= SHINGLE_SIZE:
+        features = [normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)]
+    else:
+        features = [normalized]
+
+    weights = [0] * FINGERPRINT_BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+def _bands(fingerprint: int) -> List[Tuple[int, int]]:
+    mask = (1 << BAND_BITS) - 1
+    return [(band, fingerprint >> (band * BAND_BITS) & mask) for band in range(BANDS)]
+
+
+class FingerprintIndex:
+    """
+    SimHash index of structured candidate sentences, persisted as JSON.
+    Lookups only compare fingerprints that share a band, not the whole index.
+    """
+
+    def __init__(self, file_path: Path, max_distance: int = 6):
+        """
+        Initialize the index.
+
+        Args:
+            file_path: Path to the JSON index file
+            max_distance: Maximum Hamming distance treated as a near-duplicate
+                (must be below the band count to be found reliably)
+        """
+        self.file_path = file_path
+        self.max_distance = min(max_distance, BANDS - 1)
+        self._entries: List[Dict] = []
+        self._bands: Dict[Tuple[int, int], List[int]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.file_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Failed to read fingerprint index {self.file_path}: {e}")
+            return
+        for entry in data:
+            self._insert({**entry, "fingerprint": int(entry["fingerprint"], 16)})
+
+    def _insert(self, entry: Dict) -> None:
+        position = len(self._entries)
+        self._entries.append(entry)
+        for band in _bands(entry["fingerprint"]):
+            self._bands.setdefault(band, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find_near_duplicate(self, text: str) -> Optional[Dict]:
+        """
+        Return the closest indexed entry within max_distance of the text, if any.
+
+        Returns:
+            Dict with signal_id, report_id, kind and distance, or None
+        """
+        return self._nearest(simhash(text))
+
+    def _nearest(self, fingerprint: int) -> Optional[Dict]:
+        best = None
+        with self._lock:
+            candidates = {p for band in _bands(fingerprint) for p in self._bands.get(band, [])}
+            for position in candidates:
+                entry = self._entries[position]
+                distance = hamming_distance(fingerprint, entry["fingerprint"])
+                if distance <= self.max_distance and (best is None or distance < best["distance"]):
+                    best = {**entry, "distance": distance}
+        return best
+
+    def select_novel(
+        self,
+        candidates: List[str],
+        limit: Optional[int] = None
+    ) -> Tuple[List[str], List[Tuple[str, Dict]]]:
+        """
+        Pick candidates that are neither near-duplicates of indexed sentences
+        nor of each other, preserving order.
+
+        Args:
+            candidates: Candidate sentences, best first
+            limit: Stop after selecting this many (None for all)
+
+        Returns:
+            Tuple of (selected candidates, [(skipped candidate, matching entry)])
+        """
+        selected, skipped, selected_prints = [], [], []
+        for candidate in candidates:
+            if limit is not None and len(selected) >= limit:
+                break
+            fingerprint = simhash(candidate)
+            match = self._nearest(fingerprint)
+            if match is None:
+                for chosen, chosen_print in zip(selected, selected_prints):
+                    distance = hamming_distance(fingerprint, chosen_print)
+                    if distance <= self.max_distance:
+                        match = {"signal_id": None, "text": chosen, "distance": distance}
+                        break
+            if match is not None:
+                skipped.append((candidate, match))
+                continue
+            selected.append(candidate)
+            selected_prints.append(fingerprint)
+        return selected, skipped
+
+    def add(self, text: str, signal_id: str, report_id: str, kind: str) -> None:
+        """
+        Record a structured sentence.
+
+        Args:
+            text: The candidate sentence
+            signal_id: ID of the resulting card or discarded signal
+            report_id: ID of the source report
+            kind: "card" or "discard"
+        """
+        with self._lock:
+            self._insert({
+                "fingerprint": simhash(text),
+                "signal_id": signal_id,
+                "report_id": report_id,
+                "kind": kind,
+            })
+            self._dirty = True
+
+    def clear(self) -> None:
+        """Remove all entries (e.g. before a full reprocess)."""
+        with self._lock:
+            self._entries = []
+            self._bands = {}
+            self._dirty = True
+        self.save()
+
+    def save(self) -> None:
+        """Persist the index atomically if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = [{**e, "fingerprint": f"{e['fingerprint']:016x}"} for e in self._entries]
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.file_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            tmp_path.replace(self.file_path)
+            self._dirty = False
+        logger.debug(f"Saved fingerprint index with {len(self._entries)} entries")
+
+
+# Global instance
+_fingerprint_index: Optional[FingerprintIndex] = None
+
+
+def get_fingerprint_index() -> FingerprintIndex:
+    """Get the global fingerprint index instance."""
+    global _fingerprint_index
+    if _fingerprint_index is None:
+        settings = get_settings()
+        _fingerprint_index = FingerprintIndex(
+            settings.fingerprint_index_file,
+            settings.near_duplicate_max_distance,
+        )
+    return _fingerprint_index
@@ -0,0 +1,89 @@
+"""
+Persisted report ID/URL index.
+Lets ingestion and the pipeline check for duplicates in O(1) without
+loading and scanning the whole reports.json file.
+"""
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from ..ids import normalize_url
+
+logger = logging.getLogger(__name__)
+
+
+class ReportIndex:
+    """
+    Maps normalized report URLs to report IDs, stored as a JSON object.
+    Reloads automatically when another process rewrites the file.
+    """
+
+    def __init__(self, file_path: Path):
+        """
+        Initialize the index.
+
+        Args:
+            file_path: Path to the JSON index file
+        """
+        self.file_path = file_path
+        self._urls: Dict[str, str] = {}
+        self._ids: set = set()
+        self._mtime: Optional[float] = None
+        self._lock = threading.RLock()
+
+    @property
+    def exists(self) -> bool:
+        """Whether the index has been persisted yet."""
+        return self.file_path.exists()
+
+    def _refresh(self) -> None:
+        """Reload from disk if the file changed since the last read."""
+        try:
+            mtime = self.file_path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            data = json.loads(self.file_path.read_text(encoding="utf-8"))
+            self._urls = dict(data.get("urls", {}))
+            self._ids = set(self._urls.values())
+            self._mtime = mtime
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Failed to read report index {self.file_path}: {e}")
+
+    def has_url(self, url: str) -> bool:
+        """Check whether a report with this (normalized) URL is known."""
+        with self._lock:
+            self._refresh()
+            return normalize_url(url) in self._urls
+
+    def has_id(self, report_id: str) -> bool:
+        """Check whether a report ID is known."""
+        with self._lock:
+            self._refresh()
+            return report_id in self._ids
+
+    def get_id(self, url: str) -> Optional[str]:
+        """Return the report ID stored for a URL, if any."""
+        with self._lock:
+            self._refresh()
+            return self._urls.get(normalize_url(url))
+
+    def rebuild(self, reports: Iterable) -> None:
+        """Replace the index contents with the given reports and persist it."""
+        with self._lock:
+            self._urls = {normalize_url(r.url): r.report_id for r in reports}
+            self._ids = set(self._urls.values())
+            self._save()
+
+    def _save(self) -> None:
+        """Write the index atomically."""
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.file_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"urls": self._urls}, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(self.file_path)
+        self._mtime = self.file_path.stat().st_mtime
+        logger.debug(f"Saved report index with {len(self._urls)} entries")
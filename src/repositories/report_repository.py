@@ -3,11 +3,12 @@ Report Repository for data access.
 Handles all Report model persistence operations.
 """
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from ..models import Report, IngestionStatus
 from ..config import get_settings
 from .base_repository import BaseRepository
+from .report_index import ReportIndex
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +20,9 @@ class ReportRepository(BaseRepository[Report]):
         """Initialize the repository with file path from config."""
         settings = get_settings()
         super().__init__(settings.reports_file, Report)
+        self.index = ReportIndex(settings.report_index_file)
+        if not self.index.exists:
+            self.index.rebuild(self.find_all())
     
     def find_all(self) -> List[Report]:
         """Load all reports from storage."""
@@ -54,8 +58,9 @@ class ReportRepository(BaseRepository[Report]):
         logger.debug(f"Inserted report: {report.report_id}")
     
     def save_all(self, reports: List[Report]) -> None:
-        """Save all reports to storage."""
+        """Save all reports to storage and refresh the dedup index."""
         self._save_all(reports)
+        self.index.rebuild(reports)
     
     def update_status(self, report_id: str, status: IngestionStatus) -> bool:
         """Update the ingestion status of a report."""
@@ -70,6 +75,19 @@ class ReportRepository(BaseRepository[Report]):
         
         logger.warning(f"Report {report_id} not found for status update")
         return False
+    
+    def update_statuses(self, statuses: Dict[str, IngestionStatus]) -> int:
+        """Update the ingestion status of many reports in one write; returns how many were found."""
+        reports = self.find_all()
+        updated = 0
+        for report in reports:
+            if report.report_id in statuses:
+                report.ingestion_status = statuses[report.report_id]
+                updated += 1
+        if updated:
+            self.save_all(reports)
+        logger.info(f"Updated status of {updated} report(s)")
+        return updated
 
 
 # Global instance
@@ -0,0 +1,164 @@
+"""
+Write-ahead journal for pipeline results.
+Every card, discarded signal and report status change is appended to a JSONL
+file the moment it is produced, then periodically compacted into the main
+JSON stores. A crash mid-run loses nothing already paid for: the leftover
+journal is replayed into the stores on the next start.
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Iterator, Any
+
+from ..models import OpportunityCard, DiscardedSignal, IngestionStatus
+from ..config import get_settings
+from ..services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ResultJournal:
+    """
+    Append-only JSONL journal of pipeline results.
+    Records are {"type": "card" | "discard" | "status", ...}; replaying them
+    is idempotent because card and signal IDs are content-addressed.
+    """
+
+    def __init__(self, file_path: Path, fsync: bool = True, card_repo=None, report_repo=None):
+        """
+        Initialize the journal.
+
+        Args:
+            file_path: Path to the JSONL journal
+            fsync: Force every append to disk before returning
+            card_repo: CardRepository to compact into (default: the global one)
+            report_repo: ReportRepository to compact into (default: the global one)
+        """
+        self.file_path = file_path
+        self.fsync = fsync
+        self._card_repo = card_repo
+        self._report_repo = report_repo
+        self._lock = threading.Lock()
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.pending = sum(1 for _ in self.replay())
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        with self._lock:
+            with open(self.file_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self.pending += len(records)
+
+    def record_results(self, report_id: str, results: List[Any], status: IngestionStatus) -> None:
+        """
+        Journal the cards and discards of one report together with its new status.
+
+        Args:
+            report_id: ID of the processed report
+            results: OpportunityCard / DiscardedSignal instances
+            status: The report's ingestion status after processing
+        """
+        records = []
+        for result in results:
+            kind = "card" if isinstance(result, OpportunityCard) else "discard"
+            records.append({"type": kind, "item": result.model_dump(mode="json")})
+        records.append({"type": "status", "report_id": report_id, "status": status.value})
+        self._append(records)
+
+    def record_status(self, report_id: str, status: IngestionStatus) -> None:
+        """Journal a report status change on its own (e.g. a failed report)."""
+        self._append([{"type": "status", "report_id": report_id, "status": status.value}])
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield journaled records in order, skipping a torn final line from a crash.
+        """
+        if not self.file_path.exists():
+            return
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable journal line {number} in {self.file_path.name}")
+
+    def compact(self) -> int:
+        """
+        Apply all journaled records to the main stores, then truncate the journal.
+        A crash during compaction just replays the same records again next time.
+
+        Returns:
+            Number of records applied
+        """
+        from .card_repository import get_card_repository
+        from .report_repository import get_report_repository
+
+        with self._lock, get_metrics().timer("journal_compact"):
+            cards: Dict[str, OpportunityCard] = {}
+            discards: Dict[str, DiscardedSignal] = {}
+            statuses: Dict[str, IngestionStatus] = {}
+            applied = 0
+            for record in self.replay():
+                applied += 1
+                if record["type"] == "card":
+                    card = OpportunityCard(**record["item"])
+                    cards[card.card_id] = card
+                elif record["type"] == "discard":
+                    signal = DiscardedSignal(**record["item"])
+                    discards[signal.signal_id] = signal
+                elif record["type"] == "status":
+                    statuses[record["report_id"]] = IngestionStatus(record["status"])
+            if not applied:
+                return 0
+
+            card_repo = self._card_repo or get_card_repository()
+            if cards:
+                card_repo.add_cards(list(cards.values()))
+            if discards:
+                card_repo.add_discarded(list(discards.values()))
+            if statuses:
+                (self._report_repo or get_report_repository()).update_statuses(statuses)
+
+            self.file_path.write_text("", encoding="utf-8")
+            self.pending = 0
+        logger.info(f"Compacted {applied} journal records ({len(cards)} cards, {len(discards)} discards)")
+        return applied
+
+    def recover(self) -> int:
+        """
+        Replay results left behind by an interrupted run, if any.
+
+        Returns:
+            Number of records recovered
+        """
+        if not self.pending:
+            return 0
+        logger.warning(f"Replaying {self.pending} journal records from an interrupted run")
+        return self.compact()
+
+
+# Global instance
+_result_journal: Optional[ResultJournal] = None
+
+
+def get_result_journal() -> ResultJournal:
+    """
+    Get the global result journal instance.
+
+    Returns:
+        ResultJournal: The singleton instance
+    """
+    global _result_journal
+    if _result_journal is None:
+        settings = get_settings()
+        _result_journal = ResultJournal(settings.journal_file, fsync=settings.journal_fsync)
+    return _result_journal
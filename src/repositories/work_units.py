@@ -0,0 +1,196 @@
+"""
+Candidate-level work units for resumable structuring.
+Each candidate sentence of a report is a unit keyed by report_id plus a hash
+of the sentence, with its state and (once done) its result. A retried report
+reuses finished units and only sends the missing candidates to the LLM.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union, Any, Iterable
+
+from ..ids import digest, normalize_text
+from ..models import OpportunityCard, DiscardedSignal
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+Result = Union[OpportunityCard, DiscardedSignal]
+
+
+def unit_hash(candidate: str) -> str:
+    """Stable hash of a candidate sentence (whitespace-insensitive)."""
+    return digest(normalize_text(candidate))
+
+
+class WorkUnitStore:
+    """
+    SQLite-backed work unit states, plus a per-report attempt counter.
+    Safe to share between the pipeline's stage threads.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS units (
+                report_id TEXT NOT NULL,
+                unit_hash TEXT NOT NULL,
+                state TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (report_id, unit_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS report_attempts (report_id TEXT PRIMARY KEY, attempts INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+
+    # --- Units ---
+
+    def completed(self, report_id: str, candidates: Iterable[str]) -> Dict[str, Result]:
+        """
+        Look up finished units of a report.
+
+        Returns:
+            Dict of candidate -> stored result for candidates already done
+        """
+        by_hash = {unit_hash(c): c for c in candidates}
+        if not by_hash:
+            return {}
+        with self._lock:
+            placeholders = ",".join("?" * len(by_hash))
+            rows = self._conn.execute(
+                f"SELECT unit_hash, result FROM units WHERE report_id = ? AND state = ? "
+                f"AND unit_hash IN ({placeholders})",
+                [report_id, DONE, *by_hash],
+            ).fetchall()
+        found: Dict[str, Result] = {}
+        for key, result in rows:
+            data = json.loads(result)
+            model = OpportunityCard if data["kind"] == "card" else DiscardedSignal
+            found[by_hash[key]] = model(**data["item"])
+        return found
+
+    def mark_pending(self, report_id: str, candidates: List[str]) -> None:
+        """Record units as dispatched (finished units are left alone)."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO units (report_id, unit_hash, state, attempts, updated_at) VALUES (?, ?, ?, 0, ?) "
+                "ON CONFLICT(report_id, unit_hash) DO UPDATE SET state = excluded.state, "
+                "updated_at = excluded.updated_at WHERE units.state != 'done'",
+                [(report_id, unit_hash(c), PENDING, now) for c in candidates],
+            )
+            self._conn.commit()
+
+    def record(self, report_id: str, candidates: List[str], results: List[Optional[Result]]) -> int:
+        """
+        Store the outcome of dispatched units: done with its result, or failed (None).
+
+        Returns:
+            Number of failed units
+        """
+        now = time.time()
+        rows = []
+        for candidate, result in zip(candidates, results):
+            if result is None:
+                rows.append((report_id, unit_hash(candidate), FAILED, None, "No LLM result", now))
+            else:
+                kind = "card" if isinstance(result, OpportunityCard) else "discard"
+                payload = json.dumps({"kind": kind, "item": result.model_dump(mode="json")}, ensure_ascii=False)
+                rows.append((report_id, unit_hash(candidate), DONE, payload, None, now))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO units (report_id, unit_hash, state, result, error, attempts, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?) "
+                "ON CONFLICT(report_id, unit_hash) DO UPDATE SET state = excluded.state, "
+                "result = excluded.result, error = excluded.error, attempts = units.attempts + 1, "
+                "updated_at = excluded.updated_at",
+                rows,
+            )
+            self._conn.commit()
+        return sum(1 for r in rows if r[2] == FAILED)
+
+    # --- Report attempts ---
+
+    def start_attempt(self, report_id: str) -> int:
+        """Count one more processing attempt for a report; returns the new count."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO report_attempts (report_id, attempts) VALUES (?, 1) "
+                "ON CONFLICT(report_id) DO UPDATE SET attempts = attempts + 1",
+                (report_id,),
+            )
+            self._conn.commit()
+            return self._conn.execute(
+                "SELECT attempts FROM report_attempts WHERE report_id = ?", (report_id,)
+            ).fetchone()[0]
+
+    def attempts(self, report_id: str) -> int:
+        """Processing attempts recorded for a report so far."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts FROM report_attempts WHERE report_id = ?", (report_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    # --- Maintenance ---
+
+    def clear(self, report_id: Optional[str] = None) -> None:
+        """Forget all units and attempts (or only those of one report)."""
+        with self._lock:
+            if report_id is None:
+                self._conn.execute("DELETE FROM units")
+                self._conn.execute("DELETE FROM report_attempts")
+            else:
+                self._conn.execute("DELETE FROM units WHERE report_id = ?", (report_id,))
+                self._conn.execute("DELETE FROM report_attempts WHERE report_id = ?", (report_id,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Unit counts per state for monitoring."""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM units GROUP BY state").fetchall()
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+
+# Global instance
+_work_units: Optional[WorkUnitStore] = None
+
+
+def get_work_units() -> WorkUnitStore:
+    """
+    Get the global work unit store instance.
+
+    Returns:
+        WorkUnitStore: The singleton instance
+    """
+    global _work_units
+    if _work_units is None:
+        _work_units = WorkUnitStore(get_settings().work_units_file)
+    return _work_units
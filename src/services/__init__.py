@@ -4,5 +4,29 @@ Contains business logic and external service integrations.
 """
 from .llm_client import LLMClient
 from .translation_service import TranslationService
+from .http_client import HttpClient, get_http_client
+from .response_cache import ResponseCache, get_response_cache
+from .rate_limiter import RateLimiter, get_llm_limiter, get_host_limiter
+from .translation_memory import TranslationMemory, get_translation_memory
+from .batch_backend import BatchBackend, OpenAIBatchBackend, LocalBatchBackend, get_batch_backend
+from .metrics import MetricsRegistry, get_metrics
 
-__all__ = ["LLMClient", "TranslationService"]
+__all__ = [
+    "LLMClient",
+    "TranslationService",
+    "HttpClient",
+    "get_http_client",
+    "ResponseCache",
+    "get_response_cache",
+    "RateLimiter",
+    "get_llm_limiter",
+    "get_host_limiter",
+    "TranslationMemory",
+    "get_translation_memory",
+    "BatchBackend",
+    "OpenAIBatchBackend",
+    "LocalBatchBackend",
+    "get_batch_backend",
+    "MetricsRegistry",
+    "get_metrics",
+]
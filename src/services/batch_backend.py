@@ -0,0 +1,211 @@
+"""
+Offline batch jobs for bulk LLM work.
+Chat-completion requests are written to a JSONL job file, submitted through a
+pluggable backend, polled until finished, and the result file is read back
+keyed by custom_id. The OpenAI Batch API backend trades latency for price;
+the local backend answers from the filesystem and stands in for it in tests.
+"""
+import json
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+
+# Provider statuses after which a batch will not change any more
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def make_batch_request(
+    custom_id: str,
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    response_format: Optional[Dict[str, str]] = None,
+    temperature: float = 1.0
+) -> Dict[str, Any]:
+    """
+    Build one line of a batch job file.
+
+    Returns:
+        Request dict in the provider's batch input format
+    """
+    body: Dict[str, Any] = {
+        "model": model or get_settings().openai_model,
+        "messages": messages,
+        "temperature": temperature,
+    }
+    if response_format:
+        body["response_format"] = response_format
+    return {"custom_id": custom_id, "method": "POST", "url": CHAT_COMPLETIONS_ENDPOINT, "body": body}
+
+
+def write_job_file(requests: List[Dict[str, Any]], path: Path) -> Path:
+    """Write batch requests as JSONL."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for request in requests:
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+    return path
+
+
+def read_result_file(path: Path) -> Dict[str, Optional[str]]:
+    """
+    Parse a batch result file.
+
+    Returns:
+        Dict of custom_id -> message content (None for failed requests)
+    """
+    results: Dict[str, Optional[str]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            content = None
+            response = item.get("response") or {}
+            if not item.get("error") and response.get("status_code") == 200:
+                choices = response.get("body", {}).get("choices") or []
+                if choices:
+                    content = choices[0].get("message", {}).get("content")
+            results[item["custom_id"]] = content
+    return results
+
+
+class BatchBackend(ABC):
+    """Provider-independent interface for submitting and collecting batch jobs."""
+
+    @abstractmethod
+    def submit(self, job_file: Path) -> str:
+        """Upload a JSONL job file and start it; returns the batch ID."""
+
+    @abstractmethod
+    def status(self, batch_id: str) -> str:
+        """Current provider status of a batch (see TERMINAL_STATUSES)."""
+
+    @abstractmethod
+    def download_results(self, batch_id: str, dest: Path) -> Optional[Path]:
+        """Write the result file of a completed batch to dest (None if there is none)."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Runs jobs through the OpenAI Batch API (24h completion window)."""
+
+    def __init__(self):
+        from openai import OpenAI
+
+        settings = get_settings()
+        self._client = OpenAI(api_key=settings.openai_api_key, timeout=settings.llm_timeout)
+
+    def submit(self, job_file: Path) -> str:
+        with open(job_file, "rb") as f:
+            uploaded = self._client.files.create(file=f, purpose="batch")
+        batch = self._client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=CHAT_COMPLETIONS_ENDPOINT,
+            completion_window="24h",
+        )
+        logger.info(f"Submitted batch {batch.id} ({job_file.name})")
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self._client.batches.retrieve(batch_id).status
+
+    def download_results(self, batch_id: str, dest: Path) -> Optional[Path]:
+        batch = self._client.batches.retrieve(batch_id)
+        if not batch.output_file_id:
+            return None
+        dest.write_bytes(self._client.files.content(batch.output_file_id).content)
+        return dest
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    Filesystem stand-in for a batch provider.
+    Each request body is answered by `responder` (body -> message content)
+    when the job is submitted; results use the provider's output format.
+    """
+
+    def __init__(self, root_dir: Path, responder: Callable[[Dict[str, Any]], Optional[str]]):
+        self.root_dir = root_dir
+        self.responder = responder
+
+    def submit(self, job_file: Path) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        batch_dir = self.root_dir / batch_id
+        batch_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(job_file, "r", encoding="utf-8") as f_in, \
+                open(batch_dir / "output.jsonl", "w", encoding="utf-8") as f_out:
+            for line in f_in:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                content = self.responder(request["body"])
+                if content is None:
+                    result = {"custom_id": request["custom_id"], "response": None,
+                              "error": {"message": "no response"}}
+                else:
+                    body = {"choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]}
+                    result = {"custom_id": request["custom_id"],
+                              "response": {"status_code": 200, "body": body}, "error": None}
+                f_out.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+        (batch_dir / "status").write_text("completed", encoding="utf-8")
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        path = self.root_dir / batch_id / "status"
+        return path.read_text(encoding="utf-8") if path.exists() else "failed"
+
+    def download_results(self, batch_id: str, dest: Path) -> Optional[Path]:
+        source = self.root_dir / batch_id / "output.jsonl"
+        if not source.exists():
+            return None
+        dest.write_bytes(source.read_bytes())
+        return dest
+
+
+def wait_for_batch(
+    backend: BatchBackend,
+    batch_id: str,
+    poll_seconds: float,
+    timeout_seconds: Optional[float] = None
+) -> str:
+    """
+    Poll a batch until it reaches a terminal status.
+
+    Returns:
+        The final status
+
+    Raises:
+        TimeoutError: If timeout_seconds passes first
+    """
+    deadline = time.monotonic() + timeout_seconds if timeout_seconds else None
+    while True:
+        status = backend.status(batch_id)
+        if status in TERMINAL_STATUSES:
+            return status
+        if deadline and time.monotonic() > deadline:
+            raise TimeoutError(f"Batch {batch_id} still {status} after {timeout_seconds}s")
+        logger.info(f"Batch {batch_id} is {status}; checking again in {poll_seconds}s")
+        time.sleep(poll_seconds)
+
+
+def get_batch_backend() -> BatchBackend:
+    """
+    Create the batch backend selected by settings.llm_batch_backend.
+
+    Returns:
+        BatchBackend instance
+    """
+    settings = get_settings()
+    if settings.llm_batch_backend == "openai":
+        return OpenAIBatchBackend()
+    raise ValueError(f"Unknown batch backend: {settings.llm_batch_backend}")
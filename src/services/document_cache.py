@@ -0,0 +1,265 @@
+"""
+Content-addressed on-disk cache for fetched documents and extracted text.
+Raw documents are stored gzip-compressed under their SHA-256 content hash;
+URLs map to the hash of their last fetched body (plus HTTP validators), and
+extracted text is keyed by content hash and extractor version. Total size is
+capped with least-recently-used eviction.
+"""
+import gzip
+import hashlib
+import io
+import json
+import logging
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, BinaryIO
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentCache:
+    """
+    Disk cache for raw documents and their extracted text.
+    Reprocessing with a warm cache makes no network calls at all.
+    """
+
+    # Persist LRU access times after this many reads without a write
+    TOUCH_FLUSH_INTERVAL = 50
+
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the index and compressed blobs
+            max_bytes: Size cap for all blobs; oldest entries are evicted first
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_file = cache_dir / "index.json"
+        self._lock = threading.RLock()
+        self._pending_touches = 0
+        self.hits = 0
+        self.misses = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._index = self._load_index()
+
+    # --- Index management ---
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the index or start an empty one."""
+        try:
+            data = json.loads(self.index_file.read_text(encoding="utf-8"))
+            return {"urls": data.get("urls", {}), "blobs": data.get("blobs", {})}
+        except FileNotFoundError:
+            return {"urls": {}, "blobs": {}}
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Corrupt document cache index, starting fresh: {e}")
+            return {"urls": {}, "blobs": {}}
+
+    def _save_index(self) -> None:
+        """Write the index atomically."""
+        tmp_path = self.index_file.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._index), encoding="utf-8")
+        tmp_path.replace(self.index_file)
+        self._pending_touches = 0
+
+    def flush(self) -> None:
+        """Persist pending LRU access times."""
+        with self._lock:
+            if self._pending_touches:
+                self._save_index()
+
+    def _blob_path(self, name: str) -> Path:
+        return self.cache_dir / name[-2:] / f"{name}.gz"
+
+    def _touch(self, name: str) -> None:
+        self._index["blobs"][name]["last_access"] = time.time()
+        self._pending_touches += 1
+        if self._pending_touches >= self.TOUCH_FLUSH_INTERVAL:
+            self._save_index()
+
+    def _read_blob(self, name: str) -> Optional[bytes]:
+        """Read and decompress a blob, dropping it from the index if missing."""
+        with self._lock:
+            if name not in self._index["blobs"]:
+                self.misses += 1
+                return None
+            try:
+                data = gzip.decompress(self._blob_path(name).read_bytes())
+            except (OSError, EOFError) as e:
+                logger.warning(f"Dropping unreadable cache blob {name}: {e}")
+                self._index["blobs"].pop(name, None)
+                self.misses += 1
+                return None
+            self._touch(name)
+            self.hits += 1
+            return data
+
+    def _open_blob(self, name: str) -> Optional[BinaryIO]:
+        """Open a blob as a decompressing stream, or None if it is not cached."""
+        with self._lock:
+            path = self._blob_path(name)
+            if name not in self._index["blobs"] or not path.exists():
+                self._index["blobs"].pop(name, None)
+                self.misses += 1
+                return None
+            self._touch(name)
+            self.hits += 1
+            return gzip.open(path, "rb")
+
+    def _write_blob(self, name: str, data: bytes) -> None:
+        """Compress and store a blob, then enforce the size cap."""
+        self._write_blob_stream(name, io.BytesIO(data))
+
+    def _write_blob_stream(self, name: str, stream: BinaryIO) -> None:
+        """Compress a stream into a blob without holding it in memory."""
+        path = self._blob_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".part")
+        with gzip.open(tmp_path, "wb", compresslevel=6) as out:
+            shutil.copyfileobj(stream, out, 1024 * 1024)
+        with self._lock:
+            tmp_path.replace(path)
+            self._index["blobs"][name] = {"size": path.stat().st_size, "last_access": time.time()}
+            self._evict()
+            self._save_index()
+
+    def _evict(self) -> None:
+        """Delete least-recently-used blobs until the cache fits its cap."""
+        blobs = self._index["blobs"]
+        total = sum(b["size"] for b in blobs.values())
+        if total <= self.max_bytes:
+            return
+        for name, meta in sorted(blobs.items(), key=lambda kv: kv[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            self._blob_path(name).unlink(missing_ok=True)
+            del blobs[name]
+            total -= meta["size"]
+            logger.debug(f"Evicted document cache blob {name}")
+
+    # --- Raw documents ---
+
+    def get_url_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the stored content hash and validators for a URL."""
+        with self._lock:
+            entry = self._index["urls"].get(url)
+            return dict(entry) if entry else None
+
+    def get_raw(self, content_hash: str) -> Optional[bytes]:
+        """Return a cached raw document by content hash."""
+        return self._read_blob(f"raw-{content_hash}")
+
+    def open_raw(self, content_hash: str) -> Optional[BinaryIO]:
+        """Open a cached raw document as a decompressing stream."""
+        return self._open_blob(f"raw-{content_hash}")
+
+    def has_raw(self, content_hash: str) -> bool:
+        """Check for a raw document without reading it."""
+        with self._lock:
+            return f"raw-{content_hash}" in self._index["blobs"]
+
+    def put_raw(
+        self,
+        url: str,
+        content: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> str:
+        """
+        Store a fetched document and point its URL at it.
+
+        Returns:
+            The SHA-256 content hash of the document
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        self.put_raw_stream(url, io.BytesIO(content), content_hash, etag, last_modified)
+        return content_hash
+
+    def put_raw_stream(
+        self,
+        url: str,
+        stream: BinaryIO,
+        content_hash: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """
+        Store a document from a stream whose content hash is already known
+        (computed while downloading) and point its URL at it.
+        """
+        if not self.has_raw(content_hash):
+            self._write_blob_stream(f"raw-{content_hash}", stream)
+        with self._lock:
+            self._index["urls"][url] = {
+                "content_hash": content_hash,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": time.time(),
+            }
+            self._save_index()
+
+    # --- Extracted text ---
+
+    def get_text(self, content_hash: str, extractor: str) -> Optional[str]:
+        """Return cached extracted text for a document and extractor version."""
+        data = self._read_blob(f"text-{extractor}-{content_hash}")
+        return data.decode("utf-8") if data is not None else None
+
+    def put_text(self, content_hash: str, extractor: str, text: str) -> None:
+        """Store extracted text for a document and extractor version."""
+        self._write_blob(f"text-{extractor}-{content_hash}", text.encode("utf-8"))
+
+    def lookup_text(self, url: str, extractor: str) -> Optional[str]:
+        """Return cached text for the last fetched version of a URL."""
+        entry = self.get_url_entry(url)
+        if not entry:
+            self.misses += 1
+            return None
+        return self.get_text(entry["content_hash"], extractor)
+
+    # --- Stats ---
+
+    @property
+    def size_bytes(self) -> int:
+        """Total compressed size of all cached blobs."""
+        with self._lock:
+            return sum(b["size"] for b in self._index["blobs"].values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._index["blobs"]),
+            "size_bytes": self.size_bytes,
+        }
+
+
+# Global instance
+_document_cache: Optional[DocumentCache] = None
+
+
+def get_document_cache() -> DocumentCache:
+    """
+    Get the global document cache instance.
+
+    Returns:
+        DocumentCache: The singleton instance
+    """
+    global _document_cache
+    if _document_cache is None:
+        settings = get_settings()
+        _document_cache = DocumentCache(
+            settings.document_cache_dir,
+            settings.document_cache_max_mb * 1024 * 1024,
+        )
+    return _document_cache
@@ -0,0 +1,122 @@
+"""
+Shared HTTP client for feed and document fetching.
+Reuses keep-alive connections through a pooled requests.Session with
+per-host connection limits, compressed transfer encodings and retries.
+Requests go through a per-host rate limiter that backs off on 429/503.
+"""
+import logging
+from typing import Optional, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..config import get_settings
+from .rate_limiter import get_host_limiter, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+
+def _accept_encoding() -> str:
+    """Advertise brotli only when urllib3 can actually decode it."""
+    try:
+        import brotli  # noqa: F401
+        return "gzip, deflate, br"
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return "gzip, deflate, br"
+        except ImportError:
+            return "gzip, deflate"
+
+
+class HttpClient:
+    """
+    Pooled HTTP client shared by ingestion and parsing.
+    One session means one TCP+TLS handshake per host instead of per document.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self):
+        """Build the session and mount the pooled, retrying adapter."""
+        settings = get_settings()
+        self.timeout = settings.http_timeout
+
+        retry = Retry(
+            total=settings.http_max_retries,
+            backoff_factor=settings.http_backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=settings.http_pool_connections,
+            pool_maxsize=settings.http_pool_maxsize,
+            pool_block=True,  # Cap concurrent connections per host
+            max_retries=retry,
+        )
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": settings.http_user_agent,
+            "Accept-Encoding": _accept_encoding(),
+        })
+        logger.info("HTTP client initialized")
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """
+        Issue a GET request through the shared session.
+
+        Args:
+            url: URL to fetch
+            headers: Extra headers merged over the session defaults
+            timeout: Request timeout in seconds (defaults to config setting)
+            stream: Defer downloading the body until it is read
+
+        Returns:
+            The requests Response object
+        """
+        limiter = get_host_limiter(url)
+        with limiter.slot():
+            response = self.session.get(
+                url,
+                headers=headers,
+                timeout=timeout or self.timeout,
+                stream=stream,
+            )
+        # Retries are exhausted at this point; slow every caller for this host down
+        if response.status_code in self.THROTTLE_STATUSES:
+            limiter.throttle(parse_retry_after(response.headers.get("Retry-After")))
+        return response
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+# Global instance
+_http_client: Optional[HttpClient] = None
+
+
+def get_http_client() -> HttpClient:
+    """
+    Get the global HTTP client instance.
+
+    Returns:
+        HttpClient: The singleton instance
+    """
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient()
+    return _http_client
@@ -2,15 +2,27 @@
 LLM Client for OpenAI API interactions.
 Implements singleton pattern and provides common LLM operations.
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any
-from openai import OpenAI
+import threading
+import time
+import weakref
+from typing import Optional, Dict, Any, Awaitable, Callable, Tuple, TypeVar
+import openai
+from openai import OpenAI, AsyncOpenAI
 from openai.types.chat import ChatCompletion
+from openai.types import CompletionUsage
 
 from ..config import get_settings
+from .prompt_templates import PromptTemplates
+from .response_cache import get_response_cache, make_cache_key
+from .rate_limiter import RateLimiter, get_llm_limiter, estimate_request_tokens, parse_retry_after
+from .metrics import get_metrics
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class LLMClient:
     """
@@ -20,6 +32,13 @@ class LLMClient:
     
     _instance: Optional['LLMClient'] = None
     _client: Optional[OpenAI] = None
+    _api_key: Optional[str] = None
+    
+    # One AsyncOpenAI client per event loop (concurrency is bounded by the shared limiter)
+    _async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+    # Shared background loop used by synchronous callers of async operations
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    _loop_lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
@@ -33,7 +52,9 @@ class LLMClient:
             api_key = settings.openai_api_key
             
             if api_key:
-                self._client = OpenAI(api_key=api_key)
+                self._api_key = api_key
+                # Retries are handled here so they go through the rate limiter
+                self._client = OpenAI(api_key=api_key, timeout=settings.llm_timeout, max_retries=0)
                 logger.info("LLM client initialized successfully")
             else:
                 logger.warning("No OpenAI API key found. LLM client not initialized.")
@@ -55,13 +76,99 @@ class LLMClient:
         """Check if the LLM client is available (API key configured)."""
         return self._client is not None
     
+    @staticmethod
+    def _build_request(
+        messages: list[Dict[str, str]],
+        model: Optional[str],
+        response_format: Optional[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int]
+    ) -> Dict[str, Any]:
+        """Assemble the keyword arguments for a chat completion request."""
+        settings = get_settings()
+        kwargs: Dict[str, Any] = {
+            "model": model or settings.openai_model,
+            "messages": messages,
+            "temperature": temperature,
+        }
+        
+        if response_format:
+            kwargs["response_format"] = response_format
+        
+        if max_tokens:
+            kwargs["max_tokens"] = max_tokens
+        
+        return kwargs
+    
+    @staticmethod
+    def _cache_key(kwargs: Dict[str, Any], use_cache: bool) -> Optional[str]:
+        """Return the response cache key for a request, or None if caching is off."""
+        if not use_cache or not get_settings().llm_cache_enabled:
+            return None
+        return make_cache_key(
+            kwargs["model"],
+            PromptTemplates.VERSION,
+            kwargs["messages"],
+            kwargs.get("response_format"),
+            kwargs["temperature"],
+            kwargs.get("max_tokens"),
+        )
+    
+    @staticmethod
+    def _cached_response(cache_key: Optional[str]) -> Optional[ChatCompletion]:
+        """Replay a cached completion, if any."""
+        if cache_key is None:
+            return None
+        cached = get_response_cache().get(cache_key)
+        get_metrics().inc("llm_cache_lookups_total", result="miss" if cached is None else "hit")
+        if cached is None:
+            return None
+        try:
+            return ChatCompletion.model_validate_json(cached)
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable cached LLM response: {e}")
+            return None
+    
+    @staticmethod
+    def _store_response(
+        cache_key: Optional[str],
+        response: ChatCompletion,
+        cache_if: Optional[Callable[[str], bool]] = None
+    ) -> None:
+        """Cache a completed (not truncated) response the caller can use."""
+        if cache_key is None or not response.choices:
+            return
+        if response.choices[0].finish_reason == "length":
+            return
+        if cache_if is not None and not cache_if(response.choices[0].message.content or ""):
+            # A retry must reach the model again rather than replay unusable output
+            logger.debug("Not caching LLM response rejected by the caller")
+            return
+        get_response_cache().put(cache_key, response.model, response.model_dump_json())
+    
+    @staticmethod
+    def _record_call(model: str, mode: str, started: float, usage: Optional[CompletionUsage]) -> None:
+        """Record the latency and token usage of a completed API call."""
+        metrics = get_metrics()
+        metrics.observe("llm_request_duration_seconds", time.perf_counter() - started, model=model, mode=mode)
+        if usage:
+            metrics.inc("llm_tokens_total", usage.prompt_tokens or 0, model=model, kind="prompt")
+            metrics.inc("llm_tokens_total", usage.completion_tokens or 0, model=model, kind="completion")
+    
+    @staticmethod
+    def _record_error(model: str, mode: str, error: Exception) -> None:
+        """Count a failed API call attempt."""
+        get_metrics().inc("llm_errors_total", model=model, mode=mode, error=error.__class__.__name__)
+    
     def chat_completion(
         self,
         messages: list[Dict[str, str]],
         model: Optional[str] = None,
         response_format: Optional[Dict[str, str]] = None,
         temperature: float = 1.0,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+        cache_if: Optional[Callable[[str], bool]] = None
     ) -> Optional[ChatCompletion]:
         """
         Create a chat completion.
@@ -72,6 +179,8 @@ class LLMClient:
             response_format: Response format specification (e.g., {"type": "json_object"})
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
+            use_cache: Set False to bypass the response cache for this call
+            cache_if: Predicate on the response content; responses it rejects are not cached
             
         Returns:
             ChatCompletion object or None if client not available
@@ -80,32 +189,273 @@ class LLMClient:
             logger.warning("LLM client not available. Skipping API call.")
             return None
         
-        settings = get_settings()
-        model = model or settings.openai_model
+        kwargs = self._build_request(messages, model, response_format, temperature, max_tokens)
+        cache_key = self._cache_key(kwargs, use_cache)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            logger.debug(f"LLM response cache hit. Model: {kwargs['model']}")
+            return cached
         
-        try:
-            kwargs: Dict[str, Any] = {
-                "model": model,
-                "messages": messages,
-                "temperature": temperature,
-            }
+        limiter = get_llm_limiter()
+        tokens = estimate_request_tokens(messages, max_tokens)
+        attempt = 0
+        
+        while True:
+            try:
+                with limiter.slot(tokens):
+                    started = time.perf_counter()
+                    response = self._client.chat.completions.create(**kwargs)
+            except Exception as e:
+                self._record_error(kwargs["model"], "sync", e)
+                delay = self._retry_delay(e, attempt, limiter)
+                if delay is None:
+                    logger.error(f"Error calling LLM API: {e}", exc_info=True)
+                    return None
+                attempt += 1
+                logger.warning(f"LLM API call failed ({e.__class__.__name__}), retry {attempt}")
+                time.sleep(delay)
+                continue
             
-            if response_format:
-                kwargs["response_format"] = response_format
+            usage = response.usage
+            limiter.settle_tokens(tokens, usage.total_tokens if usage else None)
+            self._record_call(kwargs["model"], "sync", started, usage)
+            logger.debug(f"LLM API call successful. Model: {kwargs['model']}, Tokens: "
+                        f"{usage.total_tokens if usage else 'N/A'}")
             
-            if max_tokens:
-                kwargs["max_tokens"] = max_tokens
+            self._store_response(cache_key, response, cache_if)
+            return response
+    
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Get (or create) the async client for the running loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            settings = get_settings()
+            client = AsyncOpenAI(api_key=self._api_key, timeout=settings.llm_timeout, max_retries=0)
+            self._async_clients[loop] = client
+        return client
+    
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int, limiter: RateLimiter) -> Optional[float]:
+        """
+        Decide whether a failed call is retried.
+        
+        Returns:
+            Seconds to wait before the next attempt, or None to give up
+        """
+        if attempt >= get_settings().llm_max_retries:
+            return None
+        if isinstance(error, openai.RateLimitError):
+            if getattr(error, "code", None) == "insufficient_quota":
+                return None
+            headers = error.response.headers
+            retry_after = parse_retry_after(headers.get("retry-after"))
+            retry_after_ms = parse_retry_after(headers.get("retry-after-ms"))
+            if retry_after_ms is not None:
+                retry_after = retry_after_ms / 1000
+            # The limiter pauses every caller, this one included, until Retry-After
+            limiter.throttle(retry_after)
+            return 0.0
+        if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, openai.InternalServerError)):
+            return 2.0 ** attempt
+        return None
+    
+    async def achat_completion(
+        self,
+        messages: list[Dict[str, str]],
+        model: Optional[str] = None,
+        response_format: Optional[Dict[str, str]] = None,
+        temperature: float = 1.0,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+        cache_if: Optional[Callable[[str], bool]] = None
+    ) -> Optional[ChatCompletion]:
+        """
+        Create a chat completion asynchronously.
+        Shares the rate limiter (and its concurrency window) with chat_completion.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model to use (defaults to config setting)
+            response_format: Response format specification (e.g., {"type": "json_object"})
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            use_cache: Set False to bypass the response cache for this call
+            cache_if: Predicate on the response content; responses it rejects are not cached
             
-            response = self._client.chat.completions.create(**kwargs)
+        Returns:
+            ChatCompletion object or None if client not available
+        """
+        if not self.is_available:
+            logger.warning("LLM client not available. Skipping API call.")
+            return None
+        
+        kwargs = self._build_request(messages, model, response_format, temperature, max_tokens)
+        cache_key = self._cache_key(kwargs, use_cache)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            logger.debug(f"LLM response cache hit. Model: {kwargs['model']}")
+            return cached
+        
+        async_client = self._get_async_client()
+        limiter = get_llm_limiter()
+        tokens = estimate_request_tokens(messages, max_tokens)
+        attempt = 0
+        
+        while True:
+            try:
+                async with limiter.aslot(tokens):
+                    started = time.perf_counter()
+                    response = await async_client.chat.completions.create(**kwargs)
+            except Exception as e:
+                self._record_error(kwargs["model"], "async", e)
+                delay = self._retry_delay(e, attempt, limiter)
+                if delay is None:
+                    logger.error(f"Error calling LLM API: {e}", exc_info=True)
+                    return None
+                attempt += 1
+                logger.warning(f"LLM API call failed ({e.__class__.__name__}), retry {attempt}")
+                await asyncio.sleep(delay)
+                continue
             
-            logger.debug(f"LLM API call successful. Model: {model}, Tokens: "
-                        f"{response.usage.total_tokens if response.usage else 'N/A'}")
+            usage = response.usage
+            limiter.settle_tokens(tokens, usage.total_tokens if usage else None)
+            self._record_call(kwargs["model"], "async", started, usage)
+            logger.debug(f"Async LLM API call successful. Model: {kwargs['model']}, Tokens: "
+                        f"{usage.total_tokens if usage else 'N/A'}")
             
+            self._store_response(cache_key, response, cache_if)
             return response
+    
+    async def astream_chat_completion(
+        self,
+        messages: list[Dict[str, str]],
+        model: Optional[str] = None,
+        response_format: Optional[Dict[str, str]] = None,
+        temperature: float = 1.0,
+        max_tokens: Optional[int] = None,
+        should_stop: Optional[Callable[[str], bool]] = None,
+        use_cache: bool = True,
+        cache_if: Optional[Callable[[str], bool]] = None
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Stream a chat completion, optionally cancelling it early.
+        After each received delta, should_stop is called with the content so
+        far; returning True closes the stream so no further tokens are generated.
+        Only complete responses are cached.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model to use (defaults to config setting)
+            response_format: Response format specification (e.g., {"type": "json_object"})
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens in response
+            should_stop: Predicate on the partial content that aborts generation
+            use_cache: Set False to bypass the response cache for this call
+            cache_if: Predicate on the response content; responses it rejects are not cached
             
-        except Exception as e:
-            logger.error(f"Error calling LLM API: {e}", exc_info=True)
-            return None
+        Returns:
+            Tuple of (content received, whether generation was aborted);
+            content is None if the client is not available or the call failed
+        """
+        if not self.is_available:
+            logger.warning("LLM client not available. Skipping API call.")
+            return None, False
+        
+        kwargs = self._build_request(messages, model, response_format, temperature, max_tokens)
+        cache_key = self._cache_key(kwargs, use_cache)
+        cached = self._cached_response(cache_key)
+        if cached is not None:
+            logger.debug(f"LLM response cache hit. Model: {kwargs['model']}")
+            return cached.choices[0].message.content, False
+        
+        async_client = self._get_async_client()
+        limiter = get_llm_limiter()
+        tokens = estimate_request_tokens(messages, max_tokens)
+        attempt = 0
+        
+        while True:
+            content, aborted, usage, finish_reason, response_id = "", False, None, None, None
+            try:
+                async with limiter.aslot(tokens):
+                    started = time.perf_counter()
+                    stream = await async_client.chat.completions.create(
+                        **kwargs, stream=True, stream_options={"include_usage": True}
+                    )
+                    try:
+                        async for chunk in stream:
+                            response_id = response_id or chunk.id
+                            if chunk.usage:
+                                usage = chunk.usage
+                            if not chunk.choices:
+                                continue
+                            finish_reason = chunk.choices[0].finish_reason or finish_reason
+                            delta = chunk.choices[0].delta.content
+                            if delta:
+                                content += delta
+                                if should_stop and should_stop(content):
+                                    aborted = True
+                                    break
+                    finally:
+                        await stream.close()
+            except Exception as e:
+                self._record_error(kwargs["model"], "stream", e)
+                delay = self._retry_delay(e, attempt, limiter)
+                if delay is None:
+                    logger.error(f"Error calling LLM API: {e}", exc_info=True)
+                    return None, False
+                attempt += 1
+                logger.warning(f"LLM API call failed ({e.__class__.__name__}), retry {attempt}")
+                await asyncio.sleep(delay)
+                continue
+            
+            limiter.settle_tokens(tokens, usage.total_tokens if usage else None)
+            self._record_call(kwargs["model"], "stream", started, usage)
+            if aborted:
+                get_metrics().inc("llm_stream_aborts_total", model=kwargs["model"])
+                logger.debug(f"Streamed LLM call aborted after {len(content)} chars. Model: {kwargs['model']}")
+                return content, True
+            
+            logger.debug(f"Streamed LLM API call successful. Model: {kwargs['model']}, Tokens: "
+                        f"{usage.total_tokens if usage else 'N/A'}")
+            self._store_response(cache_key, ChatCompletion.model_validate({
+                "id": response_id or "stream",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": kwargs["model"],
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": finish_reason or "stop",
+                    "message": {"role": "assistant", "content": content},
+                }],
+                "usage": usage.model_dump() if usage else None,
+            }), cache_if)
+            return content, False
+    
+    @classmethod
+    def _get_loop(cls) -> asyncio.AbstractEventLoop:
+        """Start the shared background event loop on first use."""
+        with cls._loop_lock:
+            if cls._loop is None or cls._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="llm-event-loop", daemon=True)
+                thread.start()
+                cls._loop = loop
+            return cls._loop
+    
+    def run(self, coro: Awaitable[T]) -> T:
+        """
+        Run a coroutine on the shared background event loop and wait for it.
+        Lets synchronous code (pipeline, scripts, Streamlit) use the async
+        operations while all of them share one client and one concurrency limit.
+        
+        Args:
+            coro: Coroutine to run
+            
+        Returns:
+            The coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result()
     
     def simple_completion(
         self,
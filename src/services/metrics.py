@@ -0,0 +1,266 @@
+"""
+In-process metrics registry.
+Counters, gauges and latency histograms, labelled by operation, cover the
+network, parsing, extraction, LLM and storage steps of a run. After each run
+they are exported as a JSON snapshot and a Prometheus text-format file, so a
+slow run can be traced to the stage that caused it. Values accumulate over
+the lifetime of the process, as Prometheus counters do.
+"""
+import functools
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "radar"
+
+# Seconds; spans a cache hit (milliseconds) to a long LLM call or PDF parse (minutes)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in pairs
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus style."""
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "buckets": {_format_value(b): n for b, n in zip(self.buckets, self.counts)},
+        }
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of labelled counters, gauges and histograms.
+    Use timer() / timed() for latencies; errors raised inside a timer are
+    counted in errors_total under the same operation.
+    """
+
+    def __init__(self, namespace: str = NAMESPACE, enabled: bool = True):
+        """
+        Initialize the registry.
+
+        Args:
+            namespace: Prefix for exported metric names
+            enabled: When False, recording calls are no-ops
+        """
+        self.namespace = namespace
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    # --- Recording ---
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Add to a counter."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to its current value."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = float(value)
+
+    def observe(self, name: str, value: float, buckets: Sequence[float] = LATENCY_BUCKETS, **labels: Any) -> None:
+        """Record a value in a histogram (buckets are fixed by the first observation)."""
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, operation: str, **labels: Any) -> Iterator[None]:
+        """Time a block as operation_duration_seconds, counting exceptions in errors_total."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.inc("errors_total", operation=operation, error=e.__class__.__name__, **labels)
+            raise
+        finally:
+            self.observe("operation_duration_seconds", time.perf_counter() - start, operation=operation, **labels)
+
+    def reset(self) -> None:
+        """Drop all recorded series."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    # --- Export ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current values of every series.
+
+        Returns:
+            Dict with counters, gauges and histograms, each name -> list of labelled series
+        """
+        def series(data: Dict[str, Dict[LabelKey, Any]], render: Callable[[Any], Any]) -> Dict[str, List[Dict]]:
+            return {
+                name: [{"labels": dict(key), "value": render(value)} for key, value in sorted(values.items())]
+                for name, values in sorted(data.items())
+            }
+
+        with self._lock:
+            return {
+                "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "counters": series(self._counters, lambda v: v),
+                "gauges": series(self._gauges, lambda v: v),
+                "histograms": series(self._histograms, lambda h: h.snapshot()),
+            }
+
+    def to_prometheus(self) -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for kind, data in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, values in sorted(data.items()):
+                    full = f"{self.namespace}_{name}"
+                    lines.append(f"# TYPE {full} {kind}")
+                    for key, value in sorted(values.items()):
+                        lines.append(f"{full}{_format_labels(key)} {_format_value(value)}")
+            for name, values in sorted(self._histograms.items()):
+                full = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {full} histogram")
+                for key, histogram in sorted(values.items()):
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f"{full}_bucket{_format_labels(key, [('le', _format_value(bound))])} {count}")
+                    lines.append(f"{full}_bucket{_format_labels(key, [('le', '+Inf')])} {histogram.count}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {_format_value(round(histogram.sum, 6))}")
+                    lines.append(f"{full}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_path: Path, prom_path: Path) -> None:
+        """Write the JSON snapshot and the Prometheus text file atomically."""
+        for path, content in (
+            (json_path, json.dumps(self.snapshot(), indent=2)),
+            (prom_path, self.to_prometheus()),
+        ):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            tmp_path.write_text(content, encoding="utf-8")
+            tmp_path.replace(path)
+        logger.info(f"Metrics written to {json_path} and {prom_path}")
+
+
+# Global instance
+_metrics: Optional[MetricsRegistry] = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Get the global metrics registry instance.
+
+    Returns:
+        MetricsRegistry: The singleton instance
+    """
+    global _metrics
+    if _metrics is None:
+        _metrics = MetricsRegistry(enabled=get_settings().metrics_enabled)
+    return _metrics
+
+
+def timed(operation: str) -> Callable[[F], F]:
+    """Decorator timing every call of a function under the given operation name."""
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_metrics().timer(operation):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def export_run_metrics() -> None:
+    """
+    Record current cache and rate-limiter statistics as gauges, then write
+    the JSON and Prometheus files configured in settings.
+    """
+    from .document_cache import get_document_cache
+    from .response_cache import get_response_cache
+    from .translation_memory import get_translation_memory
+    from .rate_limiter import get_llm_limiter
+
+    settings = get_settings()
+    metrics = get_metrics()
+    if not metrics.enabled:
+        return
+
+    caches = []
+    if settings.document_cache_enabled:
+        caches.append(("document", get_document_cache().stats()))
+    if settings.llm_cache_enabled:
+        caches.append(("llm_response", get_response_cache().stats()))
+    if settings.translation_memory_enabled:
+        caches.append(("translation_memory", get_translation_memory().stats()))
+    for name, stats in caches:
+        metrics.set_gauge("cache_hits", stats["hits"], cache=name)
+        metrics.set_gauge("cache_misses", stats["misses"], cache=name)
+        metrics.set_gauge("cache_hit_ratio", round(stats["hit_rate"], 4), cache=name)
+        metrics.set_gauge("cache_entries", stats["entries"], cache=name)
+        metrics.set_gauge("cache_size_bytes", stats["size_bytes"], cache=name)
+
+    limiter = get_llm_limiter().stats()
+    metrics.set_gauge("llm_concurrency_limit", limiter["concurrency_limit"])
+    metrics.set_gauge("llm_throttled", limiter["throttled"])
+    metrics.set_gauge("llm_rate_limit_wait_seconds", limiter["wait_seconds"])
+
+    try:
+        metrics.export(settings.metrics_json_file, settings.metrics_prom_file)
+    except OSError as e:
+        logger.error(f"Failed to write metrics: {e}")
@@ -2,13 +2,17 @@
 Prompt templates for LLM interactions.
 Centralized location for all prompts used in the application.
 """
+import json
 
 
 class PromptTemplates:
     """Container for all prompt templates."""
     
-    # Signal Extraction and Structuring Prompt
-    SIGNAL_EXTRACTION = """
+    # Bump whenever a prompt changes so cached LLM responses are not reused
+    VERSION = "4"
+    
+    # Shared analysis framework (sent once per request, single or batched)
+    SIGNAL_FRAMEWORK = """
 You are a Founder-in-Residence identifying **startup opportunities** from generic business reports.
 Your goal is not to summarize, but to **deconstruct** the text into a concrete "Pain Point" and a plausible "Attack Vector" for a new startup.
 
@@ -28,9 +32,11 @@ Your goal is not to summarize, but to **deconstruct** the text into a concrete "
 - Vague statements ("Growth is slowing").
 - Problems solvable only by regulation/policy.
 - Generic corporate advice ("Leaders must lead").
-
-**Output Format (JSON)**:
-{{
+"""
+    
+    # JSON fields produced for each analysed sentence.
+    # importance_score comes first so a streamed response can be cut off early.
+    SIGNAL_FIELDS = """  "importance_score": 0-100,
   "pain_holder": "...",
   "pain_holder_ko": "...",
   "pain_context": "...",
@@ -43,17 +49,73 @@ Your goal is not to summarize, but to **deconstruct** the text into a concrete "
   "evidence_sentence_ko": "...",
   "industry_tags": ["..."],
   "technology_tags": ["..."],
-  "importance_score": 0-100,
   "confidence_score": 0.0-1.0,
   "market_size": "...",
   "value_type": "Cost Reduction|Revenue Growth|Risk Mitigation|Productivity Gain",
   "expected_impact": "...",
   "timeline": "..."
-}}
+"""
+    
+    # English-only fields, for deferred Korean translation
+    SIGNAL_FIELDS_EN = "".join(
+        line for line in SIGNAL_FIELDS.splitlines(keepends=True) if '_ko"' not in line
+    )
+    
+    # Signal Extraction and Structuring Prompt
+    SIGNAL_EXTRACTION = SIGNAL_FRAMEWORK + """
+**Output Format (JSON)**:
+{{
+""" + SIGNAL_FIELDS + """}}
 
-If NOT a valid startup opportunity, return {{ "importance_score": 0 }}.
+Always write "importance_score" first. If NOT a valid startup opportunity, return {{ "importance_score": 0 }}.
 
 Sentence: "{sentence}"
+Context: "{context}" (Report Title or Summary)
+"""
+    
+    # Batched variant: one framework, many numbered sentences, one JSON array back
+    SIGNAL_EXTRACTION_BATCH = SIGNAL_FRAMEWORK + """
+Analyse each of the {count} numbered sentences below independently.
+
+**Output Format (JSON)**:
+{{
+  "results": [
+    {{
+  "index": 0,
+""" + SIGNAL_FIELDS + """    }}
+  ]
+}}
+
+Return exactly one result per sentence, in the same order, each with its "index".
+If a sentence is NOT a valid startup opportunity, return {{ "index": <n>, "importance_score": 0 }} for it.
+
+Sentences:
+{sentences}
+
+Context: "{context}" (Report Title or Summary)
+"""
+    
+    # English-only variants (Korean fields are filled later by TranslationService)
+    SIGNAL_EXTRACTION_EN = SIGNAL_EXTRACTION.replace(SIGNAL_FIELDS, SIGNAL_FIELDS_EN)
+    SIGNAL_EXTRACTION_BATCH_EN = SIGNAL_EXTRACTION_BATCH.replace(SIGNAL_FIELDS, SIGNAL_FIELDS_EN)
+    
+    # Cheap first-pass scoring: no structuring, no translation, score only
+    SIGNAL_SCORING = """
+You screen sentences from business reports for **startup opportunities**: a concrete pain point
+held by a specific group, caused by a workflow problem a new product could solve.
+
+Score each of the {count} numbered sentences from 0 to 100.
+Score below 50 for vague statements ("Growth is slowing"), problems solvable only by
+regulation/policy, and generic corporate advice ("Leaders must lead").
+
+**Output Format (JSON)**:
+{{"results": [{{"index": 0, "importance_score": 0-100}}]}}
+
+Return exactly one result per sentence, in the same order, each with its "index".
+
+Sentences:
+{sentences}
+
 Context: "{context}" (Report Title or Summary)
 """
     
@@ -67,18 +129,130 @@ Summary: {summary}
 """
     
     @classmethod
-    def format_signal_extraction(cls, sentence: str, context: str) -> str:
+    def format_signal_extraction(cls, sentence: str, context: str, english_only: bool = False) -> str:
         """
         Format the signal extraction prompt with provided data.
         
         Args:
             sentence: The candidate sentence to analyze
             context: Contextual information (report title or summary)
+            english_only: Omit the *_ko fields
+            
+        Returns:
+            Formatted prompt string
+        """
+        template = cls.SIGNAL_EXTRACTION_EN if english_only else cls.SIGNAL_EXTRACTION
+        return template.format(sentence=sentence, context=context)
+    
+    @classmethod
+    def format_signal_extraction_batch(cls, sentences: list, context: str, english_only: bool = False) -> str:
+        """
+        Format the batched signal extraction prompt.
+        
+        Args:
+            sentences: Candidate sentences to analyse, indexed by position
+            context: Contextual information (report title or summary)
+            english_only: Omit the *_ko fields
+            
+        Returns:
+            Formatted prompt string
+        """
+        numbered = "\n".join(f'[{i}] "{sentence}"' for i, sentence in enumerate(sentences))
+        template = cls.SIGNAL_EXTRACTION_BATCH_EN if english_only else cls.SIGNAL_EXTRACTION_BATCH
+        return template.format(count=len(sentences), sentences=numbered, context=context)
+    
+    @classmethod
+    def format_signal_scoring(cls, sentences: list, context: str) -> str:
+        """
+        Format the score-only screening prompt.
+        
+        Args:
+            sentences: Candidate sentences to score, indexed by position
+            context: Contextual information (report title or summary)
+            
+        Returns:
+            Formatted prompt string
+        """
+        numbered = "\n".join(f'[{i}] "{sentence}"' for i, sentence in enumerate(sentences))
+        return cls.SIGNAL_SCORING.format(count=len(sentences), sentences=numbered, context=context)
+    
+    # Batched report translation: many title/summary pairs in one request
+    REPORT_TRANSLATION_BATCH = """
+Translate the Title and Summary of each business report below into professional Korean.
+
+Return ONLY a JSON object:
+{{"items": [{{"id": "...", "title_ko": "...", "summary_ko": "..."}}]}}
+
+Return exactly one item per report, with its "id".
+
+Reports:
+{reports}
+"""
+    
+    @classmethod
+    def format_report_translation_batch(cls, reports: list) -> str:
+        """
+        Format the batched report translation prompt.
+        
+        Args:
+            reports: Dicts with "id", "title" and "summary"
+            
+        Returns:
+            Formatted prompt string
+        """
+        return cls.REPORT_TRANSLATION_BATCH.format(reports=json.dumps(reports, ensure_ascii=False, indent=1))
+    
+    # Batched card translation: many cards' English fields in, Korean fields out
+    CARD_TRANSLATION_BATCH = """
+Translate the English fields of each startup opportunity card below into professional Korean.
+Keep product names, acronyms and figures unchanged.
+
+Return ONLY a JSON object:
+{{"items": [{{"id": "...", "pain_holder_ko": "...", "pain_context_ko": "...", "pain_mechanism_ko": "...", "attack_vector_ko": "...", "evidence_sentence_ko": "..."}}]}}
+
+Return exactly one item per card, with its "id".
+
+Cards:
+{cards}
+"""
+    
+    # Short recurring strings (tags, labels)
+    SEGMENT_TRANSLATION_BATCH = """
+Translate each numbered business term below into concise, natural Korean as it would appear on a UI label.
+Keep acronyms and product names (e.g. AI, ESG, SaaS) unchanged.
+
+Return ONLY a JSON object: {{"items": [{{"id": 0, "ko": "..."}}]}}
+
+Terms:
+{segments}
+"""
+    
+    @classmethod
+    def format_segment_translation(cls, segments: list) -> str:
+        """
+        Format the batched segment translation prompt.
+        
+        Args:
+            segments: Short strings to translate, indexed by position
+            
+        Returns:
+            Formatted prompt string
+        """
+        numbered = "\n".join(f"[{i}] {segment}" for i, segment in enumerate(segments))
+        return cls.SEGMENT_TRANSLATION_BATCH.format(segments=numbered)
+    
+    @classmethod
+    def format_card_translation_batch(cls, cards: list) -> str:
+        """
+        Format the batched card translation prompt.
+        
+        Args:
+            cards: Dicts with "id" and the English fields to translate
             
         Returns:
             Formatted prompt string
         """
-        return cls.SIGNAL_EXTRACTION.format(sentence=sentence, context=context)
+        return cls.CARD_TRANSLATION_BATCH.format(cards=json.dumps(cards, ensure_ascii=False, indent=1))
     
     @classmethod
     def format_translation(cls, title: str, summary: str) -> str:
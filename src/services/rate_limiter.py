@@ -0,0 +1,357 @@
+"""
+Shared rate limiting for outbound calls.
+Token buckets cap requests/min and tokens/min, and an AIMD (additive
+increase, multiplicative decrease) concurrency window grows while calls
+succeed and halves on 429s, pausing everyone for the server's Retry-After.
+Works for both threads and asyncio tasks.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from typing import Optional, Dict, Any, Iterator, AsyncIterator
+from urllib.parse import urlsplit
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_request_tokens(messages: list, max_tokens: Optional[int] = None, default_output: int = 500) -> int:
+    """Rough prompt + completion token count for the tokens/min bucket."""
+    prompt_chars = sum(len(m.get("content") or "") for m in messages)
+    return prompt_chars // CHARS_PER_TOKEN + (max_tokens or default_output)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP dates are ignored)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at rate_per_minute, holding at most one
+    minute of budget. Reservations may overdraw it; the caller then waits.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate_per_minute: Refill rate (0 = unlimited)
+        """
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take amount from the bucket.
+
+        Returns:
+            Seconds the caller must wait before using the reservation
+        """
+        if self.rate_per_second <= 0:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+    def refund(self, amount: float) -> None:
+        """Return (or, if negative, additionally charge) budget after the fact."""
+        if self.rate_per_second <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency window: +1 slot per window of successes, halved on throttling.
+    Threads block on an Event, asyncio tasks on a Future of their own loop.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, decrease_cooldown: float = 1.0):
+        """
+        Initialize the window.
+
+        Args:
+            max_limit: Upper bound (and starting value) for concurrent calls
+            min_limit: Lower bound the window never shrinks below
+            decrease_cooldown: A burst of 429s within this many seconds halves the window once
+        """
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.decrease_cooldown = decrease_cooldown
+        self._limit = float(self.max_limit)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _try_acquire(self) -> bool:
+        if self._in_flight < int(self._limit):
+            self._in_flight += 1
+            return True
+        return False
+
+    def _wake_waiters(self) -> None:
+        """Wake everyone waiting; each retries and the losers wait again."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if isinstance(waiter, threading.Event):
+                waiter.set()
+            else:
+                loop, future = waiter
+                try:
+                    loop.call_soon_threadsafe(lambda f=future: f.done() or f.set_result(None))
+                except RuntimeError:
+                    pass  # Loop already closed; nobody is waiting on it any more
+
+    def acquire(self) -> None:
+        """Block the calling thread until a slot is free."""
+        while True:
+            with self._lock:
+                if self._try_acquire():
+                    return
+                event = threading.Event()
+                self._waiters.append(event)
+            event.wait()
+
+    async def aacquire(self) -> None:
+        """Wait (without blocking the event loop) until a slot is free."""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if self._try_acquire():
+                    return
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+            await future
+
+    def release(self) -> None:
+        """Give a slot back."""
+        with self._lock:
+            self._in_flight -= 1
+            self._wake_waiters()
+
+    def on_success(self) -> None:
+        """Additive increase: roughly one extra slot per full window of successes."""
+        with self._lock:
+            if self._limit < self.max_limit:
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+                self._wake_waiters()
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease, at most once per cooldown."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_decrease < self.decrease_cooldown:
+                return
+            self._last_decrease = now
+            self._limit = max(float(self.min_limit), self._limit / 2)
+        logger.info(f"Throttled: concurrency window reduced to {int(self._limit)}")
+
+
+class RateLimiter:
+    """
+    Requests/min + tokens/min buckets in front of an AIMD concurrency window.
+    Use `with limiter.slot(tokens):` from threads or `async with limiter.aslot(tokens):`
+    from coroutines, and report 429s through throttle().
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = 8,
+        min_concurrency: int = 1,
+        default_backoff: float = 1.0
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Label used in logs and stats
+            requests_per_minute: Request budget (0 = unlimited)
+            tokens_per_minute: Token budget (0 = unlimited)
+            max_concurrency: Upper bound for concurrent calls
+            min_concurrency: Lower bound the AIMD window shrinks to
+            default_backoff: Pause applied on a 429 without Retry-After
+        """
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrency(max_concurrency, min_concurrency)
+        self.default_backoff = default_backoff
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def _reserve(self, tokens: int) -> float:
+        return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def _pause_remaining(self) -> float:
+        return max(0.0, self._paused_until - time.monotonic())
+
+    def _record_wait(self, seconds: float) -> None:
+        if seconds > 0:
+            with self._lock:
+                self.wait_seconds += seconds
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until the call fits the budgets and a concurrency slot is free."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        self.concurrency.acquire()
+        pause = self._pause_remaining()
+        if pause > 0:
+            time.sleep(pause)
+        self._record_wait(delay + pause)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """Async variant of acquire()."""
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await self.concurrency.aacquire()
+        pause = self._pause_remaining()
+        if pause > 0:
+            await asyncio.sleep(pause)
+        self._record_wait(delay + pause)
+
+    def release(self, success: bool = True) -> None:
+        """Free the slot; successful calls widen the concurrency window."""
+        if success:
+            self.concurrency.on_success()
+        self.concurrency.release()
+
+    def settle_tokens(self, estimated: int, actual: Optional[int]) -> None:
+        """Correct the tokens/min bucket once real usage is known."""
+        if actual is not None:
+            self.tokens.refund(estimated - actual)
+
+    def throttle(self, retry_after: Optional[float] = None) -> float:
+        """
+        Record a rate-limit response: halve the window and pause new calls.
+
+        Returns:
+            Seconds until calls resume
+        """
+        pause = retry_after if retry_after is not None else self.default_backoff
+        with self._lock:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        self.concurrency.on_throttle()
+        logger.warning(f"{self.name} rate limited; pausing {pause:.1f}s")
+        return pause
+
+    @contextmanager
+    def slot(self, tokens: int = 0) -> Iterator[None]:
+        """Hold a slot for the duration of a blocking call."""
+        self.acquire(tokens)
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self.release(success)
+
+    @asynccontextmanager
+    async def aslot(self, tokens: int = 0) -> AsyncIterator[None]:
+        """Hold a slot for the duration of an awaited call."""
+        await self.aacquire(tokens)
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self.release(success)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current window and throttling counters for monitoring."""
+        return {
+            "concurrency_limit": self.concurrency.limit,
+            "in_flight": self.concurrency.in_flight,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+# Global instances
+_llm_limiter: Optional[RateLimiter] = None
+_host_limiters: Dict[str, RateLimiter] = {}
+_host_lock = threading.Lock()
+
+
+def get_llm_limiter() -> RateLimiter:
+    """
+    Get the limiter shared by all LLM calls.
+
+    Returns:
+        RateLimiter: The singleton instance
+    """
+    global _llm_limiter
+    if _llm_limiter is None:
+        settings = get_settings()
+        _llm_limiter = RateLimiter(
+            "LLM API",
+            requests_per_minute=settings.llm_requests_per_minute,
+            tokens_per_minute=settings.llm_tokens_per_minute,
+            max_concurrency=settings.llm_max_concurrency,
+            min_concurrency=settings.llm_min_concurrency,
+        )
+    return _llm_limiter
+
+
+def get_host_limiter(url: str) -> RateLimiter:
+    """
+    Get the limiter for the host of a URL (one per host, created on demand).
+
+    Returns:
+        RateLimiter: The host's limiter
+    """
+    host = urlsplit(url).netloc.lower()
+    with _host_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            settings = get_settings()
+            limiter = RateLimiter(
+                host,
+                requests_per_minute=settings.http_requests_per_minute,
+                max_concurrency=settings.http_pool_maxsize,
+                default_backoff=settings.http_backoff_factor * 2,
+            )
+            _host_limiters[host] = limiter
+        return limiter
@@ -0,0 +1,188 @@
+"""
+Persistent cache for LLM responses.
+Completions are stored in SQLite keyed by a hash of the model, the prompt
+version and the full request, so reprocessing unchanged reports replays
+earlier answers instead of paying for them again.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(
+    model: str,
+    prompt_version: str,
+    messages: list,
+    response_format: Optional[Dict[str, str]] = None,
+    temperature: float = 1.0,
+    max_tokens: Optional[int] = None
+) -> str:
+    """
+    Hash everything that determines a completion into a cache key.
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {
+            "model": model,
+            "prompt_version": prompt_version,
+            "messages": messages,
+            "response_format": response_format,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed response cache with TTL and size-based LRU eviction.
+    Safe to share between threads and the async event loop.
+    """
+
+    def __init__(self, db_path: Path, ttl_seconds: float, max_bytes: int):
+        """
+        Initialize the cache.
+
+        Args:
+            db_path: SQLite database file
+            ttl_seconds: Entries older than this are ignored and purged (0 = never expire)
+            max_bytes: Size cap for stored responses; least recently used go first
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached response JSON for a key, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._is_expired(row[1], now):
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, model: str, response: str) -> None:
+        """
+        Store a response JSON and enforce the size cap.
+        """
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under the cap."""
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.debug(f"Evicted {evicted} cached LLM responses")
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+        logger.info("LLM response cache cleared")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size for monitoring."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+
+# Global instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    Get the global LLM response cache instance.
+
+    Returns:
+        ResponseCache: The singleton instance
+    """
+    global _response_cache
+    if _response_cache is None:
+        settings = get_settings()
+        _response_cache = ResponseCache(
+            settings.llm_cache_file,
+            settings.llm_cache_ttl_hours * 3600,
+            settings.llm_cache_max_mb * 1024 * 1024,
+        )
+    return _response_cache
@@ -0,0 +1,174 @@
+"""
+Persistent translation memory.
+Translated segments (titles, summaries, card fields, tags) are stored in
+SQLite keyed by a hash of the source text, target language and model, so
+restarts and reprocesses never pay for the same translation twice.
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterable
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def segment_key(source: str, lang: str, model: str) -> str:
+    """Hash a source segment with its target language and model."""
+    return hashlib.sha256(f"{lang}\x00{model}\x00{source.strip()}".encode("utf-8")).hexdigest()
+
+
+class TranslationMemory:
+    """
+    SQLite-backed segment store with size-based LRU eviction and hit/miss stats.
+    Safe to share between threads and the async event loop.
+    """
+
+    def __init__(self, db_path: Path, max_bytes: int):
+        """
+        Initialize the memory.
+
+        Args:
+            db_path: SQLite database file
+            max_bytes: Size cap for stored segments; least recently used go first
+        """
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS segments (
+                key TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                model TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_access ON segments(last_access)")
+        self._conn.commit()
+
+    def get(self, source: str, lang: str, model: str) -> Optional[str]:
+        """Return the stored translation of a segment, or None."""
+        return self.get_many([source], lang, model).get(source)
+
+    def get_many(self, sources: Iterable[str], lang: str, model: str) -> Dict[str, str]:
+        """
+        Look up many segments at once.
+
+        Returns:
+            Dict of source -> translation for the segments found
+        """
+        keys = {segment_key(s, lang, model): s for s in sources if s and s.strip()}
+        if not keys:
+            return {}
+        found: Dict[str, str] = {}
+        now = time.time()
+        with self._lock:
+            placeholders = ",".join("?" * len(keys))
+            rows = self._conn.execute(
+                f"SELECT key, target FROM segments WHERE key IN ({placeholders})", list(keys)
+            ).fetchall()
+            for key, target in rows:
+                found[keys[key]] = target
+            if rows:
+                self._conn.executemany(
+                    "UPDATE segments SET last_access = ? WHERE key = ?", [(now, key) for key, _ in rows]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, source: str, target: str, lang: str, model: str) -> None:
+        """Store one translated segment."""
+        self.put_many({source: target}, lang, model)
+
+    def put_many(self, translations: Dict[str, str], lang: str, model: str) -> None:
+        """Store many translated segments and enforce the size cap."""
+        now = time.time()
+        rows = [
+            (segment_key(source, lang, model), source, target, lang, model,
+             len(source.encode("utf-8")) + len(target.encode("utf-8")), now)
+            for source, target in translations.items()
+            if source and source.strip() and target and target.strip()
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO segments (key, source, target, lang, model, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used segments until the store fits its cap."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM segments").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM segments ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM segments WHERE key = ?", (key,))
+            total -= size
+
+    def clear(self) -> None:
+        """Remove all stored segments."""
+        with self._lock:
+            self._conn.execute("DELETE FROM segments")
+            self._conn.commit()
+        logger.info("Translation memory cleared")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size for monitoring."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM segments"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+
+# Global instance
+_translation_memory: Optional[TranslationMemory] = None
+
+
+def get_translation_memory() -> TranslationMemory:
+    """
+    Get the global translation memory instance.
+
+    Returns:
+        TranslationMemory: The singleton instance
+    """
+    global _translation_memory
+    if _translation_memory is None:
+        settings = get_settings()
+        _translation_memory = TranslationMemory(
+            settings.translation_memory_file,
+            settings.translation_memory_max_mb * 1024 * 1024,
+        )
+    return _translation_memory
@@ -1,96 +1,436 @@
 """
 Translation service for Korean localization.
-Handles translation of reports and cards using LLM.
+Handles translation of reports, cards and short segments (tags) using LLM,
+backed by the persistent translation memory.
 """
+import asyncio
 import json
 import logging
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, List, Iterable
 
+from ..config import get_settings
 from .llm_client import LLMClient
 from .prompt_templates import PromptTemplates
+from .translation_memory import TranslationMemory, get_translation_memory
 
 logger = logging.getLogger(__name__)
 
+# English card fields that have a *_ko counterpart
+CARD_KO_FIELDS = ("pain_holder", "pain_context", "pain_mechanism", "attack_vector", "evidence_sentence")
+
+
+def needs_card_translation(card) -> bool:
+    """True if any English card field is missing its Korean counterpart."""
+    return any(getattr(card, f) and not getattr(card, f"{f}_ko") for f in CARD_KO_FIELDS)
+
 
 class TranslationService:
     """
     Service for translating content to Korean.
-    Includes caching to avoid redundant API calls.
+    Every translated segment is kept in the persistent translation memory
+    to avoid redundant API calls across runs.
     """
     
-    def __init__(self):
-        """Initialize the translation service."""
-        self.llm_client = LLMClient.get_instance()
-        self._cache: Dict[str, Tuple[str, str]] = {}  # key: (title_ko, summary_ko)
+    LANG = "ko"
+    SEGMENT_BATCH_SIZE = 50  # Tags per segment translation request
     
-    def translate_report(self, report) -> None:
+    def __init__(self, memory: Optional[TranslationMemory] = None):
         """
-        Translate Report title and summary to Korean in-place.
+        Initialize the translation service.
         
         Args:
-            report: Report object to translate
+            memory: Translation memory (defaults to the shared one if enabled)
         """
+        settings = get_settings()
+        self.llm_client = LLMClient.get_instance()
+        self.model = settings.openai_model
+        if memory is None and settings.translation_memory_enabled:
+            memory = get_translation_memory()
+        self.memory = memory
+    
+    def _recall(self, sources: Iterable[str]) -> Dict[str, str]:
+        """Look segments up in the translation memory."""
+        if self.memory is None:
+            return {}
+        return self.memory.get_many(sources, self.LANG, self.model)
+    
+    def _remember(self, translations: Dict[str, str]) -> None:
+        """Store translated segments in the translation memory."""
+        if self.memory is not None:
+            self.memory.put_many(translations, self.LANG, self.model)
+    
+    def _needs_translation(self, report) -> bool:
+        """Apply remembered translations; return True if an LLM call is still needed."""
         # Skip if already translated
         if report.title_ko and report.summary_ko:
             logger.debug(f"Report {report.report_id} already translated. Skipping.")
-            return
+            return False
         
-        # Check cache
-        cache_key = f"{report.title}|{report.summary or ''}"
-        if cache_key in self._cache:
-            report.title_ko, report.summary_ko = self._cache[cache_key]
-            logger.debug(f"Using cached translation for report {report.report_id}")
-            return
+        # Check translation memory
+        summary = report.summary or ""
+        known = self._recall([report.title, summary])
+        if report.title in known and (not summary.strip() or summary in known):
+            report.title_ko = known[report.title]
+            report.summary_ko = known.get(summary, "")
+            logger.debug(f"Using remembered translation for report {report.report_id}")
+            return False
         
         # Check if LLM is available
         if not self.llm_client.is_available:
             logger.warning("LLM client not available. Skipping translation.")
+            return False
+        
+        return True
+    
+    @staticmethod
+    def build_messages(report) -> list:
+        """Chat messages requesting the Korean title and summary of a report."""
+        # Format prompt
+        prompt = PromptTemplates.format_translation(
+            title=report.title,
+            summary=report.summary or ""
+        )
+        return [
+            {"role": "system", "content": "You are a professional translator for business intelligence."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    def _apply_response(self, report, response) -> None:
+        """Parse a translation response into the report."""
+        if not response or not response.choices:
+            logger.warning(f"No response from LLM for report {report.report_id}")
+            return
+        
+        self.apply_translation(report, response.choices[0].message.content)
+    
+    def apply_translation(self, report, content: str) -> None:
+        """
+        Apply a translation JSON response to a report in-place and remember it.
+        
+        Args:
+            report: Report object that was translated
+            content: JSON with title_ko and summary_ko
+        """
+        data = json.loads(content)
+        
+        # Update report
+        report.title_ko = data.get("title_ko")
+        report.summary_ko = data.get("summary_ko")
+        
+        # Remember result
+        self._remember({report.title: report.title_ko, report.summary or "": report.summary_ko})
+        
+        logger.info(f"Successfully translated report {report.report_id}")
+    
+    def translate_report(self, report) -> None:
+        """
+        Translate Report title and summary to Korean in-place.
+        
+        Args:
+            report: Report object to translate
+        """
+        if not self._needs_translation(report):
             return
         
         try:
-            # Format prompt
-            prompt = PromptTemplates.format_translation(
-                title=report.title,
-                summary=report.summary or ""
+            response = self.llm_client.chat_completion(
+                messages=self.build_messages(report),
+                response_format={"type": "json_object"}
             )
+            self._apply_response(report, response)
             
-            # Call LLM
-            messages = [
-                {"role": "system", "content": "You are a professional translator for business intelligence."},
-                {"role": "user", "content": prompt}
-            ]
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse translation JSON for report {report.report_id}: {e}")
+        except Exception as e:
+            logger.error(f"Error translating report {report.report_id}: {e}", exc_info=True)
+    
+    async def atranslate_report(self, report) -> None:
+        """
+        Async variant of translate_report (shares the client's concurrency limit).
+        
+        Args:
+            report: Report object to translate
+        """
+        if not self._needs_translation(report):
+            return
+        
+        try:
+            response = await self.llm_client.achat_completion(
+                messages=self.build_messages(report),
+                response_format={"type": "json_object"}
+            )
+            self._apply_response(report, response)
             
-            response = self.llm_client.chat_completion(
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse translation JSON for report {report.report_id}: {e}")
+        except Exception as e:
+            logger.error(f"Error translating report {report.report_id}: {e}", exc_info=True)
+    
+    @staticmethod
+    def _report_payload(report) -> Dict[str, str]:
+        return {"id": report.report_id, "title": report.title, "summary": report.summary or ""}
+    
+    def _apply_report_items(self, reports: list, content: str) -> set:
+        """Copy translated titles/summaries into the reports; returns the IDs translated."""
+        by_id = {r.report_id: r for r in reports}
+        data = json.loads(content)
+        items = data.get("items", []) if isinstance(data, dict) else []
+        done = set()
+        for item in items if isinstance(items, list) else []:
+            report = by_id.get(item.get("id")) if isinstance(item, dict) else None
+            title_ko = item.get("title_ko") if report is not None else None
+            if not isinstance(title_ko, str) or not title_ko.strip():
+                continue
+            summary_ko = item.get("summary_ko")
+            report.title_ko = title_ko.strip()
+            report.summary_ko = summary_ko.strip() if isinstance(summary_ko, str) else ""
+            self._remember({report.title: report.title_ko, report.summary or "": report.summary_ko})
+            done.add(report.report_id)
+        return done
+    
+    async def _atranslate_report_batch(self, reports: list) -> None:
+        """Translate one batch of reports; anything the response misses falls back to single calls."""
+        if len(reports) == 1:
+            await self.atranslate_report(reports[0])
+            return
+        
+        messages = [
+            {"role": "system", "content": "You are a professional translator for business intelligence."},
+            {"role": "user", "content": PromptTemplates.format_report_translation_batch(
+                [self._report_payload(r) for r in reports]
+            )}
+        ]
+        done = set()
+        try:
+            response = await self.llm_client.achat_completion(
                 messages=messages,
                 response_format={"type": "json_object"}
             )
+            if response and response.choices:
+                done = self._apply_report_items(reports, response.choices[0].message.content)
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.error(f"Failed to parse batched translation JSON: {e}")
+        except Exception as e:
+            logger.error(f"Error translating reports: {e}", exc_info=True)
+        
+        missing = [r for r in reports if r.report_id not in done]
+        if missing:
+            logger.debug(f"Batched translation missed {len(missing)} reports; retrying singly")
+            await asyncio.gather(*(self.atranslate_report(r) for r in missing))
+    
+    async def atranslate_reports(self, reports: list) -> None:
+        """
+        Translate many reports in-place, packing several title/summary pairs
+        into each request (bounded by translation_batch_max_items and
+        translation_batch_max_chars) and running the requests concurrently.
+        
+        Args:
+            reports: Report objects to translate
+        """
+        pending = [r for r in reports if self._needs_translation(r)]
+        if not pending:
+            return
+        await asyncio.gather(*(
+            self._atranslate_report_batch(batch) for batch in self._pack(pending, self._report_payload)
+        ))
+        logger.info(f"Translated {sum(1 for r in pending if r.title_ko)}/{len(pending)} reports")
+    
+    def translate_reports(self, reports: list) -> None:
+        """
+        Synchronous entry point for atranslate_reports.
+        
+        Args:
+            reports: Report objects to translate
+        """
+        if not reports or not self.llm_client.is_available:
+            return
+        self.llm_client.run(self.atranslate_reports(reports))
+    
+    # --- Cards (deferred Korean) ---
+    
+    @staticmethod
+    def _card_payload(card) -> Dict[str, str]:
+        payload = {"id": card.card_id}
+        for field in CARD_KO_FIELDS:
+            if getattr(card, field) and not getattr(card, f"{field}_ko"):
+                payload[field] = getattr(card, field)
+        return payload
+    
+    @staticmethod
+    def _pack(items: list, payload) -> List[list]:
+        """Group items into requests bounded by item count and source size."""
+        settings = get_settings()
+        batches, current, current_chars = [], [], 0
+        for item in items:
+            chars = sum(len(v) for v in payload(item).values())
+            if current and (len(current) >= settings.translation_batch_max_items
+                            or current_chars + chars > settings.translation_batch_max_chars):
+                batches.append(current)
+                current, current_chars = [], 0
+            current.append(item)
+            current_chars += chars
+        if current:
+            batches.append(current)
+        return batches
+    
+    @staticmethod
+    def _apply_card_items(cards: list, content: str) -> set:
+        """Copy translated fields into the cards; returns the IDs fully translated."""
+        by_id = {c.card_id: c for c in cards}
+        data = json.loads(content)
+        items = data.get("items", []) if isinstance(data, dict) else []
+        for item in items if isinstance(items, list) else []:
+            card = by_id.get(item.get("id")) if isinstance(item, dict) else None
+            if card is None:
+                continue
+            for field in CARD_KO_FIELDS:
+                value = item.get(f"{field}_ko")
+                if isinstance(value, str) and value.strip() and not getattr(card, f"{field}_ko"):
+                    setattr(card, f"{field}_ko", value.strip())
+        return {c.card_id for c in cards if not needs_card_translation(c)}
+    
+    async def _atranslate_card_batch(self, cards: list) -> None:
+        """Translate one batch; cards the response misses are retried one by one."""
+        messages = [
+            {"role": "system", "content": "You are a professional translator for business intelligence."},
+            {"role": "user", "content": PromptTemplates.format_card_translation_batch(
+                [self._card_payload(c) for c in cards]
+            )}
+        ]
+        done = set()
+        try:
+            response = await self.llm_client.achat_completion(
+                messages=messages,
+                response_format={"type": "json_object"}
+            )
+            if response and response.choices:
+                done = self._apply_card_items(cards, response.choices[0].message.content)
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.error(f"Failed to parse card translation JSON: {e}")
+        except Exception as e:
+            logger.error(f"Error translating cards: {e}", exc_info=True)
+        
+        missing = [c for c in cards if c.card_id not in done]
+        if missing and len(cards) > 1:
+            await asyncio.gather(*(self._atranslate_card_batch([c]) for c in missing))
+    
+    async def atranslate_cards(self, cards: list) -> list:
+        """
+        Fill missing *_ko fields of cards in-place with batched LLM calls.
+        
+        Args:
+            cards: OpportunityCard objects
             
-            if not response or not response.choices:
-                logger.warning(f"No response from LLM for report {report.report_id}")
-                return
-            
-            # Parse response
-            content = response.choices[0].message.content
-            data = json.loads(content)
-            
-            # Update report
-            report.title_ko = data.get("title_ko")
-            report.summary_ko = data.get("summary_ko")
-            
-            # Cache result
-            self._cache[cache_key] = (report.title_ko, report.summary_ko)
-            
-            logger.info(f"Successfully translated report {report.report_id}")
+        Returns:
+            The cards that were changed
+        """
+        pending = [c for c in cards if needs_card_translation(c)]
+        if not pending:
+            return []
+        before = {c.card_id: c.model_dump() for c in pending}
+        
+        # Recurring segments come straight from the translation memory
+        missing = [(c, f) for c in pending for f in CARD_KO_FIELDS if getattr(c, f) and not getattr(c, f"{f}_ko")]
+        known = self._recall(getattr(c, f) for c, f in missing)
+        for card, field in missing:
+            if getattr(card, field) in known:
+                setattr(card, f"{field}_ko", known[getattr(card, field)])
+        
+        remaining = [c for c in pending if needs_card_translation(c)]
+        if remaining and self.llm_client.is_available:
+            await asyncio.gather(*(self._atranslate_card_batch(batch) for batch in self._pack(remaining, self._card_payload)))
+            self._remember({
+                getattr(c, f): getattr(c, f"{f}_ko")
+                for c in remaining for f in CARD_KO_FIELDS
+                if getattr(c, f"{f}_ko") and not before[c.card_id][f"{f}_ko"]
+            })
+        
+        changed = [c for c in pending if c.model_dump() != before[c.card_id]]
+        logger.info(f"Translated {len(changed)}/{len(pending)} cards to Korean")
+        return changed
+    
+    def translate_cards(self, cards: list) -> list:
+        """
+        Synchronous entry point for atranslate_cards.
+        
+        Args:
+            cards: OpportunityCard objects
             
+        Returns:
+            The cards that were changed (callers persist them)
+        """
+        if not any(needs_card_translation(c) for c in cards):
+            return []
+        return self.llm_client.run(self.atranslate_cards(cards))
+    
+    # --- Short segments (tags, labels) ---
+    
+    async def _atranslate_segment_batch(self, segments: List[str]) -> Dict[str, str]:
+        messages = [
+            {"role": "system", "content": "You are a professional translator for business intelligence."},
+            {"role": "user", "content": PromptTemplates.format_segment_translation(segments)}
+        ]
+        try:
+            response = await self.llm_client.achat_completion(
+                messages=messages,
+                response_format={"type": "json_object"}
+            )
+            if not response or not response.choices:
+                return {}
+            data = json.loads(response.choices[0].message.content)
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse translation JSON for report {report.report_id}: {e}")
+            logger.error(f"Failed to parse segment translation JSON: {e}")
+            return {}
         except Exception as e:
-            logger.error(f"Error translating report {report.report_id}: {e}", exc_info=True)
+            logger.error(f"Error translating segments: {e}", exc_info=True)
+            return {}
+        items = data.get("items", []) if isinstance(data, dict) else []
+        translated = {}
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            index, target = item.get("id"), item.get("ko")
+            if isinstance(index, int) and 0 <= index < len(segments) and isinstance(target, str) and target.strip():
+                translated[segments[index]] = target.strip()
+        return translated
+    
+    async def atranslate_segments(self, segments: Iterable[str]) -> Dict[str, str]:
+        """
+        Translate short recurring strings such as industry/technology tags.
+        
+        Args:
+            segments: Source strings (duplicates are translated once)
+            
+        Returns:
+            Dict of source -> Korean for every segment that could be translated
+        """
+        unique = list(dict.fromkeys(s for s in segments if s and s.strip()))
+        translations = self._recall(unique)
+        missing = [s for s in unique if s not in translations]
+        if missing and self.llm_client.is_available:
+            size = self.SEGMENT_BATCH_SIZE
+            results = await asyncio.gather(*(
+                self._atranslate_segment_batch(missing[i:i + size]) for i in range(0, len(missing), size)
+            ))
+            fresh = {k: v for result in results for k, v in result.items()}
+            self._remember(fresh)
+            translations.update(fresh)
+        return translations
+    
+    def translate_segments(self, segments: Iterable[str]) -> Dict[str, str]:
+        """Synchronous entry point for atranslate_segments."""
+        if not self.llm_client.is_available:
+            return self._recall(segments)
+        return self.llm_client.run(self.atranslate_segments(segments))
     
     def clear_cache(self) -> None:
-        """Clear the translation cache."""
-        self._cache.clear()
-        logger.info("Translation cache cleared")
+        """Clear the translation memory."""
+        if self.memory is not None:
+            self.memory.clear()
+    
+    def stats(self) -> Dict[str, object]:
+        """Translation memory hit/miss counters."""
+        return self.memory.stats() if self.memory is not None else {}
 
 
 # Global instance
@@ -4,9 +4,10 @@ Extracts candidate sentences that may contain startup opportunities.
 """
 import re
 import logging
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
 from .config import get_settings
+from .services.metrics import timed
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +21,106 @@ KEYWORDS = [
     "demand", "need", "lack", "unable", "struggle", "barrier", "issue", "concern"
 ]
 
+# PRD core keywords weigh more than the recall-oriented extended ones
+CORE_KEYWORDS = {"problem", "challenge", "gap", "bottleneck", "limitation"}
 
+# Quantitative cues: percentages, currency amounts, multipliers and magnitudes
+QUANTITATIVE_PATTERN = re.compile(
+    r"\d+(?:\.\d+)?\s*(?:%|per\s?cent\b)"
+    r"|[$€£¥]\s?\d"
+    r"|\b\d+(?:\.\d+)?\s*(?:x|times|million|billion|trillion|bn|mn)\b",
+    re.IGNORECASE
+)
+
+# Inflections accepted after a keyword ("risk" -> "risks", "fail" -> "failure", "threat" -> "threatening")
+INFLECTION_SUFFIX = r"(?:s|es|d|ed|ing|ure|ures|en|ens|ened|ening)?"
+# Keywords ending in a silent "e" drop it before "-ing" ("struggle" -> "struggling")
+SILENT_E_SUFFIX = r"(?:e|es|ed|er|ers|ing)"
+
+
+class KeywordMatcher:
+    """
+    Matches a keyword list against text in a single regex pass.
+    
+    All keywords are compiled into one case-insensitive alternation with word
+    boundaries, so "need" matches "needs" and "needed" but not "needle".
+    Keywords ending in "e" also match their "-ing" form without the "e",
+    keywords ending in "y" also match their "-ies" plural, multi-word keywords
+    match any whitespace between words, and a trailing "*" turns a keyword
+    into a prefix match (e.g. "automat*").
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile the matcher.
+        
+        Args:
+            keywords: Keywords to match (case-insensitive)
+        """
+        self.keywords = list(dict.fromkeys(k.strip().lower() for k in keywords if k.strip()))
+        # Longest first so "supply chain" wins over "supply"
+        ordered = sorted(enumerate(self.keywords), key=lambda ik: len(ik[1]), reverse=True)
+        alternatives = [f"(?P<k{i}>{self._keyword_pattern(k)})" for i, k in ordered]
+        self.pattern = re.compile(r"\b(?:" + "|".join(alternatives) + r")\b", re.IGNORECASE)
+    
+    @staticmethod
+    def _keyword_pattern(keyword: str) -> str:
+        if keyword.endswith("*"):
+            return r"\s+".join(map(re.escape, keyword[:-1].split())) + r"\w*"
+        words = [re.escape(w) for w in keyword.split()]
+        last = words.pop()
+        if last.endswith("y"):
+            last = f"{last[:-1]}(?:y|ies)"
+        elif last.endswith("e"):
+            last = f"{last[:-1]}{SILENT_E_SUFFIX}"
+        else:
+            last = f"{last}{INFLECTION_SUFFIX}"
+        return r"\s+".join(words + [last])
+    
+    def matches(self, text: str) -> bool:
+        """Check whether any keyword occurs in the text."""
+        return self.pattern.search(text) is not None
+    
+    def find_all(self, text: str) -> List[str]:
+        """Return the distinct keywords found in the text, in order of first hit."""
+        hits = dict.fromkeys(self.keywords[int(m.lastgroup[1:])] for m in self.pattern.finditer(text))
+        return list(hits)
+    
+    def count(self, text: str) -> int:
+        """Return the total number of keyword hits in the text."""
+        return sum(1 for _ in self.pattern.finditer(text))
+
+
+# Built once at import time from config (falls back to the default list)
+KEYWORD_MATCHER = KeywordMatcher(get_settings().signal_keywords or KEYWORDS)
+
+
+# Simple regex for sentence splitting (handles '.', '?', '!')
+# This isn't perfect but good enough for MVP without heavy NLP libs
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+
+def is_candidate_sentence(sentence: str) -> bool:
+    """
+    Checks whether a stripped sentence passes the length and keyword filters.
+    
+    Args:
+        sentence: Sentence to check (already stripped)
+        
+    Returns:
+        True if the sentence should be sent on as a candidate
+    """
+    settings = get_settings()
+    
+    # Filter by length using config
+    if len(sentence) < settings.min_sentence_length or len(sentence) > settings.max_sentence_length:
+        return False
+    
+    # Check for keywords
+    return KEYWORD_MATCHER.matches(sentence)
+
+
+@timed("extract_candidate_sentences")
 def extract_candidate_sentences(text: str) -> List[str]:
     """
     Splits text into sentences and filters by keywords.
@@ -31,11 +131,7 @@ def extract_candidate_sentences(text: str) -> List[str]:
     Returns:
         List of candidate sentences containing keywords
     """
-    settings = get_settings()
-    
-    # Simple regex for sentence splitting (handles '.', '?', '!')
-    # This isn't perfect but good enough for MVP without heavy NLP libs
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    sentences = SENTENCE_SPLIT.split(text)
     
     candidates = []
     seen = set()
@@ -43,17 +139,123 @@ def extract_candidate_sentences(text: str) -> List[str]:
     for sentence in sentences:
         s_clean = sentence.strip()
         
-        # Filter by length using config
-        if len(s_clean) < settings.min_sentence_length or len(s_clean) > settings.max_sentence_length:
-            continue
-        
-        # Check for keywords
-        lower_s = s_clean.lower()
-        if any(k in lower_s for k in KEYWORDS):
-            if s_clean not in seen:
-                candidates.append(s_clean)
-                seen.add(s_clean)
+        if is_candidate_sentence(s_clean) and s_clean not in seen:
+            candidates.append(s_clean)
+            seen.add(s_clean)
     
     logger.debug(f"Extracted {len(candidates)} candidate sentences from {len(sentences)} total sentences")
     return candidates
 
+
+def iter_candidate_sentences(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Lazily yields unique candidate sentences from a stream of text chunks.
+    Sentences that straddle a chunk boundary are carried over and completed
+    by the next chunk, so nothing is read past what the consumer needs.
+    
+    Args:
+        chunks: Text chunks (pages or sections) in document order
+        
+    Yields:
+        Candidate sentences containing keywords
+    """
+    seen = set()
+    carry = ""
+    chunk_iter = iter(chunks)
+    
+    try:
+        for chunk in chunk_iter:
+            sentences = SENTENCE_SPLIT.split(f"{carry} {chunk}" if carry else chunk)
+            carry = sentences.pop()  # May be unfinished; completed by the next chunk
+            for sentence in sentences:
+                s_clean = sentence.strip()
+                if is_candidate_sentence(s_clean) and s_clean not in seen:
+                    seen.add(s_clean)
+                    yield s_clean
+    finally:
+        if hasattr(chunk_iter, "close"):
+            chunk_iter.close()
+    
+    s_clean = carry.strip()
+    if is_candidate_sentence(s_clean) and s_clean not in seen:
+        yield s_clean
+
+
+def extract_candidates_incremental(chunks: Iterable[str], limit: Optional[int] = None) -> List[str]:
+    """
+    Collects candidate sentences from text chunks, stopping as soon as
+    `limit` candidates are found so the rest of the document is never parsed.
+    
+    Args:
+        chunks: Text chunks (pages or sections) in document order
+        limit: Maximum number of candidates to collect (None for all)
+        
+    Returns:
+        List of candidate sentences in document order
+    """
+    candidates = []
+    iterator = iter_candidate_sentences(chunks)
+    try:
+        for candidate in iterator:
+            candidates.append(candidate)
+            if limit is not None and len(candidates) >= limit:
+                break
+    finally:
+        iterator.close()  # Releases the underlying download/parse immediately
+    
+    logger.debug(f"Extracted {len(candidates)} candidate sentences incrementally")
+    return candidates
+
+
+def score_candidate(sentence: str, position: int = 0, total: int = 1) -> float:
+    """
+    Cheap local score for how promising a candidate is before any LLM call.
+    
+    Combines keyword coverage (core keywords weigh more), keyword density,
+    quantitative cues, a preference for mid-length sentences, and a small
+    bonus for appearing early in the document (summaries and key findings).
+    
+    Args:
+        sentence: Candidate sentence
+        position: Index of the candidate in document order
+        total: Number of candidates in the document
+        
+    Returns:
+        Score (higher is more promising)
+    """
+    hits = KEYWORD_MATCHER.find_all(sentence)
+    words = max(len(sentence.split()), 1)
+    
+    keyword_score = sum(1.5 if k in CORE_KEYWORDS else 1.0 for k in hits[:3])
+    density_score = min(KEYWORD_MATCHER.count(sentence) / words * 10, 1.0)
+    quantitative_score = 1.0 if QUANTITATIVE_PATTERN.search(sentence) else 0.0
+    
+    # Very short sentences lack context; very long ones are usually lists or boilerplate
+    if 80 <= len(sentence) <= 300:
+        length_score = 1.0
+    elif len(sentence) < 80:
+        length_score = len(sentence) / 80
+    else:
+        length_score = max(0.0, 1.0 - (len(sentence) - 300) / 300)
+    
+    position_score = 0.5 * (1 - position / total) if total > 1 else 0.5
+    
+    return keyword_score + density_score + quantitative_score + length_score + position_score
+
+
+def rank_candidates(candidates: List[str], limit: Optional[int] = None) -> List[str]:
+    """
+    Orders candidates by local score so the LLM budget goes to the most promising ones.
+    
+    Args:
+        candidates: Candidate sentences in document order
+        limit: Number of top candidates to keep (None for all)
+        
+    Returns:
+        Candidates sorted by descending score (ties keep document order)
+    """
+    total = len(candidates)
+    scored = [(score_candidate(c, i, total), i, c) for i, c in enumerate(candidates)]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    ranked = [c for _, _, c in scored]
+    return ranked[:limit] if limit is not None else ranked
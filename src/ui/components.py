@@ -3,6 +3,7 @@ import html
 import pandas as pd
 import datetime
 from src.logic.prompts import build_prompt_from_card
+from src.ui.utils import tag_label
 
 @st.dialog("Signal Details / 상세 내용", width="large")
 def show_details_dialog(row, is_ko, T, report_map):
@@ -161,9 +162,9 @@ def show_details_dialog(row, is_ko, T, report_map):
         if industry_tags or tech_tags:
             tags_html = ""
             for tag in industry_tags:
-                tags_html += f'<span class="chip-tag-small">{html.escape(str(tag))}</span>'
+                tags_html += f'<span class="chip-tag-small">{html.escape(str(tag_label(tag, is_ko)))}</span>'
             for tag in tech_tags:
-                tags_html += f'<span class="chip-tag-small">{html.escape(str(tag))}</span>'
+                tags_html += f'<span class="chip-tag-small">{html.escape(str(tag_label(tag, is_ko)))}</span>'
             
             st.markdown(f"""
             <div style='background:#FFFFFF; padding:18px; border-radius:10px; border:1px solid #E2E8F0; margin-bottom:16px;'>
@@ -289,7 +290,7 @@ def render_signal_card(row, index, is_ko, T, report_map):
     
     # Top 2 tags for compact display
     top_tags = tags_list[:2] if len(tags_list) >= 2 else tags_list
-    tags_display = ', '.join([html.escape(str(t)) for t in top_tags])
+    tags_display = ', '.join([html.escape(str(tag_label(t, is_ko))) for t in top_tags])
     
     # Phase 2: Evidence Preview (100 chars)
     evidence_text = str(evidence_raw) if evidence_raw else ""
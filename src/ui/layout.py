@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 from src.ui.components import render_kpi_section, render_signal_card, show_details_dialog, render_skeleton_card, render_active_filters
 from src.logic.filters import filter_dataframe, sort_dataframe, get_virtual_window
-from src.ui.utils import scroll_to_top
+from src.ui.utils import scroll_to_top, ensure_korean_cards
 
 def render_sidebar():
     """
@@ -238,7 +238,7 @@ def render_main_content(page, df_cards, reports, T, is_ko, all_industries, all_t
             else:
                 top_signals = filtered_view.sort_values(by='created_at', ascending=False)
                 
-            top_signals = top_signals.head(4)
+            top_signals = ensure_korean_cards(top_signals.head(4), is_ko)
 
             cols = st.columns(2)
             for i, (index, row) in enumerate(top_signals.iterrows()):
@@ -371,7 +371,7 @@ def render_main_content(page, df_cards, reports, T, is_ko, all_industries, all_t
                 # Get virtual window (load progressively)
                 total_items = len(filtered_df)
                 items_to_show = min(st.session_state.scroll_loaded_count, total_items)
-                visible_df = filtered_df.head(items_to_show)
+                visible_df = ensure_korean_cards(filtered_df.head(items_to_show), is_ko)
                 
                 # Phase 1: 3-Column Grid Layout (responsive via CSS)
                 # Using native streamlit columns with 3 columns
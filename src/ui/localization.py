@@ -32,6 +32,7 @@ def get_translations(is_ko: bool):
         "of": "of" if not is_ko else "/",
         "signals": "signals" if not is_ko else "건",
         "View Details": "View Details" if not is_ko else "상세 보기",
+        "Translating": "Translating..." if not is_ko else "번역 중...",
         
         # User Guide Strings
         "Tab_Dashboard": "Dashboard" if not is_ko else "대시보드",
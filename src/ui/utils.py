@@ -1,5 +1,7 @@
 import streamlit as st
+import pandas as pd
 import time
+from src.ui.localization import get_translations
 
 def scroll_to_top():
     """
@@ -33,3 +35,72 @@ def scroll_to_top():
             components.html(js_code, height=0, width=0)
     except Exception:
         pass
+
+def _rows_missing_korean(df, fields):
+    """Boolean mask of rows with an English field whose Korean column is empty."""
+    missing = pd.Series(False, index=df.index)
+    for field in fields:
+        if field not in df.columns:
+            continue
+        english = df[field].fillna('').astype(str) != ''
+        ko_col = f"{field}_ko"
+        if ko_col in df.columns:
+            missing |= english & (df[ko_col].fillna('').astype(str) == '')
+        else:
+            missing |= english
+    return missing
+
+def ensure_korean_cards(df, is_ko):
+    """
+    Fills missing Korean fields for the cards about to be shown, in one
+    batched translation, and persists them to the card store.
+    Only does work in Korean mode and only for cards that still lack translations.
+    """
+    if not is_ko or df.empty or 'card_id' not in df.columns:
+        return df
+
+    from src.repositories import get_card_repository
+    from src.services.translation_service import CARD_KO_FIELDS, get_translation_service, needs_card_translation
+
+    # Tags are short recurring segments, served from the translation memory after the first time
+    tags = {t for col in ('industry_tags', 'technology_tags') if col in df.columns
+            for tags in df[col] if isinstance(tags, list) for t in tags}
+    labels = st.session_state.setdefault('tag_labels_ko', {})
+    # Tags that could not be translated are remembered so reruns don't request them again
+    failed = st.session_state.setdefault('tag_labels_ko_failed', set())
+    pending = tags - labels.keys() - failed
+    if pending:
+        translated = get_translation_service().translate_segments(pending)
+        labels.update(translated)
+        failed.update(pending - translated.keys())
+
+    # Checked on every rerun, so avoid touching the card store when nothing is missing
+    missing = _rows_missing_korean(df, CARD_KO_FIELDS)
+    if not missing.any():
+        return df
+
+    card_repo = get_card_repository()
+    visible_ids = set(df.loc[missing, 'card_id'])
+    cards = [c for c in card_repo.find_all_cards() if c.card_id in visible_ids and needs_card_translation(c)]
+    if not cards:
+        return df
+
+    with st.spinner(get_translations(is_ko)["Translating"]):
+        changed = get_translation_service().translate_cards(cards)
+    if not changed:
+        return df
+
+    card_repo.update_cards(changed)
+    df = df.copy()
+    for card in changed:
+        rows = df.index[df['card_id'] == card.card_id]
+        for field in CARD_KO_FIELDS:
+            df.loc[rows, f"{field}_ko"] = getattr(card, f"{field}_ko")
+    return df
+
+
+def tag_label(tag, is_ko):
+    """Display label for an industry/technology tag in the current language."""
+    if not is_ko:
+        return tag
+    return st.session_state.get('tag_labels_ko', {}).get(tag, tag)
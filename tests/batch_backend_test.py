@@ -0,0 +1,51 @@
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.models import DiscardedSignal, OpportunityCard
+from src.llm_service import parse_signal_results
+from src.services.batch_backend import (
+    LocalBatchBackend, make_batch_request, write_job_file, read_result_file, wait_for_batch,
+)
+
+def answer(body):
+    """Stand-in provider: scores every request, fails the one mentioning 'broken'."""
+    prompt = body["messages"][-1]["content"]
+    if "broken" in prompt:
+        return None
+    return json.dumps({"results": [{"index": 0, "importance_score": 75, "pain_holder": "Banks"},
+                                   {"index": 1, "importance_score": 20}]})
+
+def test_local_batch_roundtrip():
+    print("Testing Local Batch Backend...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        messages = [{"role": "user", "content": "Analyse these sentences"}]
+        job = write_job_file([
+            make_batch_request("sig-1", messages, model="gpt-4o", response_format={"type": "json_object"}),
+            make_batch_request("sig-2", [{"role": "user", "content": "broken"}], model="gpt-4o"),
+        ], tmp / "requests.jsonl")
+
+        backend = LocalBatchBackend(tmp / "provider", answer)
+        batch_id = backend.submit(job)
+        assert wait_for_batch(backend, batch_id, poll_seconds=0) == "completed"
+        results = read_result_file(backend.download_results(batch_id, tmp / "results.jsonl"))
+
+        assert results["sig-2"] is None
+        parsed = parse_signal_results(results["sig-1"], ["Banks struggle.", "Growth slows."], "rep_1")
+        assert isinstance(parsed[0], OpportunityCard) and parsed[0].pain_holder == "Banks"
+        assert isinstance(parsed[1], DiscardedSignal)
+    print("Verified Local Batch Backend: PASS")
+
+if __name__ == "__main__":
+    try:
+        test_local_batch_roundtrip()
+        print("\nALL BATCH BACKEND TESTS PASSED!")
+    except Exception as e:
+        print(f"\nTEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,52 @@
+import sys
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.document_cache import DocumentCache
+
+def test_roundtrip_and_reload():
+    print("Testing Document Cache Roundtrip...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DocumentCache(Path(tmp), max_bytes=10 * 1024 * 1024)
+        content_hash = cache.put_raw("https://pwc.com/a.pdf", b"%PDF raw bytes", etag='"v1"')
+        cache.put_text(content_hash, "pdf-v1", "Extracted text.")
+
+        reloaded = DocumentCache(Path(tmp), max_bytes=10 * 1024 * 1024)
+        assert reloaded.get_url_entry("https://pwc.com/a.pdf")["etag"] == '"v1"'
+        assert reloaded.get_raw(content_hash) == b"%PDF raw bytes"
+        assert reloaded.lookup_text("https://pwc.com/a.pdf", "pdf-v1") == "Extracted text."
+        assert reloaded.lookup_text("https://pwc.com/a.pdf", "pdf-v2") is None
+    print("Verified Document Cache Roundtrip: PASS")
+
+def test_lru_eviction():
+    print("Testing Document Cache LRU Eviction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        payload = os.urandom(4096)  # Incompressible
+        cache = DocumentCache(Path(tmp), max_bytes=10000)
+        first = cache.put_raw("https://pwc.com/1", payload + b"1")
+        time.sleep(0.01)
+        second = cache.put_raw("https://pwc.com/2", payload + b"2")
+        time.sleep(0.01)
+        cache.get_raw(first)  # First is now most recently used
+        time.sleep(0.01)
+        third = cache.put_raw("https://pwc.com/3", payload + b"3")
+
+        assert cache.has_raw(first)
+        assert not cache.has_raw(second)
+        assert cache.has_raw(third)
+        assert cache.size_bytes <= 10000
+    print("Verified Document Cache LRU Eviction: PASS")
+
+if __name__ == "__main__":
+    try:
+        test_roundtrip_and_reload()
+        test_lru_eviction()
+        print("\nALL DOCUMENT CACHE TESTS PASSED!")
+    except Exception as e:
+        print(f"\nTEST FAILED: {e}")
+        sys.exit(1)
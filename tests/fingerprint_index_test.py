@@ -0,0 +1,47 @@
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.repositories.fingerprint_index import FingerprintIndex
+
+BOILERPLATE = ("PwC is a network of firms in 152 countries with over 327,000 people who are "
+               "committed to delivering quality in assurance, advisory and tax services.")
+BOILERPLATE_V2 = ("PwC is a network of firms in 151 countries with over 364,000 people who are "
+                  "committed to delivering quality in assurance, advisory and tax services.")
+DISTINCT = "Insurers face a shortage of actuarial talent as demand for climate risk modelling grows."
+
+def test_near_duplicate_lookup():
+    print("Testing Near-Duplicate Lookup...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "fingerprints.json"
+        index = FingerprintIndex(path)
+        index.add(BOILERPLATE, "disc_1", "rep_1", "discard")
+        index.save()
+
+        reloaded = FingerprintIndex(path)
+        match = reloaded.find_near_duplicate(BOILERPLATE_V2)
+        assert match is not None and match["signal_id"] == "disc_1"
+        assert reloaded.find_near_duplicate(DISTINCT) is None
+    print("Verified Near-Duplicate Lookup: PASS")
+
+def test_select_novel():
+    print("Testing Novel Candidate Selection...")
+    with tempfile.TemporaryDirectory() as tmp:
+        index = FingerprintIndex(Path(tmp) / "fingerprints.json")
+        selected, skipped = index.select_novel([BOILERPLATE, DISTINCT, BOILERPLATE_V2])
+        assert selected == [BOILERPLATE, DISTINCT]
+        assert [c for c, _ in skipped] == [BOILERPLATE_V2]
+    print("Verified Novel Candidate Selection: PASS")
+
+if __name__ == "__main__":
+    try:
+        test_near_duplicate_lookup()
+        test_select_novel()
+        print("\nALL FINGERPRINT TESTS PASSED!")
+    except Exception as e:
+        print(f"\nTEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,48 @@
+import sys
+import os
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.ids import normalize_url, make_report_id, make_signal_id
+from src.repositories.report_index import ReportIndex
+
+def test_stable_ids():
+    print("Testing Stable IDs...")
+    url = "https://www.PwC.com:443/gx/en/news/report.html/?utm_source=rss&b=2&a=1#top"
+    assert normalize_url(url) == "https://www.pwc.com/gx/en/news/report.html?a=1&b=2"
+    assert make_report_id(url) == make_report_id("https://www.pwc.com/gx/en/news/report.html?b=2&a=1")
+    assert make_report_id(url).startswith("rep_")
+
+    # Same report + same sentence -> same ID; whitespace does not matter
+    a = make_signal_id("card", "rep_1", "Banks  struggle with\nunstructured data.")
+    b = make_signal_id("card", "rep_1", "Banks struggle with unstructured data.")
+    assert a == b
+    assert a != make_signal_id("card", "rep_2", "Banks struggle with unstructured data.")
+    print("Verified Stable IDs: PASS")
+
+def test_report_index():
+    print("Testing Report Index...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "report_index.json"
+        index = ReportIndex(path)
+        assert not index.exists
+        index.rebuild([SimpleNamespace(url="https://pwc.com/a/", report_id="rep_a")])
+
+        reloaded = ReportIndex(path)
+        assert reloaded.has_url("HTTPS://pwc.com/a")
+        assert reloaded.has_id("rep_a")
+        assert not reloaded.has_url("https://pwc.com/b")
+    print("Verified Report Index: PASS")
+
+if __name__ == "__main__":
+    try:
+        test_stable_ids()
+        test_report_index()
+        print("\nALL ID TESTS PASSED!")
+    except Exception as e:
+        print(f"\nTEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,155 @@
+import sys
+import os
+import json
+import asyncio
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.config import get_settings
+from src.models import DiscardedSignal, OpportunityCard
+from src.services.llm_client import LLMClient
+from src.llm_service import generate_signal_structs, pack_candidates, is_current
+
+class FakeLLMClient:
+    """Answers batched prompts with one result per sentence, dropping index 1."""
+    is_available = True
+
+    def __init__(self):
+        self.calls = 0
+        self.screened = 0
+        self.aborted = 0
+
+    def chat_completion(self, messages, **kwargs):
+        self.calls += 1
+        prompt = messages[-1]["content"]
+        if "You screen sentences" in prompt:
+            self.screened += 1
+            results = [{"index": 0, "importance_score": 90}, {"index": 1, "importance_score": 5}]
+            content = json.dumps({"results": results})
+        elif '"results"' in prompt:
+            results = [
+                {"index": 0, "importance_score": 80, "pain_holder": "Banks"},
+                {"index": 2, "importance_score": 10},
+            ]
+            content = json.dumps({"results": results})
+        elif "Markets are cooling." in prompt:
+            content = json.dumps({"importance_score": 5, "pain_holder": "Nobody in particular"})
+        else:
+            content = json.dumps({"importance_score": 60, "pain_holder": "Retried"})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def achat_completion(self, messages, **kwargs):
+        return self.chat_completion(messages, **kwargs)
+
+    async def astream_chat_completion(self, messages, should_stop=None, **kwargs):
+        content = self.chat_completion(messages, **kwargs).choices[0].message.content
+        for end in range(1, len(content) + 1):
+            if should_stop and should_stop(content[:end]):
+                self.aborted += 1
+                return content[:end], True
+        return content, False
+
+    def run(self, coro):
+        return asyncio.run(coro)
+
+def test_pack_candidates():
+    print("Testing Candidate Packing...")
+    candidates = ["x" * 400] * 5
+    batches = pack_candidates(candidates, "Title", token_budget=100000, max_items=2, output_tokens_per_item=100)
+    assert batches == [[0, 1], [2, 3], [4]]
+    tight = pack_candidates(candidates, "Title", token_budget=1, max_items=10, output_tokens_per_item=100)
+    assert tight == [[0], [1], [2], [3], [4]]
+    print("Verified Candidate Packing: PASS")
+
+def run_with_fake(candidates, cascade):
+    settings = get_settings()
+    original, original_cascade = LLMClient._instance, settings.cascade_enabled
+    fake = FakeLLMClient()
+    LLMClient._instance, settings.cascade_enabled = fake, cascade
+    try:
+        return generate_signal_structs(candidates, "Report", "rep_1"), fake
+    finally:
+        LLMClient._instance, settings.cascade_enabled = original, original_cascade
+
+def test_batch_results_map_back():
+    print("Testing Batched Structuring...")
+    candidates = ["Banks struggle.", "Insurers lack data.", "Growth is slowing."]
+    results, fake = run_with_fake(candidates, cascade=False)
+
+    assert isinstance(results[0], OpportunityCard) and results[0].pain_holder == "Banks"
+    assert results[0].evidence_sentence == "Banks struggle."
+    # Missing from the batch response -> retried as a single call
+    assert isinstance(results[1], OpportunityCard) and results[1].pain_holder == "Retried"
+    assert isinstance(results[2], DiscardedSignal) and results[2].raw_text == "Growth is slowing."
+    assert fake.calls == 2
+    print("Verified Batched Structuring: PASS")
+
+class MalformedBatchClient(FakeLLMClient):
+    """Returns a batch whose items carry null tags, a string score and a non-numeric score."""
+
+    def chat_completion(self, messages, **kwargs):
+        if '"results"' in messages[-1]["content"]:
+            self.calls += 1
+            results = [
+                {"index": 0, "importance_score": 80, "pain_holder": "Banks", "industry_tags": None},
+                {"index": 1, "importance_score": "75", "pain_holder": "Insurers"},
+                {"index": 2, "importance_score": "high"},
+            ]
+            content = json.dumps({"results": results})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        return super().chat_completion(messages, **kwargs)
+
+def test_malformed_batch_items_retried():
+    print("Testing Malformed Batch Items...")
+    settings = get_settings()
+    original, original_cascade = LLMClient._instance, settings.cascade_enabled
+    fake = MalformedBatchClient()
+    LLMClient._instance, settings.cascade_enabled = fake, False
+    try:
+        results = generate_signal_structs(["Banks struggle.", "Insurers lack data.", "Growth is slowing."], "Report", "rep_1")
+    finally:
+        LLMClient._instance, settings.cascade_enabled = original, original_cascade
+
+    assert isinstance(results[0], OpportunityCard) and results[0].industry_tags == []
+    assert isinstance(results[1], OpportunityCard) and results[1].importance_score == 75
+    # The unusable item is retried singly instead of failing the whole batch
+    assert isinstance(results[2], OpportunityCard) and results[2].pain_holder == "Retried"
+    assert fake.calls == 2
+    print("Verified Malformed Batch Items: PASS")
+
+def test_cascade_screens_before_structuring():
+    print("Testing Scoring Cascade...")
+    candidates = ["Banks struggle.", "Leaders must lead.", "Growth is slowing."]
+    results, fake = run_with_fake(candidates, cascade=True)
+
+    assert fake.screened == 1
+    assert isinstance(results[1], DiscardedSignal) and results[1].importance_score == 5
+    assert results[1].reason.startswith("Low Screening Score")
+    # Screening discards are stamped with the scoring model, structured results with the main one
+    assert results[1].llm_model == get_settings().cascade_scoring_model and is_current(results[1])
+    assert results[0].llm_model == get_settings().openai_model and is_current(results[0])
+    # Index 2 got no screening score, so it is structured anyway (fail open)
+    assert isinstance(results[0], OpportunityCard) and results[0].pain_holder == "Banks"
+    assert isinstance(results[2], OpportunityCard) and results[2].evidence_sentence == "Growth is slowing."
+    print("Verified Scoring Cascade: PASS")
+
+def test_streaming_aborts_low_scores():
+    print("Testing Streaming Early Abort...")
+    results, fake = run_with_fake(["Markets are cooling."], cascade=False)
+    assert fake.aborted == 1
+    assert isinstance(results[0], DiscardedSignal) and results[0].importance_score == 5
+    print("Verified Streaming Early Abort: PASS")
+
+if __name__ == "__main__":
+    try:
+        test_pack_candidates()
+        test_batch_results_map_back()
+        test_malformed_batch_items_retried()
+        test_cascade_screens_before_structuring()
+        test_streaming_aborts_low_scores()
+        print("\nALL LLM BATCHING TESTS PASSED!")
+    except Exception as e:
+        print(f"\nTEST FAILED: {e}")
+        sys.exit(1)
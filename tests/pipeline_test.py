@@ -0,0 +1,145 @@
+import sys
+import os
+import threading
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+import src.pipeline as pipeline
+from src.config import get_settings
+from src.models import Report, IngestionStatus, DiscardedSignal
+from src.repositories.result_journal import ResultJournal
+from src.repositories.work_units import WorkUnitStore
+from src.services import metrics as metrics_module
+from src.services.metrics import MetricsRegistry
+from src.services.prompt_templates import PromptTemplates
+
+PAGE = ("<html><body><p>Banks struggle with unstructured data in compliance workflows.</p>"
+        "<p>Insurers face a shortage of actuarial talent for climate risk modelling.</p></body></html>")
+
+def fake_fetch(url, dest_dir, incremental=False):
+    if "missing" in url:
+        raise IOError("404")
+    path = os.path.join(dest_dir, url.rsplit("/", 1)[-1])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(PAGE)
+    return "hash-" + url, path, None
+
+class FakeStructs:
+    """Discards every candidate, failing those containing `fail_on`."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.seen = []
+
+    def __call__(self, candidates, title, report_id):
+        self.seen.extend(candidates)
+        return [
+            None if self.fail_on and self.fail_on in c else
+            DiscardedSignal(signal_id=f"{report_id}-{c[:5]}", report_id=report_id, raw_text=c,
+                            importance_score=1, reason="Test", prompt_version=PromptTemplates.VERSION,
+                            llm_model=get_settings().openai_model)
+            for c in candidates
+        ]
+
+def staged_run(reports, structs, tmp, log=None, llm_available=True, parse_workers=0):
+    settings = get_settings()
+    original = (pipeline.fetch_document, pipeline.generate_signal_structs,
+                settings.pipeline_parse_workers, settings.pipeline_queue_size, settings.document_cache_enabled)
+    pipeline.fetch_document, pipeline.generate_signal_structs = fake_fetch, structs
+    settings.pipeline_parse_workers, settings.pipeline_queue_size, settings.document_cache_enabled = parse_workers, 1, False
+    try:
+        journal = ResultJournal(Path(tmp) / "journal.jsonl", fsync=False)
+        units = WorkUnitStore(Path(tmp) / "units.sqlite3")
+        cards, processed = pipeline._StagedRun(reports, None, journal, units, llm_available).run(log or (lambda m: None))
+        return processed, list(journal.replay()), units
+    finally:
+        (pipeline.fetch_document, pipeline.generate_signal_structs, settings.pipeline_parse_workers,
+         settings.pipeline_queue_size, settings.document_cache_enabled) = original
+
+def make_reports(urls):
+    return [Report(report_id=f"r{i}", title=f"Report {i}", url=u, published_at=datetime.now())
+            for i, u in enumerate(urls)]
+
+def test_staged_run():
+    print("Testing Staged Pipeline...")
+    urls = [f"https://example.com/r{i}.html" for i in range(5)] + ["https://example.com/missing.html"]
+    reports = make_reports(urls)
+    main, messages = threading.current_thread(), []
+
+    def log(message):
+        assert threading.current_thread() is main
+        messages.append(message)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        processed, records, _ = staged_run(reports, FakeStructs(), tmp, log)
+
+    assert processed == 5
+    # Every outcome is journaled as soon as the report finishes
+    discarded = sorted(r["item"]["report_id"] for r in records if r["type"] == "discard")
+    assert discarded == ["r0", "r0", "r1", "r1", "r2", "r2", "r3", "r3", "r4", "r4"]
+    assert {r["report_id"]: r["status"] for r in records if r["type"] == "status"}["r5"] == "failed"
+    assert reports[-1].ingestion_status == IngestionStatus.FAILED
+    assert all(r.ingestion_status == IngestionStatus.PROCESSED for r in reports[:-1])
+    assert "Failed to extract text from https://example.com/missing.html" in messages
+    print("Verified Staged Pipeline: PASS")
+
+def test_retry_skips_completed_units():
+    print("Testing Resumable Work Units...")
+    reports = make_reports(["https://example.com/r0.html"])
+    with tempfile.TemporaryDirectory() as tmp:
+        processed, _, units = staged_run(reports, FakeStructs(fail_on="Insurers"), tmp)
+        assert processed == 0 and reports[0].ingestion_status == IngestionStatus.FAILED
+        assert units.stats() == {"pending": 0, "done": 1, "failed": 1}
+
+        retry = FakeStructs()
+        processed, records, units = staged_run(reports, retry, tmp)
+        # Only the failed candidate goes back to the LLM; the finished one is reused
+        assert retry.seen == ["Insurers face a shortage of actuarial talent for climate risk modelling."]
+        assert processed == 1 and reports[0].ingestion_status == IngestionStatus.PROCESSED
+        assert len([r for r in records if r["type"] == "discard"]) == 3
+        assert units.attempts("r0") == 2 and units.stats()["done"] == 2
+        assert all(r["item"]["content_hash"] == "hash-https://example.com/r0.html"
+                   for r in records if r["type"] == "discard")
+    print("Verified Resumable Work Units: PASS")
+
+def test_unavailable_llm_defers_reports():
+    print("Testing Deferral Without an LLM...")
+    reports = make_reports(["https://example.com/r0.html"])
+    with tempfile.TemporaryDirectory() as tmp:
+        structs = FakeStructs()
+        processed, records, units = staged_run(reports, structs, tmp, llm_available=False)
+        assert processed == 0 and structs.seen == [] and records == []
+        # Still pending, and no attempt was used up
+        assert reports[0].ingestion_status == IngestionStatus.PENDING
+        assert units.attempts("r0") == 0
+    print("Verified Deferral Without an LLM: PASS")
+
+def test_parse_metrics_from_worker_processes():
+    print("Testing Parse Metrics From Worker Processes...")
+    reports = make_reports(["https://example.com/r0.html"])
+    original = metrics_module._metrics
+    registry = metrics_module._metrics = MetricsRegistry()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            staged_run(reports, FakeStructs(), tmp, parse_workers=1)
+    finally:
+        metrics_module._metrics = original
+    durations = registry.snapshot()["histograms"]["operation_duration_seconds"]
+    operations = {series["labels"]["operation"] for series in durations}
+    assert {"parse_html_content", "extract_candidate_sentences"} <= operations
+    print("Verified Parse Metrics From Worker Processes: PASS")
+
+if __name__ == "__main__":
+    try:
+        test_staged_run()
+        test_retry_skips_completed_units()
+        test_unavailable_llm_defers_reports()
+        test_parse_metrics_from_worker_processes()
+        print("\nALL PIPELINE TESTS PASSED!")
+    except Exception as e:
+        print(f"\nTEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,68 @@
+import sys
+import os
+import asyncio
+import time
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.services.rate_limiter import TokenBucket, AdaptiveConcurrency, RateLimiter
+
+def test_token_bucket():
+    print("Testing Token Bucket...")
+    bucket = TokenBucket(rate_per_minute=60)  # One per second, burst of 60
+    assert bucket.reserve(60) == 0.0
+    assert abs(bucket.reserve(2) - 2.0) < 0.05  # Overdrawn by two -> wait ~2s
+    assert TokenBucket(rate_per_minute=0).reserve(10 ** 9) == 0.0
+    print("Verified Token Bucket: PASS")
+
+def test_aimd_window():
+    print("Testing AIMD Concurrency Window...")
+    window = AdaptiveConcurrency(max_limit=8, decrease_cooldown=0)
+    window.on_throttle()
+    assert window.limit == 4
+    window.on_throttle()
+    window.on_throttle()
+    window.on_throttle()
+    assert window.limit == 1  # Never below min_limit
+    for _ in range(3):
+        window.on_success()
+    assert window.limit == 2
+    print("Verified AIMD Concurrency Window: PASS")
+
+def test_async_slots_respect_window():
+    print("Testing Async Slot Limiting...")
+    limiter = RateLimiter("test", max_concurrency=2)
+    peak = [0, 0]
+
+    async def call():
+        async with limiter.aslot():
+            peak[0] += 1
+            peak[1] = max(peak[1], peak[0])
+            await asyncio.sleep(0.01)
+            peak[0] -= 1
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(10)))
+
+    asyncio.run(main())
+    assert peak[1] == 2
+    assert limiter.stats()["in_flight"] == 0
+
+    start = time.monotonic()
+    limiter.throttle(retry_after=0.1)
+    with limiter.slot():
+        pass
+    assert time.monotonic() - start >= 0.1
+    assert limiter.stats()["throttled"] == 1
+    print("Verified Async Slot Limiting: PASS")
+
+if __name__ == "__main__":
+    try:
+        test_token_bucket()
+        test_aimd_window()
+        test_async_slots_respect_window()
+        print("\nALL RATE LIMITER TESTS PASSED!")
+    except Exception as e:
+        print(f"\nTEST FAILED: {e}")
+        sys.exit(1)
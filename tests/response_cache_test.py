@@ -0,0 +1,75 @@
+import sys
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from openai.types.chat import ChatCompletion
+from src.services import response_cache as response_cache_module
+from src.services.response_cache import ResponseCache, make_cache_key
+from src.services.llm_client import LLMClient
+from src.llm_service import _signal_cache_check
+
+MESSAGES = [{"role": "user", "content": "Analyse this sentence."}]
+
+def test_key_covers_model_and_prompt_version():
+    print("Testing Response Cache Keys...")
+    key = make_cache_key("gpt-4o", "1", MESSAGES, {"type": "json_object"})
+    assert key == make_cache_key("gpt-4o", "1", MESSAGES, {"type": "json_object"})
+    assert key != make_cache_key("gpt-4o-mini", "1", MESSAGES, {"type": "json_object"})
+    assert key != make_cache_key("gpt-4o", "2", MESSAGES, {"type": "json_object"})
+    print("Verified Response Cache Keys: PASS")
+
+def test_ttl_and_eviction():
+    print("Testing Response Cache TTL and Eviction...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(Path(tmp) / "llm.sqlite3", ttl_seconds=0, max_bytes=250)
+        cache.put("a", "gpt-4o", "x" * 100)
+        time.sleep(0.01)
+        cache.put("b", "gpt-4o", "y" * 100)
+        time.sleep(0.01)
+        assert cache.get("a") == "x" * 100  # "a" is now most recently used
+        cache.put("c", "gpt-4o", "z" * 100)
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+        assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 1
+
+        expiring = ResponseCache(Path(tmp) / "ttl.sqlite3", ttl_seconds=0.01, max_bytes=1000)
+        expiring.put("a", "gpt-4o", "x")
+        time.sleep(0.02)
+        assert expiring.get("a") is None
+    print("Verified Response Cache TTL and Eviction: PASS")
+
+def completion(content):
+    return ChatCompletion.model_validate({
+        "id": "c", "object": "chat.completion", "created": 0, "model": "gpt-4o",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+    })
+
+def test_unusable_responses_not_cached():
+    print("Testing Unusable Responses Are Not Cached...")
+    original = response_cache_module._response_cache
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = response_cache_module._response_cache = ResponseCache(Path(tmp) / "llm.sqlite3", 0, 10000)
+        try:
+            check = _signal_cache_check("Banks struggle.", "rep_1")
+            LLMClient._store_response("bad", completion('{"importance_score": "high"}'), check)
+            LLMClient._store_response("good", completion('{"importance_score": 80, "pain_holder": "Banks"}'), check)
+            assert cache.get("bad") is None
+            assert cache.get("good") is not None
+        finally:
+            response_cache_module._response_cache = original
+    print("Verified Unusable Responses Are Not Cached: PASS")
+
+if __name__ == "__main__":
+    try:
+        test_key_covers_model_and_prompt_version()
+        test_ttl_and_eviction()
+        test_unusable_responses_not_cached()
+        print("\nALL RESPONSE CACHE TESTS PASSED!")
+    except Exception as e:
+        print(f"\nTEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,112 @@
+import sys
+import os
+import json
+import asyncio
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from datetime import datetime
+
+from src.models import OpportunityCard, Report
+from src.services.llm_client import LLMClient
+from src.services.translation_service import TranslationService, needs_card_translation
+from src.services.translation_memory import TranslationMemory
+
+FIELDS = ("pain_holder", "pain_context", "pain_mechanism", "attack_vector", "evidence_sentence")
+
+class FakeLLMClient:
+    """Translates every card in a batch except card_2, which only comes back when asked alone."""
+    is_available = True
+
+    def __init__(self):
+        self.calls = 0
+
+    async def achat_completion(self, messages, **kwargs):
+        self.calls += 1
+        prompt = messages[-1]["content"]
+        if "Reports:\n" in prompt:
+            reports = json.loads(prompt.split("Reports:\n", 1)[1])
+            if len(reports) > 1:
+                return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="not json"))])
+            content = json.dumps({"items": [{"id": reports[0]["id"], "title_ko": "제목", "summary_ko": "요약"}]})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        if "Title:" in prompt:
+            content = json.dumps({"title_ko": "단건 제목", "summary_ko": "단건 요약"})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        cards = json.loads(prompt.split("Cards:\n", 1)[1])
+        items = [
+            {"id": c["id"], **{f"{f}_ko": f"KO {c[f]}" for f in FIELDS if f in c}}
+            for c in cards if c["id"] != "card_2" or len(cards) == 1
+        ]
+        content = json.dumps({"items": items}, ensure_ascii=False)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    def run(self, coro):
+        return asyncio.run(coro)
+
+def make_card(n, **overrides):
+    fields = {"card_id": f"card_{n}", **{f: f"{f} {n}" for f in FIELDS}}
+    fields.update(overrides)
+    return OpportunityCard(industry_tags=[], technology_tags=[],
+                           importance_score=70, confidence_score=0.8, report_id="rep_1", **fields)
+
+def test_translate_cards_batched_with_fallback():
+    print("Testing Batched Card Translation...")
+    original = LLMClient._instance
+    fake = FakeLLMClient()
+    LLMClient._instance = fake
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            memory = TranslationMemory(Path(tmp) / "tm.sqlite3", max_bytes=1024 * 1024)
+            cards = [make_card(1), make_card(2), make_card(3, pain_holder_ko="기존 번역")]
+            changed = TranslationService(memory).translate_cards(cards)
+
+            # The same segments on other cards are served from memory, without a call
+            again = [make_card(1, card_id="card_4")]
+            assert TranslationService(memory).translate_cards(again) == again
+            assert again[0].pain_context_ko == "KO pain_context 1"
+            assert memory.stats()["hits"] == 5
+    finally:
+        LLMClient._instance = original
+
+    assert fake.calls == 2  # One batch, one single retry for card_2
+    assert len(changed) == 3
+    assert not any(needs_card_translation(c) for c in cards)
+    assert cards[1].attack_vector_ko == "KO attack_vector 2"
+    assert cards[2].pain_holder_ko == "기존 번역"  # Existing translations are kept
+    print("Verified Batched Card Translation: PASS")
+
+def test_translate_reports_falls_back_per_item():
+    print("Testing Batched Report Translation...")
+    original = LLMClient._instance
+    fake = FakeLLMClient()
+    LLMClient._instance = fake
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            memory = TranslationMemory(Path(tmp) / "tm.sqlite3", max_bytes=1024 * 1024)
+            reports = [
+                Report(report_id=f"rep_{n}", title=f"Title {n}", summary=f"Summary {n}",
+                       url=f"https://pwc.com/{n}", source="PwC", published_at=datetime.now())
+                for n in range(3)
+            ]
+            TranslationService(memory).translate_reports(reports)
+    finally:
+        LLMClient._instance = original
+
+    # One malformed batched response, then one single call per report
+    assert fake.calls == 4
+    assert all(r.title_ko == "단건 제목" and r.summary_ko == "단건 요약" for r in reports)
+    print("Verified Batched Report Translation: PASS")
+
+if __name__ == "__main__":
+    try:
+        test_translate_cards_batched_with_fallback()
+        test_translate_reports_falls_back_per_item()
+        print("\nALL TRANSLATION TESTS PASSED!")
+    except Exception as e:
+        print(f"\nTEST FAILED: {e}")
+        sys.exit(1)